@@ -9,40 +9,60 @@ companies beyond the known watchlist.
 Usage:
     python -m agents.agent1_company_research
     python -m agents.agent1_company_research --dry-run
+    python -m agents.agent1_company_research --stream   # print companies as they arrive
+    python -m agents.agent1_company_research --batch-api   # one request per segment, as a Message Batches job
 """
 
 import argparse
 import json
 import sys
 
-import anthropic
-
+from agents.message_batches import HttpBatchTransport, message_text, message_usage, run_message_batch
+from agents.research_cache import record_research
 from agents.utils import (
     MODEL_RESEARCH,
     MAX_TOKENS,
+    WEB_SEARCH_TOOL,
+    build_system_blocks,
     call_with_retry,
     collect_text,
     extract_json,
+    format_usage,
+    make_client,
     read_prompt,
-    read_skill,
     save_results,
+    stream_with_retry,
     today,
+    usage_counts,
 )
 
 
-def build_system_prompt() -> str:
-    skill = read_skill()
-    agent_prompt = read_prompt("agent1-company-research-PROMPT.md")
-    return f"""{agent_prompt}
+def build_system_prompt() -> list:
+    return build_system_blocks(read_prompt("agent1-company-research-PROMPT.md"))
+
+
+# Market segments researched separately in Message Batches mode, where
+# several smaller requests cost no more wall-clock time than one big one
+SEGMENTS = {
+    "wealth": "wealth tech",
+    "investment": "investment tech",
+    "asset-management": "asset management tech",
+    "pfm": "personal financial management tech",
+}
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
 
----
+def build_user_message(segment: str = None) -> str:
+    if segment:
+        return f"""Today is {today()}.
 
-## Skill Reference (Company Criteria, Watchlist, Segments)
+Research the {SEGMENTS[segment]} segment of the fintech market and produce a ranked list of companies in that segment likely hiring for GTM leadership roles right now.
 
-{skill}"""
+Start with the companies from this segment in the Known Companies Watchlist in the skill reference, then search for additional companies in the segment with strong hiring signals. Aim for 20+ companies.
 
+Return ONLY the JSON array as specified in the output format. No other text."""
 
-def build_user_message() -> str:
     return f"""Today is {today()}.
 
 Research the fintech market (wealth tech, investment tech, asset management tech, personal financial management tech) and produce a ranked list of companies likely hiring for GTM leadership roles right now.
@@ -52,45 +72,33 @@ Start with the Known Companies Watchlist in the skill reference, then search for
 Return ONLY the JSON array as specified in the output format. No other text."""
 
 
-def run(dry_run: bool = False) -> list:
-    """Run Agent 1 and return the company list."""
-    print("=" * 60)
-    print("AGENT 1 — Company Research")
-    print(f"Date: {today()}")
-    print("=" * 60)
+def print_company(key, company: dict):
+    print(f"  + {company.get('company', '?')} ({company.get('priority', '?')} priority)")
 
-    if dry_run:
-        print("[DRY RUN] Would call Claude with web search to research companies.")
-        print("[DRY RUN] System prompt length:", len(build_system_prompt()), "chars")
-        print("[DRY RUN] User message length:", len(build_user_message()), "chars")
-        return []
 
-    client = anthropic.Anthropic()
-
-    print("Calling Claude with web search enabled...")
-    print(f"Model: {MODEL_RESEARCH}")
-
-    response = call_with_retry(client, {
+def build_request(segment: str = None) -> dict:
+    return {
         "model": MODEL_RESEARCH,
         "max_tokens": MAX_TOKENS,
         "system": build_system_prompt(),
-        "tools": [
-            {
-                "type": "web_search_20250305",
-                "name": "web_search",
-                "max_uses": 20,
-            }
-        ],
+        "tools": [WEB_SEARCH_TOOL],
         "messages": [
-            {"role": "user", "content": build_user_message()}
+            {"role": "user", "content": build_user_message(segment)}
         ],
-    })
+    }
 
-    print(f"Response received. Stop reason: {response.stop_reason}")
-    print(f"Usage — input: {response.usage.input_tokens}, output: {response.usage.output_tokens}")
 
-    text = collect_text(response)
-    companies = extract_json(text)
+def parse_companies(text: str, streamed: list = None) -> list:
+    """The company list from a response's text (or the companies that completed while streaming)."""
+    report = {}
+    companies = extract_json(text, report)
+    if report.get("truncated"):
+        print(f"WARNING: Response JSON was cut off; dropped {report['dropped_chars']} chars "
+              f"after the last complete company: {report['dropped_preview'][:80]!r}")
+
+    if companies is None and streamed:
+        print(f"WARNING: Response JSON is incomplete; keeping the {len(streamed)} companies that completed.")
+        companies = [company for _, company in streamed]
 
     if companies is None:
         print("WARNING: Could not parse JSON from response.")
@@ -107,6 +115,75 @@ def run(dry_run: bool = False) -> list:
     if not isinstance(companies, list):
         print("WARNING: Parsed result is not a list.")
         companies = []
+    return companies
+
+
+def merge_segment_companies(segment_lists: list) -> list:
+    """One list from per-segment lists: a company named twice keeps its higher-priority entry."""
+    by_name = {}
+    for companies in segment_lists:
+        for company in companies:
+            name = (company.get("company") or "").strip().lower()
+            existing = by_name.get(name)
+            if existing is None or (PRIORITY_RANK.get(company.get("priority"), 3)
+                                    < PRIORITY_RANK.get(existing.get("priority"), 3)):
+                by_name[name] = company
+    return sorted(by_name.values(), key=lambda c: PRIORITY_RANK.get(c.get("priority"), 3))
+
+
+def research_with_batch_api(transport=None) -> list:
+    """Research every segment in one Message Batches job and merge the lists."""
+    requests = [(f"agent1-{segment}", build_request(segment)) for segment in SEGMENTS]
+    outcomes = run_message_batch(requests, transport, metric="agent1")
+    segment_lists = []
+    for custom_id, _ in requests:
+        outcome = outcomes[custom_id]
+        if outcome["type"] != "succeeded":
+            print(f"WARNING: {custom_id} {outcome['type']}: {outcome['error'] or ''}")
+            continue
+        message = outcome["message"]
+        companies = parse_companies(message_text(message))
+        print(f"  {custom_id}: {len(companies)} companies, usage — {format_usage(message_usage(message))}")
+        segment_lists.append(companies)
+    return merge_segment_companies(segment_lists)
+
+
+def run(dry_run: bool = False, stream: bool = False, batch_api: bool = False, batch_transport=None) -> list:
+    """Run Agent 1 and return the company list."""
+    print("=" * 60)
+    print("AGENT 1 — Company Research")
+    print(f"Date: {today()}")
+    print("=" * 60)
+
+    if dry_run:
+        print("[DRY RUN] Would call Claude with web search to research companies.")
+        print("[DRY RUN] System prompt length:", sum(len(b["text"]) for b in build_system_prompt()), "chars")
+        print("[DRY RUN] User message length:", len(build_user_message()), "chars")
+        return []
+
+    if batch_api:
+        print(f"Submitting {len(SEGMENTS)} segment research requests as a Message Batches job...")
+    else:
+        print("Calling Claude with web search enabled...")
+    print(f"Model: {MODEL_RESEARCH}")
+
+    if batch_api:
+        companies = research_with_batch_api(batch_transport)
+    else:
+        client = make_client()
+        create_kwargs = build_request()
+        streamed = []
+        if stream:
+            response, text, streamed = stream_with_retry(client, create_kwargs, on_item=print_company, metric="agent1")
+        else:
+            response = call_with_retry(client, create_kwargs, metric="agent1")
+            text = collect_text(response)
+
+        if response is not None:
+            print(f"Response received. Stop reason: {response.stop_reason}")
+            print(f"Usage — {format_usage(usage_counts(response.usage))}")
+
+        companies = parse_companies(text, streamed)
 
     print(f"\nFound {len(companies)} companies")
 
@@ -118,8 +195,9 @@ def run(dry_run: bool = False) -> list:
     for p, count in sorted(priorities.items()):
         print(f"  {p}: {count}")
 
-    # Save results
-    save_results("agent1", companies)
+    # Save results, and let later runs reuse them within the research cache TTL
+    path = save_results("agent1", companies)
+    record_research(path, companies)
 
     return companies
 
@@ -127,9 +205,15 @@ def run(dry_run: bool = False) -> list:
 def main():
     parser = argparse.ArgumentParser(description="Agent 1 — Company Research")
     parser.add_argument("--dry-run", action="store_true", help="Show what would happen without calling the API")
+    parser.add_argument("--stream", action="store_true", help="Stream the response and parse companies as they complete")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Research each market segment as one Message Batches job (half price, slower)")
+    parser.add_argument("--batch-url", type=str,
+                        help="Message Batches endpoint, e.g. a local tests.stub_servers batches (default: ANTHROPIC_BATCH_URL or the API)")
     args = parser.parse_args()
 
-    companies = run(dry_run=args.dry_run)
+    companies = run(dry_run=args.dry_run, stream=args.stream, batch_api=args.batch_api,
+                    batch_transport=HttpBatchTransport(args.batch_url) if args.batch_api else None)
 
     if companies:
         print(f"\nTop 5 companies:")
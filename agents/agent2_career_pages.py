@@ -5,52 +5,87 @@ Agent 2 — Career Page Search
 Takes a company list from Agent 1 and visits each company's career page
 (Greenhouse, Lever, Workday, direct) to find GTM leadership openings.
 
+Companies are split into small batches, each checked by its own Claude
+request with its own web-search budget. Batches run concurrently under a
+concurrency cap, admitted by the shared API scheduler as the account's rate
+limits allow, and their roles and coverage are merged, so later companies no longer go unchecked when one long tool-use
+loop runs out of searches. The first batch runs alone so it writes the
+prompt cache for the shared system prompt; the rest then read from it.
+With --batch-api the batches are instead submitted together as one Message
+Batches job (agents/message_batches.py) and the results merged the same way.
+
+Companies whose careers_url is a Greenhouse, Lever or Ashby board skip the
+LLM entirely: their public job-board JSON is fetched directly
+(agents/ats_boards.py) and filtered locally. Only companies without a known
+board, or whose board couldn't be fetched, go to Claude.
+
 Usage:
     python -m agents.agent2_career_pages
     python -m agents.agent2_career_pages --dry-run
+    python -m agents.agent2_career_pages --batch-size 5 --concurrency 3 --max-companies 40
+    python -m agents.agent2_career_pages --stream   # report roles as each batch's response arrives
+    python -m agents.agent2_career_pages --batch-api   # one Message Batches job, one request per company
     python -m agents.agent2_career_pages --input data/results/agent1_2026-02-19.json
+    python -m agents.agent2_career_pages --no-ats   # send every company to Claude
 """
 
 import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import anthropic
-
+from agents.ats_boards import ATS_BASE_URL, fetch_boards, split_by_board
+from agents.http_cache import default_cache
+from agents.message_batches import HttpBatchTransport, message_text, message_usage, run_message_batch
 from agents.utils import (
     MODEL,
     MAX_TOKENS,
+    WEB_SEARCH_TOOL,
+    build_system_blocks,
     call_with_retry,
     collect_text,
     extract_json,
+    format_usage,
     load_results,
+    make_client,
     read_prompt,
-    read_skill,
     save_results,
+    stream_with_retry,
     today,
+    usage_counts,
 )
 
+# Companies per Claude request; each request gets WEB_SEARCH_TOOL's search budget
+BATCH_SIZE = 5
+# With the Message Batches API rate limits don't apply, so each company gets its own request
+BATCH_API_BATCH_SIZE = 1
 
-def build_system_prompt() -> str:
-    skill = read_skill()
-    agent_prompt = read_prompt("agent2-career-pages-PROMPT.md")
-    return f"""{agent_prompt}
+# How many batch requests may be in flight at once
+MAX_CONCURRENT_BATCHES = 3
 
----
+# Upper bound on companies checked per run (high and medium priority first)
+MAX_COMPANIES = 50
 
-## Skill Reference (Role Criteria, Segments)
 
-{skill}"""
+def build_system_prompt() -> list:
+    return build_system_blocks(read_prompt("agent2-career-pages-PROMPT.md"))
 
 
-def build_user_message(companies: list) -> str:
-    # Filter to high and medium priority, limit to top 25 for search budget
+def prioritize_companies(companies: list, limit: int = MAX_COMPANIES) -> list:
+    """High and medium priority companies (all of them if none are), capped at limit."""
     prioritized = [c for c in companies if c.get("priority") in ("high", "medium")]
     if not prioritized:
         prioritized = companies
-    prioritized = prioritized[:25]
+    return prioritized[:limit]
+
+
+def make_batches(companies: list, batch_size: int = BATCH_SIZE) -> list:
+    return [companies[i:i + batch_size] for i in range(0, len(companies), batch_size)]
+
 
-    companies_json = json.dumps(prioritized, indent=2)
+def build_user_message(companies: list) -> str:
+    companies_json = json.dumps(companies, indent=2)
 
     return f"""Today is {today()}.
 
@@ -67,8 +102,153 @@ Also try common ATS platforms:
 Return the JSON output as specified in the output format. Include both the roles found and the coverage log."""
 
 
-def run(dry_run: bool = False, input_file: str = None) -> dict:
-    """Run Agent 2 and return roles + coverage."""
+def build_batch_request(batch: list) -> dict:
+    return {
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS,
+        "system": build_system_prompt(),
+        "tools": [WEB_SEARCH_TOOL],
+        "messages": [
+            {"role": "user", "content": build_user_message(batch)}
+        ],
+    }
+
+
+def failed_batch(batch: list, error: str) -> dict:
+    """Result for a batch whose request failed: every company logged as an error."""
+    return {"roles": [], "usage": None, "coverage": [
+        {"company": c.get("company", ""), "careers_url": c.get("careers_url", ""),
+         "status": "error", "roles_found": 0, "notes": error}
+        for c in batch
+    ]}
+
+
+def parse_batch_response(batch: list, text: str, label: str, streamed: list = None) -> dict:
+    """Roles and coverage from one batch's response text.
+
+    Companies the response doesn't cover are logged as unchecked; if the
+    response was cut off, the roles and coverage entries that completed are
+    kept.
+    """
+    report = {}
+    result = extract_json(text, report)
+    if report.get("truncated"):
+        print(f"  [{label}] WARNING: Response JSON was cut off; dropped {report['dropped_chars']} chars "
+              f"after the last complete entry: {report['dropped_preview'][:80]!r}")
+
+    if result is None and streamed:
+        print(f"  [{label}] WARNING: Response JSON is incomplete; "
+              f"keeping the {len(streamed)} entries that completed.")
+        grouped = {}
+        for key, item in streamed:
+            grouped.setdefault(key, []).append(item)
+        result = {"roles": grouped.get("roles", []) + grouped.get(None, []),
+                  "coverage": grouped.get("coverage", [])}
+
+    if result is None:
+        print(f"  [{label}] WARNING: Could not parse JSON from response.")
+        print("  Raw text preview:", text[:500])
+        result = {"roles": [], "coverage": []}
+
+    if isinstance(result, list):
+        # Agent returned just a roles array
+        result = {"roles": result, "coverage": []}
+
+    roles = result.get("roles", [])
+    coverage = result.get("coverage", [])
+    covered = {(c.get("company") or "").strip().lower() for c in coverage}
+    for company in batch:
+        if (company.get("company") or "").strip().lower() not in covered:
+            coverage.append({"company": company.get("company", ""), "careers_url": company.get("careers_url", ""),
+                             "status": "unchecked", "roles_found": 0})
+    print(f"  [{label}] {len(roles)} roles")
+    return {"roles": roles, "coverage": coverage}
+
+
+def run_batch(client, batch: list, index: int, total: int, stream: bool = False) -> dict:
+    """Check one batch of companies with its own Claude request and search budget.
+
+    Returns {"roles", "coverage", "usage"}; a failed request logs the whole
+    batch as errors. With stream, roles are reported as they complete, and
+    a truncated response keeps the roles and coverage entries that finished.
+    """
+    label = f"batch {index}/{total}"
+    names = ", ".join(c.get("company", "?") for c in batch)
+    print(f"  [{label}] {names}")
+
+    def on_item(key, item):
+        if key == "roles":
+            print(f"  [{label}] + {item.get('company', '?')} — {item.get('title', '?')}")
+
+    create_kwargs = build_batch_request(batch)
+    streamed = []
+    try:
+        if stream:
+            response, text, streamed = stream_with_retry(client, create_kwargs, on_item=on_item, metric="agent2.batch")
+        else:
+            response = call_with_retry(client, create_kwargs, metric="agent2.batch")
+            text = collect_text(response)
+    except Exception as e:
+        print(f"  [{label}] FAILED: {type(e).__name__}: {e}")
+        return failed_batch(batch, f"{type(e).__name__}: {e}")
+
+    usage = None
+    if response is not None:
+        usage = usage_counts(response.usage)
+        print(f"  [{label}] Stop reason: {response.stop_reason}, usage — {format_usage(usage)}")
+
+    result = parse_batch_response(batch, text, label, streamed)
+    result["usage"] = usage
+    return result
+
+
+def run_with_batch_api(batches: list, transport=None) -> list:
+    """Submit every company batch as one Message Batches job; results in batch order."""
+    requests = [(f"agent2-{i:03d}", build_batch_request(batch)) for i, batch in enumerate(batches, 1)]
+    outcomes = run_message_batch(requests, transport, metric="agent2.batch")
+    results = []
+    for (custom_id, _), batch in zip(requests, batches):
+        outcome = outcomes[custom_id]
+        if outcome["type"] != "succeeded":
+            print(f"  [{custom_id}] {outcome['type'].upper()}: {outcome['error'] or ''}")
+            results.append(failed_batch(batch, f"batch request {outcome['type']}: {outcome['error'] or ''}"))
+            continue
+        message = outcome["message"]
+        result = parse_batch_response(batch, message_text(message), custom_id)
+        result["usage"] = message_usage(message)
+        results.append(result)
+    return results
+
+
+def merge_batch_results(batch_results: list) -> dict:
+    """Concatenate batch roles (dropping repeated URLs) and coverage, in batch order; sum token usage."""
+    roles, coverage = [], []
+    usage = {"input": 0, "output": 0, "cache_read": 0, "cache_write": 0}
+    seen_urls = set()
+    for batch in batch_results:
+        for role in batch["roles"]:
+            url = role.get("url")
+            if url and url in seen_urls:
+                continue
+            seen_urls.add(url)
+            roles.append(role)
+        coverage.extend(batch["coverage"])
+        for key, count in (batch.get("usage") or {}).items():
+            usage[key] += count
+    return {"roles": roles, "coverage": coverage, "usage": usage}
+
+
+def run(dry_run: bool = False, input_file: str = None, batch_size: int = None,
+        concurrency: int = MAX_CONCURRENT_BATCHES, max_companies: int = MAX_COMPANIES,
+        stream: bool = False, batch_api: bool = False, batch_transport=None,
+        ats: bool = True, ats_base_url: str = ATS_BASE_URL) -> dict:
+    """Run Agent 2 and return roles + coverage.
+
+    With ats, companies on a Greenhouse, Lever or Ashby board are read from
+    the board's API first and only the rest go to Claude. With batch_api,
+    every company batch (one company each by default) goes into a single
+    Message Batches job instead of concurrent live calls.
+    """
     print("=" * 60)
     print("AGENT 2 — Career Page Search")
     print(f"Date: {today()}")
@@ -86,57 +266,77 @@ def run(dry_run: bool = False, input_file: str = None) -> dict:
             return {"roles": [], "coverage": []}
         print(f"Loaded {len(companies)} companies from today's Agent 1 results")
 
+    if batch_size is None:
+        batch_size = BATCH_API_BATCH_SIZE if batch_api else BATCH_SIZE
+    prioritized = prioritize_companies(companies, max_companies)
+    board_companies, llm_companies = split_by_board(prioritized) if ats else ([], prioritized)
+    batches = make_batches(llm_companies, batch_size)
+    concurrency = max(1, min(concurrency, len(batches)))
+    mode = "one Message Batches job" if batch_api else f"{concurrency} concurrent"
+
     if dry_run:
-        print(f"[DRY RUN] Would search career pages for {len(companies)} companies.")
+        print(f"[DRY RUN] Would read {len(board_companies)} companies' job boards directly and search "
+              f"career pages for {len(llm_companies)} of {len(companies)} companies in {len(batches)} batches ({mode}).")
         high = sum(1 for c in companies if c.get("priority") == "high")
         medium = sum(1 for c in companies if c.get("priority") == "medium")
         print(f"[DRY RUN] High priority: {high}, Medium: {medium}")
         return {"roles": [], "coverage": []}
 
-    client = anthropic.Anthropic()
-
-    print("Calling Claude with web search to check career pages...")
-    print(f"Model: {MODEL}")
-
-    response = call_with_retry(client, {
-        "model": MODEL,
-        "max_tokens": MAX_TOKENS,
-        "system": build_system_prompt(),
-        "tools": [
-            {
-                "type": "web_search_20250305",
-                "name": "web_search",
-                "max_uses": 20,
-            }
-        ],
-        "messages": [
-            {"role": "user", "content": build_user_message(companies)}
-        ],
-    })
-
-    print(f"Response received. Stop reason: {response.stop_reason}")
-    print(f"Usage — input: {response.usage.input_tokens}, output: {response.usage.output_tokens}")
-
-    text = collect_text(response)
-    result = extract_json(text)
-
-    if result is None:
-        print("WARNING: Could not parse JSON from response.")
-        print("Raw text preview:", text[:500])
-        result = {"roles": [], "coverage": []}
-
-    if isinstance(result, list):
-        # Agent returned just a roles array
-        result = {"roles": result, "coverage": []}
-
-    roles = result.get("roles", [])
-    coverage = result.get("coverage", [])
-
-    print(f"\nFound {len(roles)} matching roles")
-    print(f"Coverage: {len(coverage)} companies checked")
+    t0 = time.perf_counter()
+    board_result = None
+    if board_companies:
+        print(f"Reading {len(board_companies)} Greenhouse/Lever/Ashby boards directly...")
+        board_result = fetch_boards(board_companies, base_url=ats_base_url)
+        board_result["coverage"] = [c for c in board_result["coverage"] if c["status"] == "checked"]
+        fetched = {c["company"] for c in board_result["coverage"]}
+        # A board that couldn't be read falls back to the LLM search
+        retry = [c for c in board_companies if c.get("company", "") not in fetched]
+        print(f"  {len(board_result['roles'])} matching roles from {board_result['postings']} postings on "
+              f"{len(fetched)} boards" + (f"; {len(retry)} boards failed, searching those instead" if retry else ""))
+        if retry:
+            llm_companies = llm_companies + retry
+            batches = make_batches(llm_companies, batch_size)
+            concurrency = max(1, min(concurrency, len(batches)))
+            mode = "one Message Batches job" if batch_api else f"{concurrency} concurrent"
+
+    if batches:
+        print(f"Checking {len(llm_companies)} companies in {len(batches)} batches of up to {batch_size} "
+              f"({mode})...")
+        print(f"Model: {MODEL}")
+
+    if not batches:
+        batch_results = []
+    elif batch_api:
+        batch_results = run_with_batch_api(batches, batch_transport)
+    else:
+        client = make_client()
+        # A cache entry is only readable once the request that writes it has
+        # started responding, so batches launched together would all pay the
+        # cache write. Run the first one alone, then fan out.
+        batch_results = [run_batch(client, batches[0], 1, len(batches), stream=stream)]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            batch_results += executor.map(
+                lambda args: run_batch(client, *args, stream=stream),
+                [(batch, i, len(batches)) for i, batch in enumerate(batches[1:], 2)],
+            )
+    elapsed = time.perf_counter() - t0
+
+    if board_result:
+        batch_results.insert(0, board_result)
+    merged = merge_batch_results(batch_results)
+    result = {"roles": merged["roles"], "coverage": merged["coverage"]}
+    roles = result["roles"]
+    coverage = result["coverage"]
+
+    print(f"\nFound {len(roles)} matching roles in {elapsed:.0f}s")
+    print(f"Usage — {format_usage(merged['usage'])}")
+    print(f"Coverage: {len(coverage)} companies logged")
 
     checked = sum(1 for c in coverage if c.get("status") == "checked")
     print(f"  Successfully checked: {checked}")
+    unchecked = [c["company"] for c in coverage if c.get("status") in ("unchecked", "error")]
+    if unchecked:
+        print(f"  Not checked ({len(unchecked)}): {', '.join(unchecked)}")
 
     # Save results
     save_results("agent2", result)
@@ -148,9 +348,29 @@ def main():
     parser = argparse.ArgumentParser(description="Agent 2 — Career Page Search")
     parser.add_argument("--dry-run", action="store_true", help="Show what would happen without calling the API")
     parser.add_argument("--input", type=str, help="Path to Agent 1 results JSON file (default: today's results)")
+    parser.add_argument("--batch-size", type=int,
+                        help=f"Companies per Claude request (default: {BATCH_SIZE}, {BATCH_API_BATCH_SIZE} with --batch-api)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BATCHES,
+                        help=f"Batch requests in flight at once (default: {MAX_CONCURRENT_BATCHES})")
+    parser.add_argument("--max-companies", type=int, default=MAX_COMPANIES,
+                        help=f"Most companies to check, high and medium priority first (default: {MAX_COMPANIES})")
+    parser.add_argument("--stream", action="store_true", help="Stream responses and parse roles as they complete")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Submit all requests as one Message Batches job (half price, no rate limits, slower)")
+    parser.add_argument("--batch-url", type=str,
+                        help="Message Batches endpoint, e.g. a local tests.stub_servers batches (default: ANTHROPIC_BATCH_URL or the API)")
+    parser.add_argument("--no-ats", action="store_true",
+                        help="Don't read Greenhouse/Lever/Ashby boards directly; search every company with Claude")
+    parser.add_argument("--ats-url", type=str, default=ATS_BASE_URL,
+                        help="Send job-board API requests to this host, e.g. a local tests.stub_servers boards (default: ATS_BASE_URL or the boards' APIs)")
     args = parser.parse_args()
 
-    result = run(dry_run=args.dry_run, input_file=args.input)
+    result = run(dry_run=args.dry_run, input_file=args.input, batch_size=args.batch_size,
+                 concurrency=args.concurrency, max_companies=args.max_companies, stream=args.stream,
+                 batch_api=args.batch_api,
+                 batch_transport=HttpBatchTransport(args.batch_url) if args.batch_api else None,
+                 ats=not args.no_ats, ats_base_url=args.ats_url)
+    default_cache().report("agent2")
 
     roles = result.get("roles", [])
     if roles:
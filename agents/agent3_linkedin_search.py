@@ -8,29 +8,85 @@ Uses Playwright to search LinkedIn Jobs like a human browser:
   - Paginates through results
   - Extracts job listing details
 
+With --backend http, searches instead fetch LinkedIn's public guest listing
+endpoint over a pooled HTTP connection and parse the card markup directly,
+falling back to the browser for any search the endpoint refuses.
+Playwright itself is only imported once a browser worker starts, so dry
+runs, replays and the http backend start without it.
+
 Usage:
     python -m agents.agent3_linkedin_search
     python -m agents.agent3_linkedin_search --dry-run
     python -m agents.agent3_linkedin_search --headed     # visible browser
+    python -m agents.agent3_linkedin_search --workers 1  # serial, single browser
+    python -m agents.agent3_linkedin_search --backend http  # no browser unless the guest API refuses
+    python -m agents.agent3_linkedin_search --backend http --base-url http://127.0.0.1:8765  # tests.stub_servers linkedin
+    python -m agents.agent3_linkedin_search --persistent-profile  # reuse cookies + disk cache from .cache/
+    python -m agents.agent3_linkedin_search --persistent-profile --reset-profile
+    python -m agents.agent3_linkedin_search --resume     # continue today's crashed run from its checkpoint
+    python -m agents.agent3_linkedin_search --no-schedule  # run every query at full depth
+    python -m agents.agent3_linkedin_search --record     # also save each results page's HTML
+    python -m agents.agent3_linkedin_search --replay data/recordings/2026-02-19  # offline, no browser
     python -m agents.agent3_linkedin_search --input data/results/agent1_2026-02-19.json
 """
 
 import argparse
+import hashlib
+import http.client
 import json
-import random
+import os
+import queue
 import re
+import threading
 import time
-
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from agents import telemetry
+from agents.browser_profile import DISK_CACHE_BYTES, PROFILE_ROOT, prepare_profile, reset_profiles
+from agents.company_index import CompanyIndex, build_company_index
+from agents.http_cache import HttpCache, default_cache
+from agents.http_client import HttpClient
+from agents.linkedin_cards import parse_job_cards
+from agents.query_scheduler import query_key, schedule_tasks
+from agents.rate_limit import FOLLOW_UP_COST, RateLimiter
+from agents.run_checkpoint import RunCheckpoint
+from agents.title_filters import (
+    is_relevant_title,
+    is_wealth_experience_relevant,
+    matches_criteria,
+)
 from agents.utils import (
+    DATA_DIR,
     load_results,
     save_results,
     today,
 )
 
-# LinkedIn job search base URL
-LINKEDIN_JOBS_URL = "https://www.linkedin.com/jobs/search/"
+# LinkedIn base URL; point it at a local stand-in (tests.stub_servers) with
+# --base-url or LINKEDIN_BASE_URL to test without touching LinkedIn
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+LINKEDIN_JOBS_PATH = "/jobs/search/"
+
+# Guest listing endpoint behind the public results page's infinite scroll.
+# It returns bare card markup, GUEST_PAGE_SIZE cards per start offset.
+GUEST_SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+GUEST_PAGE_SIZE = 10
+
+# Where LinkedIn sends throttled or logged-out visitors instead of results
+AUTHWALL_PATHS = ("/authwall", "/login", "/uas/login", "/checkpoint/")
+
+BACKENDS = ("playwright", "http")
+DEFAULT_BACKEND = "playwright"
+
+# After this many guest fetches fail in a row, HTTP workers stop and every
+# remaining search goes to the Playwright fallback
+HTTP_FAILURE_LIMIT = 3
+
+# --record saves each results page here, one directory per date, with a
+# manifest.json describing the searches so --replay can rerun them offline
+RECORDINGS_DIR = DATA_DIR / "recordings"
 
 # Search queries: (keywords, location)
 BROAD_QUERIES = [
@@ -51,70 +107,6 @@ BROAD_QUERIES = [
     ('"asset management" experience "Head of Sales" OR "VP Sales" SaaS OR technology OR platform', "United States"),
 ]
 
-# Seniority keywords to filter relevant roles
-SENIORITY_KEYWORDS = [
-    "director", "senior director", "vp", "vice president", "svp",
-    "head of", "chief", "cro", "coo", "managing director", "general manager",
-]
-
-# Function keywords to filter relevant roles
-FUNCTION_KEYWORDS = [
-    "sales", "revenue", "partnerships", "business development", "gtm",
-    "go-to-market", "client", "relationship", "consulting", "advisory",
-    "commercial", "growth", "channel", "strategic alliances", "enterprise",
-]
-
-# Exclude these
-EXCLUDE_KEYWORDS = [
-    "engineer", "developer", "product manager", "designer", "data scientist",
-    "marketing manager", "content", "compliance", "legal", "hr ", "human resources",
-    "accounting", "finance manager", "operations manager",
-]
-
-# Comprehensive known wealthtech companies (strict whitelist)
-KNOWN_WEALTHTECH_COMPANIES = [
-    # Core wealthtech
-    "Addepar", "Orion", "Envestnet", "Pontera", "InvestCloud", "Nitrogen",
-    "Altruist", "Advyzon", "Betterment", "Wealthfront", "Farther",
-    "Savvy Wealth", "Vanilla", "LifeYield", "RightCapital", "FP Alpha",
-    "Conquest Planning", "Jump", "AdvicePay",
-    # Alt investments / private markets
-    "CAIS", "iCapital", "YieldStreet", "Canoe Intelligence",
-    # RIA aggregators / platforms
-    "Dynasty Financial", "Hightower", "Advisor360", "AssetMark",
-    # Enterprise wealthtech
-    "SEI", "Morningstar", "Pershing", "BNY", "Broadridge", "SS&C",
-    "Vestmark", "FIS", "Fidelity",
-    # BlackRock Aladdin
-    "BlackRock", "Aladdin",
-    # Retirement tech
-    "Vestwell", "GeoWealth", "Practifi",
-    # Investment data / analytics
-    "FactSet", "MSCI", "Clearwater Analytics", "Enfusion", "Arcesium",
-    "Tegus", "AlphaSense",
-    # Investment platforms
-    "Carta", "Forge Global", "Republic", "Moonfare", "AngelList", "Vise",
-    # PFM / Retirement
-    "Empower", "Guideline", "Human Interest", "Capitalize", "Magnifi",
-    # Regtech / compliance
-    "ComplySci", "RIA in a Box", "Aumni",
-    # Big tech FS verticals
-    "Salesforce Financial Services",
-    # Investment banks with WM tech
-    "Goldman Sachs", "Morgan Stanley", "JPMorgan",
-    # Additional wealthtech
-    "Clearwater", "Wealthspire", "LearnLux", "d1g1t", "MyVest",
-    "Wealth.com", "Zoe Financial", "Osaic", "LPL Financial",
-    "Raymond James", "Cetera", "Advisor Group", "Commonwealth",
-    "Carson Group", "Buckingham", "Mariner Wealth",
-    "eMoney Advisor", "MoneyGuidePro", "Riskalyze",
-    "Capitect", "Kwanti", "YCharts", "Oranj",
-    "Redtail", "Wealthbox", "Tamarac", "Black Diamond",
-    "Croesus", "Advicement", "Asset-Map",
-    "Snappy Kraken", "FMG Suite", "Nitrogen Wealth",
-    "CircleBlack", "Docupace", "Laser App", "PreciseFP",
-]
-
 # Industry-relevance keywords — at least one must appear in company name or job context
 # to keep a role from a broad (non-company-targeted) search
 INDUSTRY_KEYWORDS = [
@@ -153,398 +145,955 @@ NON_FINTECH_INDICATORS = [
     "church", "ministry", "nonprofit", "ngo",
 ]
 
-# Strict regex patterns for title validation (used for company-targeted searches)
-VALID_TITLE_PATTERNS = [
-    r'\b(VP|Vice President|Director|Senior Director|Head of|Chief|SVP|EVP|Managing Director)\b',
-]
-
-VALID_FUNCTION_PATTERNS = [
-    r'\b(Sales|Revenue|GTM|Go.to.Market|Partnerships?|Strategic Alliances?|'
-    r'Business Development|Channel|Client Success|Client Relations|'
-    r'Relationship Management|Consulting|Advisory)\b',
-]
-
-EXCLUDE_TITLE_PATTERNS = [
-    r'\b(Engineer|Product Manager|Design|Data Scientist|Marketing Manager|'
-    r'Content|Compliance|Legal|Finance Director|HR|People|Talent|'
-    r'Operations Manager|IT Director|CTO|CPO|CMO)\b',
-]
+# Broad queries at index >= WEALTH_TECH_QUERY_START are "tech companies requiring
+# wealth management experience" — they use a different relevance filter.
+WEALTH_TECH_QUERY_START = 10
+
+# Worker pool: each worker drives its own browser context and pulls searches
+# off a shared queue. All workers draw from one per-host token bucket
+# (agents/rate_limit.py) refilling at one page load per MIN_REQUEST_INTERVAL,
+# so adding workers never makes us hit LinkedIn harder than that; scroll
+# fetches and guest-API follow-up pages cost a fraction of a token.
+DEFAULT_WORKERS = 3
+MIN_REQUEST_INTERVAL = 4.0
+REQUEST_JITTER = 1.0
+
+# Request interception: we only read card text, so most of what a search page
+# pulls in is dead weight. Profiles list the resource types aborted outright;
+# tracker hosts are blocked under every profile except "off", and "strict"
+# additionally drops scripts not served from LinkedIn's own domains.
+# Documents, first-party scripts and XHR/fetch always load — infinite scroll
+# and the "See more jobs" button depend on them.
+DEFAULT_BLOCK_PROFILE = "lenient"
+BLOCK_PROFILES = {
+    "off": set(),
+    "lenient": {"image", "media", "font"},
+    "strict": {"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"},
+}
+FIRST_PARTY_HOSTS = ("linkedin.com", "licdn.com")
+TRACKER_HOSTS = (
+    "doubleclick.net", "google-analytics.com", "googletagmanager.com",
+    "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "facebook.net", "connect.facebook.net", "bat.bing.com", "clarity.ms",
+    "ads.linkedin.com", "px.ads.linkedin.com", "snap.licdn.com",
+    "demdex.net", "omtrdc.net", "scorecardresearch.com", "quantserve.com",
+    "hotjar.com", "segment.io", "cdn.segment.com", "adsrvr.org",
+)
+TRACKER_PATHS = ("/li/track", "/collect", "/pixel")
+
+# Aborted requests are never downloaded, so bytes saved are estimated from
+# typical transfer sizes per resource type on LinkedIn search pages.
+EST_BYTES_BY_TYPE = {
+    "image": 30_000, "media": 400_000, "font": 45_000, "stylesheet": 60_000,
+    "script": 80_000, "texttrack": 5_000, "manifest": 2_000, "other": 2_000,
+    "xhr": 3_000, "fetch": 3_000,
+}
+
+# Reuse per-worker Chromium profiles (cookies, consent state, disk cache)
+# across runs; see agents/browser_profile.py. CI turns this on via the env.
+DEFAULT_PERSISTENT_PROFILE = os.environ.get("AGENT3_PERSISTENT_PROFILE") == "1"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class RequestBlockStats:
+    """Per-run counters for request interception, shared by all browser workers."""
+
+    def __init__(self, profile: str = DEFAULT_BLOCK_PROFILE):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_reason = {}
+        self.est_bytes_saved = 0
+
+    def record(self, blocked: bool, reason: str = "", resource_type: str = ""):
+        with self._lock:
+            if not blocked:
+                self.allowed += 1
+                return
+            self.blocked += 1
+            self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+            self.est_bytes_saved += EST_BYTES_BY_TYPE.get(resource_type, 2_000)
+
+    def summary(self) -> dict:
+        with self._lock:
+            total = self.allowed + self.blocked
+            return {
+                "profile": self.profile,
+                "requests_total": total,
+                "requests_blocked": self.blocked,
+                "blocked_pct": round(100 * self.blocked / total, 1) if total else 0.0,
+                "blocked_by_reason": dict(sorted(self.blocked_by_reason.items())),
+                "est_bytes_saved": self.est_bytes_saved,
+            }
+
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def block_reason(url: str, resource_type: str, profile: str):
+    """Why a request should be aborted under the given profile, or None to let it through."""
+    if profile == "off":
+        return None
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if _host_matches(host, TRACKER_HOSTS):
+        return "tracker"
+    if _host_matches(host, FIRST_PARTY_HOSTS) and parts.path.startswith(TRACKER_PATHS):
+        return "tracker"
+    if resource_type in BLOCK_PROFILES[profile]:
+        return resource_type
+    if profile == "strict" and resource_type == "script" and not _host_matches(host, FIRST_PARTY_HOSTS):
+        return "third-party script"
+    return None
+
+
+def install_request_blocking(context, profile: str, block_stats: RequestBlockStats):
+    """Abort non-essential requests on every page of the browser context."""
+    if profile == "off":
+        return
+
+    def handle(route):
+        request = route.request
+        reason = block_reason(request.url, request.resource_type, profile)
+        block_stats.record(reason is not None, reason or "", request.resource_type)
+        if reason:
+            route.abort()
+        else:
+            route.continue_()
 
-DELAY_MIN = 2.0
-DELAY_MAX = 5.0
+    context.route("**/*", handle)
 
 
-def is_relevant_company(company: str, known_companies: set) -> bool:
+def is_relevant_company(company: str, company_index: CompanyIndex) -> bool:
     """Only include companies we explicitly know are wealthtech.
 
-    Strict whitelist approach: if a company is not in Agent 1's list or
-    the known wealthtech companies list, assume NOT relevant and exclude.
+    Strict whitelist approach: if a company doesn't resolve to Agent 1's
+    researched companies or the known wealthtech companies list, assume
+    NOT relevant and exclude.
     """
-    name_lower = company.strip().lower()
-
-    if not name_lower or name_lower in ("confidential", "undisclosed", "stealth startup", "a hiring company"):
-        return False
-
-    # Check against Agent 1's researched companies
-    if name_lower in known_companies:
-        return True
-
-    # Check against hardcoded wealthtech list (fuzzy match)
-    for known in KNOWN_WEALTHTECH_COMPANIES:
-        if known.lower() in name_lower or name_lower in known.lower():
-            return True
-
-    # DEFAULT: Not relevant (strict whitelist)
-    return False
-
-
-def is_wealth_experience_relevant(title: str) -> bool:
-    """Check if a job title/context indicates wealth management experience is required.
-
-    Used for the broader tech-company queries where the company itself may not
-    be fintech but the role requires wealth management domain expertise.
-    """
-    title_lower = title.lower()
-    wealth_signals = [
-        "wealth", "financial advisor", "ria", "registered investment",
-        "asset management", "investment", "portfolio", "fiduciary",
-    ]
-    return any(kw in title_lower for kw in wealth_signals)
-
-
-def human_delay(min_s=DELAY_MIN, max_s=DELAY_MAX):
-    """Random delay to mimic human behavior."""
-    time.sleep(random.uniform(min_s, max_s))
-
-
-def matches_criteria(title: str) -> bool:
-    """Check if a job title matches GTM leadership criteria."""
-    title_lower = title.lower()
-
-    # Must have seniority indicator
-    has_seniority = any(kw in title_lower for kw in SENIORITY_KEYWORDS)
-    if not has_seniority:
-        return False
-
-    # Must have function indicator
-    has_function = any(kw in title_lower for kw in FUNCTION_KEYWORDS)
-    if not has_function:
-        return False
-
-    # Must not be excluded
-    is_excluded = any(kw in title_lower for kw in EXCLUDE_KEYWORDS)
-    if is_excluded:
-        return False
-
-    return True
-
-
-def is_relevant_title(title: str) -> bool:
-    """Check if title matches GTM leadership criteria using strict regex patterns.
-
-    Used for company-targeted searches where we need tighter filtering
-    since all results are from a known company.
-    """
-    has_seniority = any(re.search(p, title, re.IGNORECASE) for p in VALID_TITLE_PATTERNS)
-    has_function = any(re.search(p, title, re.IGNORECASE) for p in VALID_FUNCTION_PATTERNS)
-    is_excluded = any(re.search(p, title, re.IGNORECASE) for p in EXCLUDE_TITLE_PATTERNS)
-    return has_seniority and has_function and not is_excluded
+    return company_index.is_known(company)
+
+
+# Card selectors, shared by the in-page batch script and the per-element fallback
+CARD_SELECTOR = ".base-card, .job-search-card, .base-search-card"
+CARD_FIELD_SELECTORS = {
+    "title": ".base-search-card__title, .base-card__full-link, h3",
+    "company": ".base-search-card__subtitle, h4, .base-card__subtitle",
+    "location": ".job-search-card__location, .base-search-card__metadata span",
+    "link": "a[href*='/jobs/view/'], a.base-card__full-link",
+    "date": "time, .base-search-card__listdate, .job-search-card__listdate",
+}
+
+COUNT_CARDS_JS = "(selector) => document.querySelectorAll(selector).length"
+MORE_CARDS_JS = "([selector, n]) => document.querySelectorAll(selector).length > n"
+
+# Scrolling stops as soon as a scroll adds no cards within SCROLL_SETTLE_MS,
+# so most searches stop well short of the cap; a list that keeps growing is
+# followed past the fixed-sleep loop's BASELINE_SCROLLS, up to SCROLL_CAP
+# (each scroll is another request). The query scheduler's tiers scale from
+# BASELINE_SCROLLS too.
+BASELINE_SCROLLS = 3
+SCROLL_CAP = 2 * BASELINE_SCROLLS
+SCROLL_SETTLE_MS = 4000
+
+# Runs inside the page and returns every card as plain data in one round trip
+EXTRACT_CARDS_JS = """
+({cardSelector, fields}) => {
+    const text = (el) => (el ? el.innerText.trim() : "");
+    return Array.from(document.querySelectorAll(cardSelector)).map((card) => {
+        const link = card.querySelector(fields.link);
+        const date = card.querySelector(fields.date);
+        return {
+            title: text(card.querySelector(fields.title)),
+            company: text(card.querySelector(fields.company)),
+            location: text(card.querySelector(fields.location)),
+            url: link ? (link.getAttribute("href") || "") : "",
+            datePosted: date ? (date.getAttribute("datetime") || text(date)) : "",
+        };
+    });
+}
+"""
 
 
-def extract_jobs_from_page(page) -> list:
-    """Extract job listings from the current LinkedIn search results page."""
+def _clean_card(card: dict) -> dict:
+    """Normalize one extracted card into the job dict used by the filters."""
+    url = card.get("url") or ""
+    if url:
+        url = url.split("?")[0]  # Clean tracking params
+    return {
+        "title": card.get("title", ""),
+        "company": card.get("company", ""),
+        "location": card.get("location", ""),
+        "url": url,
+        "datePosted": card.get("datePosted", ""),
+    }
+
+
+def extract_jobs_batch(page) -> list:
+    """Extract every job card with a single page.evaluate round trip."""
+    cards = page.evaluate(EXTRACT_CARDS_JS, {
+        "cardSelector": CARD_SELECTOR,
+        "fields": CARD_FIELD_SELECTORS,
+    })
+    if not isinstance(cards, list):
+        raise ValueError(f"batch extraction returned {type(cards).__name__}, expected list")
+    return [_clean_card(c) for c in cards if c.get("title")]
+
+
+def extract_jobs_per_element(page) -> list:
+    """Extract job cards one element handle at a time (slow: ~10 IPC calls per card)."""
     jobs = []
 
-    # Wait for job cards to load
-    try:
-        page.wait_for_selector(".base-card, .job-search-card, .base-search-card", timeout=10000)
-    except PlaywrightTimeout:
-        return jobs
-
     # LinkedIn public job search uses base-card elements
-    cards = page.query_selector_all(".base-card, .job-search-card, .base-search-card")
+    cards = page.query_selector_all(CARD_SELECTOR)
 
     for card in cards:
         try:
             # Extract title
-            title_el = card.query_selector(".base-search-card__title, .base-card__full-link, h3")
+            title_el = card.query_selector(CARD_FIELD_SELECTORS["title"])
             title = title_el.inner_text().strip() if title_el else ""
 
             if not title:
                 continue
 
             # Extract company
-            company_el = card.query_selector(".base-search-card__subtitle, h4, .base-card__subtitle")
+            company_el = card.query_selector(CARD_FIELD_SELECTORS["company"])
             company = company_el.inner_text().strip() if company_el else ""
 
             # Extract location
-            location_el = card.query_selector(".job-search-card__location, .base-search-card__metadata span")
+            location_el = card.query_selector(CARD_FIELD_SELECTORS["location"])
             location = location_el.inner_text().strip() if location_el else ""
 
             # Extract URL
-            link_el = card.query_selector("a[href*='/jobs/view/'], a.base-card__full-link")
+            link_el = card.query_selector(CARD_FIELD_SELECTORS["link"])
             url = link_el.get_attribute("href") if link_el else ""
-            if url:
-                url = url.split("?")[0]  # Clean tracking params
 
             # Extract date
-            date_el = card.query_selector("time, .base-search-card__listdate, .job-search-card__listdate")
+            date_el = card.query_selector(CARD_FIELD_SELECTORS["date"])
             date_posted = ""
             if date_el:
                 date_posted = date_el.get_attribute("datetime") or date_el.inner_text().strip()
 
-            jobs.append({
+            jobs.append(_clean_card({
                 "title": title,
                 "company": company,
                 "location": location,
                 "url": url,
                 "datePosted": date_posted,
-            })
+            }))
         except Exception:
             continue
 
     return jobs
 
 
-def scroll_to_load_all(page, max_scrolls=5):
-    """Scroll down to load more job listings (lazy loading)."""
-    for _ in range(max_scrolls):
+def extract_jobs_from_page(page, stats: dict = None, compare: bool = False) -> list:
+    """Extract job listings from the current LinkedIn search results page.
+
+    Uses the single-round-trip batch script, falling back to the per-element
+    path if it fails. With compare=True the per-element path is also timed
+    against the batch result and both timings are logged.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+    stats = stats if stats is not None else {}
+
+    # Wait for job cards to load
+    try:
+        page.wait_for_selector(CARD_SELECTOR, timeout=10000)
+    except PlaywrightTimeout:
+        stats["extract_mode"] = "timeout"
+        return []
+
+    t0 = time.perf_counter()
+    try:
+        jobs = extract_jobs_batch(page)
+        stats["extract_mode"] = "batch"
+    except Exception as e:
+        print(f"    Batch extraction failed ({type(e).__name__}: {e}) — falling back to per-element")
+        jobs = extract_jobs_per_element(page)
+        stats["extract_mode"] = "per-element"
+    stats["extract_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    if compare and stats["extract_mode"] == "batch":
+        t1 = time.perf_counter()
+        legacy = extract_jobs_per_element(page)
+        legacy_ms = round((time.perf_counter() - t1) * 1000, 1)
+        stats["extract_per_element_ms"] = legacy_ms
+        speedup = legacy_ms / stats["extract_ms"] if stats["extract_ms"] else float("inf")
+        print(f"    Extraction: batch {stats['extract_ms']}ms vs per-element {legacy_ms}ms "
+              f"({speedup:.1f}x) for {len(jobs)} cards — results {'match' if legacy == jobs else 'DIFFER'}")
+
+    return jobs
+
+
+def count_cards(page) -> int:
+    """Number of job cards currently in the results list."""
+    return page.evaluate(COUNT_CARDS_JS, CARD_SELECTOR)
+
+
+def scroll_to_load_all(page, max_scrolls=SCROLL_CAP, settle_ms=SCROLL_SETTLE_MS,
+                       limiter: RateLimiter = None, host: str = None) -> dict:
+    """Scroll down to load more job listings until the card list stops growing.
+
+    After each scroll (and "See more jobs" click) we wait for the card count
+    to rise instead of sleeping; if it hasn't grown within settle_ms the list
+    has converged. Keeps going while new cards appear, up to max_scrolls.
+    Each scroll fetches more cards, so it takes a follow-up token from limiter.
+    Returns the scroll count and cards gained for the query log.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+    cards_before = count = count_cards(page)
+    scrolls = 0
+    stop = "cap"
+    while scrolls < max_scrolls:
+        if limiter:
+            limiter.acquire(host, FOLLOW_UP_COST)
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        human_delay(1.0, 2.0)
+        scrolls += 1
 
         # Check for "See more jobs" button
         see_more = page.query_selector("button.infinite-scroller__show-more-button, button[aria-label*='more jobs']")
-        if see_more:
+        if see_more and see_more.is_visible():
             try:
-                see_more.click()
-                human_delay(1.5, 3.0)
+                see_more.click(timeout=settle_ms)
             except Exception:
+                stop = "see-more-failed"
                 break
 
-
-def search_linkedin(page, keywords: str, location: str = "United States") -> list:
-    """Run a single LinkedIn job search and extract results."""
+        try:
+            page.wait_for_function(MORE_CARDS_JS, arg=[CARD_SELECTOR, count], timeout=settle_ms)
+        except PlaywrightTimeout:
+            stop = "converged"
+            break
+        count = count_cards(page)
+
+    return {
+        "scrolls": scrolls,
+        "cards_gained": count - cards_before,
+        "scroll_stop": stop,
+    }
+
+
+def is_authwall(url: str) -> bool:
+    return urlsplit(url or "").path.startswith(AUTHWALL_PATHS)
+
+
+def search_linkedin(page, keywords: str, location: str = "United States",
+                    stats: dict = None, compare_extraction: bool = False,
+                    record_path: Path = None, max_scrolls: int = SCROLL_CAP,
+                    base_url: str = LINKEDIN_BASE_URL, limiter: RateLimiter = None):
+    """Run a single LinkedIn job search and extract results.
+
+    Per-query measurements (extraction mode and timing) are written into stats.
+    If record_path is given, the fully scrolled page's HTML is saved there.
+    The page load and every scroll take tokens from limiter; a 429, a login
+    wall, or cards that never render are reported to it as throttling.
+
+    Returns None, not [], when the search never got a results page (a 429,
+    a login wall, a load error or timeout) or its cards never rendered, with
+    the reason in stats["throttled"], so the run can retry it instead of
+    logging zero yield.
+    """
     params = f"?keywords={keywords}&location={location}&f_TPR=r604800"  # past week
-    url = LINKEDIN_JOBS_URL + params
+    url = base_url.rstrip("/") + LINKEDIN_JOBS_PATH + params
+    host = urlsplit(url).hostname
+    limiter = limiter or RateLimiter(rate=1 / MIN_REQUEST_INTERVAL, jitter=REQUEST_JITTER)
+
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
 
+    stats = stats if stats is not None else {}
+    limiter.acquire(host)
+    t0 = time.perf_counter()
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        response = page.goto(url, wait_until="domcontentloaded", timeout=30000)
     except PlaywrightTimeout:
         print(f"    Timeout loading search page")
-        return []
+        stats["throttled"] = "load-timeout"
+        return None
     except Exception as e:
         print(f"    Error loading page: {e}")
-        return []
-
-    human_delay(2.0, 4.0)
+        stats["throttled"] = "load-error"
+        return None
+    stats["load_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    if response is not None and response.status == 429:
+        limiter.throttled(host, "http-429")
+        stats["throttled"] = "http-429"
+        return None
+    if is_authwall(page.url):
+        limiter.throttled(host, "authwall")
+        stats["throttled"] = "authwall"
+        return None
 
     # Scroll to load more results
-    scroll_to_load_all(page, max_scrolls=3)
+    try:
+        stats.update(scroll_to_load_all(page, max_scrolls=max_scrolls, limiter=limiter, host=host))
+    except Exception as e:
+        print(f"    Scrolling stopped early: {type(e).__name__}: {e}")
+
+    if record_path:
+        try:
+            record_path.write_text(page.content())
+        except Exception as e:
+            print(f"    Could not record page: {type(e).__name__}: {e}")
 
     # Extract all jobs from the page
-    raw_jobs = extract_jobs_from_page(page)
+    raw_jobs = extract_jobs_from_page(page, stats=stats, compare=compare_extraction)
+    if stats.get("extract_mode") == "timeout":
+        limiter.throttled(host, "empty-after-timeout")
+        stats["throttled"] = "empty-after-timeout"
+        return None
+    limiter.ok(host)
 
     return raw_jobs
 
 
+def company_search_keywords(company_name: str) -> str:
+    """LinkedIn keyword string for GTM roles at a specific company."""
+    return f'"{company_name}" sales OR partnerships OR revenue OR "business development" director OR VP OR head'
+
+
 def run_company_search(page, company_name: str) -> list:
     """Search LinkedIn for GTM roles at a specific company."""
-    keywords = f'"{company_name}" sales OR partnerships OR revenue OR "business development" director OR VP OR head'
-    return search_linkedin(page, keywords)
+    return search_linkedin(page, company_search_keywords(company_name))
 
 
-def run(dry_run: bool = False, input_file: str = None, headed: bool = False) -> dict:
-    """Run Agent 3 with Playwright browser automation."""
-    print("=" * 60)
-    print("AGENT 3 — LinkedIn Job Search (Browser Automation)")
-    print(f"Date: {today()}")
-    print("=" * 60)
+class GuestFetchError(Exception):
+    """The guest listing endpoint refused a request (throttled, login wall, server error)."""
 
-    # Load Agent 1 results
-    companies = []
-    if input_file:
-        with open(input_file) as f:
-            companies = json.load(f)
-        print(f"Loaded {len(companies)} companies from {input_file}")
-    else:
-        companies = load_results("agent1") or []
-        if companies:
-            print(f"Loaded {len(companies)} companies from today's Agent 1 results")
-        else:
-            print("No Agent 1 results found — running with broad searches only")
 
-    # Build set of known fintech companies for industry filtering
-    known_companies = set()
-    for c in companies:
-        name = c.get("company", "").strip().lower()
-        if name:
-            known_companies.add(name)
-    # Include the hardcoded wealthtech companies
-    for name in KNOWN_WEALTHTECH_COMPANIES:
-        known_companies.add(name.strip().lower())
-    print(f"Known fintech companies for filtering: {len(known_companies)}")
+def guest_search_url(keywords: str, location: str, start: int, base_url: str = LINKEDIN_BASE_URL) -> str:
+    params = urlencode({"keywords": keywords, "location": location, "f_TPR": "r604800", "start": start})
+    return f"{base_url.rstrip('/')}{GUEST_SEARCH_PATH}?{params}"
 
-    if dry_run:
-        print(f"[DRY RUN] Would run {len(BROAD_QUERIES)} broad searches via Playwright")
-        high = [c for c in companies if c.get("priority") == "high"]
-        print(f"[DRY RUN] Plus {len(high)} company-targeted searches")
-        print(f"[DRY RUN] Browser mode: {'headed' if headed else 'headless'}")
-        return {"roles": [], "queries_run": []}
 
-    all_roles = []
-    queries_log = []
-    seen_urls = set()
+def search_linkedin_http(client: HttpClient, keywords: str, location: str = "United States",
+                         stats: dict = None, max_pages: int = SCROLL_CAP + 1,
+                         base_url: str = LINKEDIN_BASE_URL, limiter: RateLimiter = None,
+                         record_path: Path = None, cache: HttpCache = None) -> list:
+    """Run a single search against the guest listing endpoint, paginating by start offset.
 
-    import os
+    Returns the same job dicts as search_linkedin. The first page takes a
+    full token from limiter and each later page a follow-up token, like a
+    page load and its scrolls. Raises GuestFetchError if the endpoint
+    refuses a page (reporting 429s and login walls to limiter as throttling),
+    so the caller can fall back to the browser. With cache, a page the
+    endpoint reports unchanged (304) reuses its stored cards.
+    """
+    host = urlsplit(base_url).hostname
+    limiter = limiter or RateLimiter(rate=1 / MIN_REQUEST_INTERVAL, jitter=REQUEST_JITTER)
+    stats = stats if stats is not None else {}
+    raw_jobs = []
+    fragments = []
+    seen = set()
+    load_ms = extract_ms = 0.0
+    pages = 0
+    start = 0
+
+    def parse(resp):
+        nonlocal extract_ms
+        t0 = time.perf_counter()
+        cards = parse_job_cards(resp.text)
+        extract_ms += (time.perf_counter() - t0) * 1000
+        return cards
+
+    while pages < max_pages:
+        limiter.acquire(host, FOLLOW_UP_COST if pages else 1.0)
+        url = guest_search_url(keywords, location, start, base_url)
+        if cache:
+            resp, cards = cache.fetch(client, url, parse=parse)
+        else:
+            resp, cards = client.get(url), None
+        pages += 1
+        load_ms += resp.elapsed_ms
+        if resp.status == 400 and pages > 1:
+            break  # past the last page
+        if resp.status == 429:
+            limiter.throttled(host, "http-429")
+        elif 300 <= resp.status < 400 and is_authwall(resp.headers.get("location")):
+            limiter.throttled(host, "authwall")
+        if not resp.ok:
+            raise GuestFetchError(f"HTTP {resp.status} for start={start}")
+        limiter.ok(host)
+
+        if cards is None:
+            cards = parse(resp)
+        urls = {c["url"] for c in cards}
+        if not urls - seen:
+            break  # the endpoint is repeating itself
+        seen |= urls
+        raw_jobs.extend(cards)
+        fragments.append(resp.text)
+        if len(cards) < GUEST_PAGE_SIZE:
+            break
+        start += len(cards)
+
+    if record_path and fragments:
+        record_path.write_text("\n".join(fragments))
+
+    stats.update({
+        "backend": "http",
+        "pages": pages,
+        "load_ms": round(load_ms, 1),
+        "extract_mode": "http",
+        "extract_ms": round(extract_ms, 1),
+    })
+    return raw_jobs
 
+
+def build_search_tasks(companies: list) -> list:
+    """Build the ordered list of searches: broad queries, then high-priority companies."""
+    tasks = []
+    for i, (keywords, location) in enumerate(BROAD_QUERIES):
+        tasks.append({
+            "kind": "broad",
+            "keywords": keywords,
+            "location": location,
+            "label": f"{keywords[:60]}...",
+            "wealth_tech": i >= WEALTH_TECH_QUERY_START,
+        })
+    for company in companies:
+        if company.get("priority") != "high":
+            continue
+        name = company.get("company", "")
+        tasks.append({
+            "kind": "company",
+            "keywords": company_search_keywords(name),
+            "location": "United States",
+            "label": f"{name}...",
+            "company": company,
+        })
+    for task in tasks:
+        task["id"] = search_task_id(task)
+        task["record_file"] = f"{task['id']}.html"
+    return number_tasks(tasks)
+
+
+def number_tasks(tasks: list) -> list:
+    """Label each task with its [i/n] position in the run."""
+    for i, task in enumerate(tasks, 1):
+        task["position"] = f"[{i}/{len(tasks)}]"
+    return tasks
+
+
+def search_task_id(task: dict) -> str:
+    """Stable, filesystem-safe id for a search (recording file names, checkpoints)."""
+    slug = re.sub(r"[^a-z0-9]+", "-", task["keywords"].lower()).strip("-")[:50]
+    digest = hashlib.sha1(f"{task['keywords']}|{task['location']}".encode()).hexdigest()[:8]
+    return f"{task['kind']}-{slug}-{digest}"
+
+
+def write_recording_manifest(record_dir: Path, tasks: list, companies: list):
+    """Describe the recorded searches so --replay can rebuild them without a browser."""
+    recorded = [t for t in tasks if (record_dir / t["record_file"]).exists()]
+    manifest = {"date": today(), "companies": companies, "tasks": recorded}
+    with open(record_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Recorded {len(recorded)}/{len(tasks)} result pages to {record_dir}")
+
+
+def build_launch_options(headed: bool = False, verbose: bool = True) -> dict:
+    """Chromium launch options, adjusted for CI and CHROMIUM_PATH."""
+    # CI environment detection
+    is_ci = os.environ.get("CI") == "true" or os.environ.get("GITHUB_ACTIONS") == "true"
+
+    launch_opts = {"headless": not headed}
+
+    # Chromium args for CI stability
+    chromium_args = []
+    if is_ci:
+        chromium_args = [
+            "--no-sandbox",
+            "--disable-gpu",
+            "--disable-dev-shm-usage",
+            "--disable-setuid-sandbox",
+        ]
+        if verbose:
+            print("CI environment detected — launching with --no-sandbox")
+
+    if chromium_args:
+        launch_opts["args"] = chromium_args
+
+    # Let Playwright find its own binary (installed via `playwright install`)
+    # Only override if CHROMIUM_PATH env var is explicitly set
+    chromium_path = os.environ.get("CHROMIUM_PATH")
+    if chromium_path and os.path.exists(chromium_path):
+        launch_opts["executable_path"] = chromium_path
+        if verbose:
+            print(f"Using browser: {chromium_path}")
+    elif verbose:
+        print("Using Playwright-managed Chromium")
+
+    if verbose:
+        print(f"Playwright launch options: {launch_opts}")
+    return launch_opts
+
+
+def search_worker(worker_id: int, tasks: list, task_queue, result_queue, limiter: RateLimiter,
+                  headed: bool = False, search_opts: dict = None,
+                  block_profile: str = DEFAULT_BLOCK_PROFILE, block_stats: RequestBlockStats = None,
+                  profile_root: Path = None, launch_log: list = None):
+    """Pull searches off task_queue with one browser context until the queue is empty.
+
+    Puts (task_index, (raw_jobs, stats)) on result_queue for every task taken —
+    the payload is None if the browser died mid-task, raw_jobs is None if the
+    search was throttled — and (None, worker_id)
+    when the worker exits. search_opts are passed through to search_linkedin,
+    except record_dir, which turns into a per-task record_path.
+
+    With profile_root, the worker runs in a persistent context on its own
+    profile directory under it. Launch timing, cold/warm state and the first
+    page's load time are appended to launch_log.
+    """
+    search_opts = dict(search_opts or {})
+    record_dir = search_opts.pop("record_dir", None)
+    search_opts.pop("http_cache", None)  # guest endpoint only
+    block_stats = block_stats or RequestBlockStats(block_profile)
+    launch = {"worker": worker_id, "profile": "ephemeral"}
+    current = None
     try:
+        # Imported here so the http backend and dry runs never load Playwright;
+        # inside the try so a missing install still ends the worker cleanly
+        from playwright.sync_api import sync_playwright
+
         with sync_playwright() as p:
-            # CI environment detection
-            is_ci = os.environ.get("CI") == "true" or os.environ.get("GITHUB_ACTIONS") == "true"
-
-            launch_opts = {"headless": not headed}
-
-            # Chromium args for CI stability
-            chromium_args = []
-            if is_ci:
-                chromium_args = [
-                    "--no-sandbox",
-                    "--disable-gpu",
-                    "--disable-dev-shm-usage",
-                    "--disable-setuid-sandbox",
-                ]
-                print("CI environment detected — launching with --no-sandbox")
-
-            if chromium_args:
-                launch_opts["args"] = chromium_args
-
-            # Let Playwright find its own binary (installed via `playwright install`)
-            # Only override if CHROMIUM_PATH env var is explicitly set
-            chromium_path = os.environ.get("CHROMIUM_PATH")
-            if chromium_path and os.path.exists(chromium_path):
-                launch_opts["executable_path"] = chromium_path
-                print(f"Using browser: {chromium_path}")
+            launch_opts = build_launch_options(headed, verbose=worker_id == 1)
+            context_opts = {"user_agent": USER_AGENT, "viewport": {"width": 1280, "height": 800}}
+            t0 = time.perf_counter()
+            if profile_root:
+                profile = prepare_profile(profile_root / f"worker-{worker_id}")
+                launch.update(profile=profile["state"], profile_mb=round(profile["bytes"] / 1_048_576, 1),
+                              evicted_files=profile["evicted_files"])
+                launch_opts["args"] = launch_opts.get("args", []) + [f"--disk-cache-size={DISK_CACHE_BYTES}"]
+                browser = None
+                context = p.chromium.launch_persistent_context(
+                    str(profile_root / f"worker-{worker_id}"), **launch_opts, **context_opts)
             else:
-                print("Using Playwright-managed Chromium")
-
-            print(f"Playwright launch options: {launch_opts}")
-            browser = p.chromium.launch(**launch_opts)
-            print("Browser launched successfully")
-            context = browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 800},
-            )
-            page = context.new_page()
-
-            # ── Broad keyword searches ──
-            # Queries at index >= WEALTH_TECH_QUERY_START are "tech companies requiring
-            # wealth management experience" — they use a different relevance filter.
-            WEALTH_TECH_QUERY_START = 10
-
-            print(f"\nRunning {len(BROAD_QUERIES)} broad keyword searches...")
-            for i, (keywords, location) in enumerate(BROAD_QUERIES, 1):
-                print(f"  [{i}/{len(BROAD_QUERIES)}] {keywords[:60]}...")
-
-                raw_jobs = search_linkedin(page, keywords, location)
-                matching = [j for j in raw_jobs if matches_criteria(j["title"])]
-
-                # For wealth-mgmt-at-tech-companies queries, accept any company
-                # as long as the role title signals wealth management relevance
-                is_wealth_tech_query = (i - 1) >= WEALTH_TECH_QUERY_START
-                if is_wealth_tech_query:
-                    relevant = [j for j in matching
-                                if is_wealth_experience_relevant(j["title"])
-                                or is_relevant_company(j["company"], known_companies)]
-                else:
-                    relevant = [j for j in matching if is_relevant_company(j["company"], known_companies)]
-
-                queries_log.append({
-                    "query": keywords,
-                    "raw_results": len(raw_jobs),
-                    "matching_results": len(matching),
-                    "industry_relevant": len(relevant),
-                })
-
-                for job in relevant:
-                    if job["url"] and job["url"] not in seen_urls:
-                        seen_urls.add(job["url"])
-                        all_roles.append({
-                            "company": job["company"],
-                            "stage": "Unknown",
-                            "title": job["title"],
-                            "url": job["url"],
-                            "location": job["location"],
-                            "compensation": "Not disclosed",
-                            "datePosted": job["datePosted"],
-                            "source": "LinkedIn",
-                            "segment": "WealthTech (cross-industry)" if is_wealth_tech_query else "Unknown",
-                        })
-
-                skipped = len(matching) - len(relevant)
-                print(f"    Found {len(raw_jobs)} total, {len(matching)} title match, {len(relevant)} industry relevant ({skipped} non-fintech skipped)")
-                human_delay()
-
-            # ── Company-targeted searches ──
-            high_companies = [c for c in companies if c.get("priority") == "high"]
-            if high_companies:
-                print(f"\nRunning {len(high_companies)} company-targeted searches...")
-                for i, company in enumerate(high_companies, 1):
-                    name = company.get("company", "")
-                    segment = company.get("segment", "Unknown")
-                    stage = company.get("stage", "Unknown")
-                    print(f"  [{i}/{len(high_companies)}] {name}...")
-
-                    raw_jobs = run_company_search(page, name)
-                    # Use strict regex-based title filter for company-targeted results
-                    matching = [j for j in raw_jobs if is_relevant_title(j["title"])]
-
-                    queries_log.append({
-                        "query": f"Company: {name}",
-                        "raw_results": len(raw_jobs),
-                        "matching_results": len(matching),
-                    })
-
-                    for job in matching:
-                        if job["url"] and job["url"] not in seen_urls:
-                            seen_urls.add(job["url"])
-                            all_roles.append({
-                                "company": job["company"] or name,
-                                "stage": stage,
-                                "title": job["title"],
-                                "url": job["url"],
-                                "location": job["location"],
-                                "compensation": "Not disclosed",
-                                "datePosted": job["datePosted"],
-                                "source": "LinkedIn",
-                                "segment": segment,
-                            })
-
-                    print(f"    Found {len(raw_jobs)} total, {len(matching)} matching criteria")
-                    human_delay()
-
-            browser.close()
-
+                browser = p.chromium.launch(**launch_opts)
+                context = browser.new_context(**context_opts)
+            launch["launch_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            print(f"  [worker {worker_id}] Browser launched successfully "
+                  f"({launch['profile']} profile, {launch['launch_ms']:.0f}ms)")
+            install_request_blocking(context, block_profile, block_stats)
+            page = context.pages[0] if context.pages else context.new_page()
+
+            while True:
+                try:
+                    current = task_queue.get_nowait()
+                except queue.Empty:
+                    break
+                task = tasks[current]
+                print(f"  [worker {worker_id}] {task['position']} {task['label']}")
+
+                stats = {}
+                record_path = record_dir / task["record_file"] if record_dir else None
+                t0 = time.perf_counter()
+                with limiter.working():
+                    raw_jobs = search_linkedin(page, task["keywords"], task["location"],
+                                               stats=stats, record_path=record_path,
+                                               max_scrolls=task.get("max_scrolls", SCROLL_CAP),
+                                               limiter=limiter, **search_opts)
+                stats["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                if "first_page_ms" not in launch and "load_ms" in stats:
+                    launch["first_page_ms"] = stats["load_ms"]
+                result_queue.put((current, (raw_jobs, stats)))
+                current = None
+
+            context.close()
+            if browser:
+                browser.close()
+    except ImportError as e:
+        print(f"\nERROR in Playwright worker {worker_id}: Playwright is not installed ({e}); "
+              f"its searches are skipped")
     except Exception as e:
-        print(f"\nERROR in Playwright browser automation: {type(e).__name__}: {e}")
+        print(f"\nERROR in Playwright worker {worker_id}: {type(e).__name__}: {e}")
         import traceback
         traceback.print_exc()
-        print(f"Returning {len(all_roles)} roles collected before the error.")
+        if current is not None:
+            result_queue.put((current, None))
+    finally:
+        if launch_log is not None and "launch_ms" in launch:
+            launch_log.append(launch)
+        result_queue.put((None, worker_id))
 
-    # Enrich with company data from Agent 1
-    company_lookup = {c["company"].lower(): c for c in companies}
+
+class FailureStreak:
+    """Consecutive-failure counter shared by workers; trips once `limit` failures land in a row."""
+
+    def __init__(self, limit: int = HTTP_FAILURE_LIMIT):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._count = 0
+        self.tripped = threading.Event()
+
+    def record(self, ok: bool):
+        with self._lock:
+            self._count = 0 if ok else self._count + 1
+            if self._count >= self.limit:
+                self.tripped.set()
+
+
+def http_search_worker(worker_id: int, tasks: list, task_queue, result_queue, limiter: RateLimiter,
+                       client: HttpClient = None, search_opts: dict = None, streak: FailureStreak = None):
+    """Pull searches off task_queue and run them against the guest endpoint.
+
+    Same queue protocol as search_worker: a refused search is reported as
+    (task_index, None). Once the shared failure streak trips, the worker
+    stops taking tasks and leaves the rest for the Playwright fallback.
+    """
+    search_opts = dict(search_opts or {})
+    record_dir = search_opts.pop("record_dir", None)
+    cache = search_opts.pop("http_cache", None)
+    base_url = search_opts.get("base_url", LINKEDIN_BASE_URL)
+    streak = streak or FailureStreak()
+    try:
+        while not streak.tripped.is_set():
+            try:
+                current = task_queue.get_nowait()
+            except queue.Empty:
+                break
+            task = tasks[current]
+            print(f"  [http {worker_id}] {task['position']} {task['label']}")
+
+            stats = {}
+            record_path = record_dir / task["record_file"] if record_dir else None
+            t0 = time.perf_counter()
+            try:
+                with limiter.working():
+                    raw_jobs = search_linkedin_http(client, task["keywords"], task["location"], stats=stats,
+                                                    max_pages=task.get("max_scrolls", SCROLL_CAP) + 1,
+                                                    base_url=base_url, limiter=limiter, record_path=record_path,
+                                                    cache=cache)
+            except (GuestFetchError, OSError, http.client.HTTPException) as e:
+                print(f"    Guest fetch failed ({type(e).__name__}: {e}) — leaving for the browser")
+                streak.record(False)
+                result_queue.put((current, None))
+                continue
+            stats["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            streak.record(True)
+            result_queue.put((current, (raw_jobs, stats)))
+    finally:
+        result_queue.put((None, worker_id))
+
+
+def run_search_pool(tasks: list, workers: int, worker=search_worker, limiter: RateLimiter = None):
+    """Run tasks across a pool of workers, yielding (index, raw_jobs, stats) in task order.
+
+    worker is called as worker(worker_id, tasks, task_queue, result_queue,
+    limiter); bind its other options with functools.partial. All workers
+    share one rate limiter. Results are
+    buffered and released in the order the tasks were built, so dedup
+    against seen_urls behaves exactly like the serial path. Tasks that
+    never completed (all workers crashed) are skipped.
+    """
+    task_queue = queue.Queue()
+    for i in range(len(tasks)):
+        task_queue.put(i)
+    result_queue = queue.Queue()
+    limiter = limiter or RateLimiter(rate=1 / MIN_REQUEST_INTERVAL, jitter=REQUEST_JITTER)
+
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(n, tasks, task_queue, result_queue, limiter),
+            name=f"agent3-worker-{n}",
+            daemon=True,
+        )
+        for n in range(1, workers + 1)
+    ]
+    for t in threads:
+        t.start()
+
+    done = {}
+    next_index = 0
+    running = len(threads)
+    while running:
+        index, payload = result_queue.get()
+        if index is None:
+            running -= 1
+            continue
+        done[index] = payload
+        while next_index in done:
+            payload = done.pop(next_index)
+            if payload is not None:
+                yield (next_index, *payload)
+            next_index += 1
+
+    # Workers are gone — release whatever completed after a gap
+    for index in sorted(done):
+        if done[index] is not None:
+            yield (index, *done[index])
+
+
+def run_http_search(tasks: list, workers: int, client: HttpClient, search_opts: dict = None,
+                    browser_worker=search_worker, limiter: RateLimiter = None):
+    """Run tasks on the guest endpoint, then any it refused in the browser; yields in task order.
+
+    Results are held until the fallback finishes so roles are still
+    collected in task order.
+    """
+    streak = FailureStreak()
+    results = {
+        index: (raw_jobs, stats)
+        for index, raw_jobs, stats in run_search_pool(
+            tasks, workers, partial(http_search_worker, client=client, search_opts=search_opts, streak=streak),
+            limiter)
+    }
+
+    missing = [i for i in range(len(tasks)) if i not in results]
+    if missing:
+        reason = "guest endpoint kept refusing" if streak.tripped.is_set() else "guest fetch failed"
+        print(f"\nFalling back to Playwright for {len(missing)} searches ({reason})...")
+        fallback_tasks = [tasks[i] for i in missing]
+        for j, raw_jobs, stats in run_search_pool(fallback_tasks, min(workers, len(missing)), browser_worker,
+                                                     limiter):
+            stats["backend"] = "playwright"
+            results[missing[j]] = (raw_jobs, stats)
+
+    for index in sorted(results):
+        yield (index, *results[index])
+
+
+def record_query_metric(task: dict, entry: dict, new_roles: int):
+    """Telemetry record for one finished search, from its queries_log entry."""
+    fields = {k: v for k, v in entry.items() if k not in ("query", "duration_ms")}
+    telemetry.record("query", f"agent3.{entry.get('backend', 'playwright')}", entry.get("duration_ms"),
+                     task=task["id"], search_kind=task["kind"], new_roles=new_roles, **fields)
+
+
+def collect_task_roles(task: dict, raw_jobs: list, company_index: CompanyIndex,
+                       seen_urls: set, all_roles: list, queries_log: list, stats: dict = None):
+    """Filter one search's raw results, log it, and append new roles (deduped by URL).
+
+    Per-query stats from the search (timings etc.) are added to its queries_log entry.
+    """
+    stats = stats or {}
+    if task["kind"] == "broad":
+        matching = [j for j in raw_jobs if matches_criteria(j["title"])]
+
+        # For wealth-mgmt-at-tech-companies queries, accept any company
+        # as long as the role title signals wealth management relevance
+        if task["wealth_tech"]:
+            relevant = [j for j in matching
+                        if is_wealth_experience_relevant(j["title"])
+                        or is_relevant_company(j["company"], company_index)]
+        else:
+            relevant = [j for j in matching if is_relevant_company(j["company"], company_index)]
+
+        queries_log.append({
+            "query": task["keywords"],
+            "raw_results": len(raw_jobs),
+            "matching_results": len(matching),
+            "industry_relevant": len(relevant),
+            **stats,
+        })
+
+        for job in relevant:
+            if job["url"] and job["url"] not in seen_urls:
+                seen_urls.add(job["url"])
+                all_roles.append({
+                    "company": job["company"],
+                    "stage": "Unknown",
+                    "title": job["title"],
+                    "url": job["url"],
+                    "location": job["location"],
+                    "compensation": "Not disclosed",
+                    "datePosted": job["datePosted"],
+                    "source": "LinkedIn",
+                    "segment": "WealthTech (cross-industry)" if task["wealth_tech"] else "Unknown",
+                })
+
+        skipped = len(matching) - len(relevant)
+        print(f"    {task['position']} Found {len(raw_jobs)} total, {len(matching)} title match, {len(relevant)} industry relevant ({skipped} non-fintech skipped)")
+        return
+
+    company = task["company"]
+    name = company.get("company", "")
+    # Use strict regex-based title filter for company-targeted results
+    matching = [j for j in raw_jobs if is_relevant_title(j["title"])]
+    # The keyword search also surfaces other employers; the query's yield is what it finds at its company
+    target = company_index.canonical_key(name)
+    at_company = [j for j in matching if company_index.canonical_key(j["company"] or name) == target]
+
+    queries_log.append({
+        "query": f"Company: {name}",
+        "raw_results": len(raw_jobs),
+        "matching_results": len(matching),
+        "company_relevant": len(at_company),
+        **stats,
+    })
+
+    for job in matching:
+        if job["url"] and job["url"] not in seen_urls:
+            seen_urls.add(job["url"])
+            all_roles.append({
+                "company": job["company"] or name,
+                "stage": company.get("stage", "Unknown"),
+                "title": job["title"],
+                "url": job["url"],
+                "location": job["location"],
+                "compensation": "Not disclosed",
+                "datePosted": job["datePosted"],
+                "source": "LinkedIn",
+                "segment": company.get("segment", "Unknown"),
+            })
+
+    print(f"    {task['position']} Found {len(raw_jobs)} total, {len(matching)} matching criteria, "
+          f"{len(at_company)} at {name}")
+
+
+def enrich_roles(all_roles: list, company_index: CompanyIndex):
+    """Fill in stage/segment from Agent 1 research where the search left them Unknown."""
     for role in all_roles:
-        company_data = company_lookup.get(role["company"].lower())
+        company_data = company_index.record(role["company"])
         if company_data:
             if role["stage"] == "Unknown":
                 role["stage"] = company_data.get("stage", "Unknown")
             if role["segment"] == "Unknown":
                 role["segment"] = company_data.get("segment", "Unknown")
 
-    result = {"roles": all_roles, "queries_run": queries_log}
 
+def print_run_summary(all_roles: list, queries_log: list, network: dict = None, launches: list = None):
+    """Print role totals and the per-query timing/scrolling/blocking rollups."""
     print(f"\nTotal unique roles found: {len(all_roles)}")
     print(f"Queries run: {len(queries_log)}")
 
+    extract_ms = [q["extract_ms"] for q in queries_log if "extract_ms" in q]
+    if extract_ms:
+        modes = sorted({q.get("extract_mode", "?") for q in queries_log if "extract_ms" in q})
+        print(f"Card extraction: {sum(extract_ms):.0f}ms total over {len(extract_ms)} pages "
+              f"(mode: {', '.join(modes)})")
+
+    scrolled = [q for q in queries_log if "scrolls" in q]
+    if scrolled:
+        converged = sum(1 for q in scrolled if q["scroll_stop"] == "converged")
+        print(f"Scrolling: {sum(q['scrolls'] for q in scrolled)} scrolls, "
+              f"{sum(q['cards_gained'] for q in scrolled)} cards gained, "
+              f"{converged}/{len(scrolled)} lists converged before their scroll cap")
+
+    load_ms = [q["load_ms"] for q in queries_log if "load_ms" in q]
+    if load_ms:
+        print(f"Page loads: avg {sum(load_ms) / len(load_ms):.0f}ms over {len(load_ms)} pages")
+    for launch in sorted(launches or [], key=lambda l: l["worker"]):
+        first_page = f"{launch['first_page_ms']:.0f}ms" if "first_page_ms" in launch else "n/a"
+        print(f"Browser worker {launch['worker']}: {launch['profile']} launch {launch['launch_ms']:.0f}ms, "
+              f"first page {first_page}")
+
+    pages = [q["pages"] for q in queries_log if "pages" in q]
+    if pages:
+        print(f"Guest API: {sum(pages)} pages over {len(pages)} searches, "
+              f"{len(queries_log) - len(pages)} searches fell back to the browser")
+    if network and network["requests_total"]:
+        print(f"Request blocking ({network['profile']}): {network['requests_blocked']}/{network['requests_total']} "
+              f"requests blocked ({network['blocked_pct']}%), ~{network['est_bytes_saved'] / 1_000_000:.1f} MB saved (est.)")
+        for reason, count in network["blocked_by_reason"].items():
+            print(f"  {reason}: {count}")
+
     # Summarize by source
     sources = {}
     for r in all_roles:
@@ -553,7 +1102,205 @@ def run(dry_run: bool = False, input_file: str = None, headed: bool = False) ->
     for s, count in sorted(sources.items()):
         print(f"  {s}: {count} roles")
 
+
+def run_replay(replay_dir: str) -> dict:
+    """Re-run card parsing and every filter over recorded result pages — no browser, no network.
+
+    Recorded pages are parsed with the browser-free card parser, which mirrors
+    extract_jobs_from_page's selectors (tests/test_linkedin_cards.py checks
+    both against one recorded page). Results are returned, not saved.
+    """
+    t0 = time.perf_counter()
+    replay_dir = Path(replay_dir)
+    with open(replay_dir / "manifest.json") as f:
+        manifest = json.load(f)
+    print(f"Replaying {len(manifest['tasks'])} recorded searches from {replay_dir} "
+          f"(recorded {manifest.get('date', '?')})")
+
+    company_index = build_company_index(manifest.get("companies", []))
+    all_roles = []
+    queries_log = []
+    seen_urls = set()
+
+    for task in manifest["tasks"]:
+        html = (replay_dir / task["record_file"]).read_text()
+        t1 = time.perf_counter()
+        raw_jobs = parse_job_cards(html)
+        stats = {"extract_mode": "replay", "extract_ms": round((time.perf_counter() - t1) * 1000, 1)}
+        collect_task_roles(task, raw_jobs, company_index, seen_urls, all_roles, queries_log, stats)
+
+    enrich_roles(all_roles, company_index)
+    elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    print_run_summary(all_roles, queries_log)
+    print(f"Replay finished in {elapsed_ms:.0f}ms (results not saved)")
+
+    return {
+        "roles": all_roles,
+        "queries_run": queries_log,
+        "replay": {"dir": str(replay_dir), "recorded": manifest.get("date"), "elapsed_ms": elapsed_ms},
+    }
+
+
+def run(dry_run: bool = False, input_file: str = None, headed: bool = False,
+        workers: int = DEFAULT_WORKERS, compare_extraction: bool = False,
+        block_profile: str = DEFAULT_BLOCK_PROFILE, record: bool = False,
+        replay_dir: str = None, schedule: bool = True, backend: str = DEFAULT_BACKEND,
+        base_url: str = LINKEDIN_BASE_URL, persistent_profile: bool = DEFAULT_PERSISTENT_PROFILE,
+        reset_profile: bool = False, resume: bool = False, http_cache: bool = True) -> dict:
+    """Run Agent 3 with Playwright browser automation."""
+    print("=" * 60)
+    print("AGENT 3 — LinkedIn Job Search (Browser Automation)")
+    print(f"Date: {today()}")
+    print("=" * 60)
+
+    if replay_dir:
+        return run_replay(replay_dir)
+
+    # Load Agent 1 results
+    companies = []
+    if input_file:
+        with open(input_file) as f:
+            companies = json.load(f)
+        print(f"Loaded {len(companies)} companies from {input_file}")
+    else:
+        companies = load_results("agent1") or []
+        if companies:
+            print(f"Loaded {len(companies)} companies from today's Agent 1 results")
+        else:
+            print("No Agent 1 results found — running with broad searches only")
+
+    # Index of known fintech companies (whitelist + Agent 1 research) for
+    # industry filtering and enrichment
+    company_index = build_company_index(companies)
+    print(f"Known fintech companies for filtering: {len(company_index)}")
+
+    tasks = build_search_tasks(companies)
+    schedule_report = None
+    if schedule:
+        tasks, skipped, schedule_report = schedule_tasks(tasks, base_scrolls=BASELINE_SCROLLS)
+        number_tasks(tasks)
+        tiers = ", ".join(f"{n} {tier}" for tier, n in sorted(schedule_report["tiers"].items()))
+        print(f"Query schedule from {schedule_report['history_runs']} past runs: {tiers}; "
+              f"skipping {len(skipped)} dead queries (~{schedule_report['est_seconds_saved']}s saved vs full run)")
+        for task in skipped:
+            print(f"  skip: {task['label']}")
+    n_broad = sum(1 for t in tasks if t["kind"] == "broad")
+    n_company = len(tasks) - n_broad
+    workers = max(1, min(workers, len(tasks)))
+
+    if dry_run:
+        print(f"[DRY RUN] Would run {n_broad} broad searches via Playwright")
+        print(f"[DRY RUN] Plus {n_company} company-targeted searches")
+        print(f"[DRY RUN] Backend: {backend} ({base_url}), browser mode: {'headed' if headed else 'headless'}, "
+              f"{workers} worker(s), request blocking: {block_profile}")
+        print(f"[DRY RUN] Browser profile: {PROFILE_ROOT if persistent_profile else 'ephemeral'}")
+        if record:
+            print(f"[DRY RUN] Would record result pages to {RECORDINGS_DIR / today()}")
+        return {"roles": [], "queries_run": []}
+
+    # Every finished search is streamed to a checkpoint so a crashed run can --resume
+    checkpoint = RunCheckpoint("agent3")
+    if resume and not checkpoint.exists():
+        print("No checkpoint for today — starting from the first search")
+    done_ids, all_roles, queries_log = checkpoint.start(resume)
+    seen_urls = {r["url"] for r in all_roles if r.get("url")}
+    all_tasks = tasks
+    if done_ids:
+        done = set(done_ids)
+        tasks = number_tasks([t for t in all_tasks if t["id"] not in done])
+        n_broad = sum(1 for t in tasks if t["kind"] == "broad")
+        n_company = len(tasks) - n_broad
+        workers = max(1, min(workers, len(tasks)))
+        print(f"Resuming: {len(done)} searches already done ({len(all_roles)} roles), {len(tasks)} to go")
+
+    print(f"\nRunning {n_broad} broad keyword searches and {n_company} company-targeted searches "
+          f"across {workers} {backend} worker(s)...")
+    search_opts = {"compare_extraction": compare_extraction, "base_url": base_url}
+    record_dir = None
+    if record:
+        record_dir = RECORDINGS_DIR / today()
+        record_dir.mkdir(parents=True, exist_ok=True)
+        search_opts["record_dir"] = record_dir
+    block_stats = RequestBlockStats(block_profile)
+    if reset_profile:
+        reset_profiles()
+    launch_log = []
+    browser_worker = partial(search_worker, headed=headed, search_opts=search_opts,
+                             block_profile=block_profile, block_stats=block_stats,
+                             profile_root=PROFILE_ROOT if persistent_profile else None,
+                             launch_log=launch_log)
+    limiter = RateLimiter(rate=1 / MIN_REQUEST_INTERVAL, jitter=REQUEST_JITTER)
+    client = None
+    if backend == "http":
+        client = HttpClient()
+        if http_cache:
+            search_opts["http_cache"] = default_cache()
+        results = run_http_search(tasks, workers, client, search_opts, browser_worker, limiter)
+    else:
+        results = run_search_pool(tasks, workers, browser_worker, limiter)
+    throttled = []
+    try:
+        for index, raw_jobs, stats in results:
+            if raw_jobs is None:
+                # Throttled, not empty: no checkpoint (so --resume retries it) and no
+                # queries_run entry (so the scheduler doesn't count it as zero yield)
+                print(f"    {tasks[index]['position']} Throttled ({stats.get('throttled', 'unknown')}) — "
+                      f"left for --resume")
+                throttled.append({"query": query_key(tasks[index]), **stats})
+                telemetry.record("query", f"agent3.{stats.get('backend', 'playwright')}", stats.get("duration_ms"),
+                                 task=tasks[index]["id"], search_kind=tasks[index]["kind"],
+                                 throttled=stats.get("throttled", "unknown"))
+                continue
+            n_roles = len(all_roles)
+            collect_task_roles(tasks[index], raw_jobs, company_index,
+                               seen_urls, all_roles, queries_log, stats)
+            checkpoint.record(tasks[index]["id"], queries_log[-1], all_roles[n_roles:])
+            record_query_metric(tasks[index], queries_log[-1], len(all_roles) - n_roles)
+    except Exception as e:
+        print(f"\nERROR in {backend} search: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        print(f"Returning {len(all_roles)} roles collected before the error.")
+
+    if record_dir:
+        write_recording_manifest(record_dir, all_tasks, companies)
+
+    # Enrich with company data from Agent 1
+    enrich_roles(all_roles, company_index)
+
+    network = block_stats.summary()
+    result = {"roles": all_roles, "queries_run": queries_log, "network": network}
+    if throttled:
+        result["throttled_searches"] = throttled
+    result["rate_limit"] = limiter.summary()
+    if launch_log:
+        result["browser"] = sorted(launch_log, key=lambda l: l["worker"])
+    if schedule_report:
+        result["schedule"] = schedule_report
+    print_run_summary(all_roles, queries_log, network, launch_log)
+    rate = result["rate_limit"]
+    throttles = ", ".join(f"{n} {reason}" for reason, n in rate["throttles"].items()) or "none"
+    print(f"Rate limiter: {rate['wait_s']:.0f}s waiting vs {rate['work_s']:.0f}s working "
+          f"({rate['wait_pct']}% waiting); throttle signals: {throttles}")
+    if throttled:
+        print(f"Throttled searches: {len(throttled)} (not logged as results; rerun with --resume to retry them)")
+    if client:
+        result["http"] = client.stats()
+        client.close()
+        print(f"HTTP: {result['http']['requests']} requests over {result['http']['connections_opened']} "
+              f"connection(s), {result['http']['bytes_received'] / 1000:.0f} KB received")
+        if http_cache:
+            default_cache().save()
+
     save_results("agent3", result)
+    remaining = {t["id"] for t in all_tasks} - set(checkpoint.completed)
+    if remaining:
+        checkpoint.close()
+        print(f"Checkpoint kept: {len(remaining)} of {len(all_tasks)} searches unfinished — "
+              f"rerun with --resume to finish them")
+    else:
+        checkpoint.discard()
 
     return result
 
@@ -563,9 +1310,41 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="Show what would happen without running browser")
     parser.add_argument("--headed", action="store_true", help="Run with visible browser window")
     parser.add_argument("--input", type=str, help="Path to Agent 1 results JSON file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of parallel browser workers (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--compare-extraction", action="store_true",
+                        help="Also time the per-element card extraction and log it against the batch script")
+    parser.add_argument("--block-profile", choices=sorted(BLOCK_PROFILES), default=DEFAULT_BLOCK_PROFILE,
+                        help=f"Which requests to abort while browsing (default: {DEFAULT_BLOCK_PROFILE})")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"How to fetch search results (default: {DEFAULT_BACKEND}); http falls back to playwright")
+    parser.add_argument("--base-url", type=str, default=LINKEDIN_BASE_URL,
+                        help="LinkedIn base URL, e.g. a local tests.stub_servers linkedin")
+    parser.add_argument("--persistent-profile", action="store_true", default=DEFAULT_PERSISTENT_PROFILE,
+                        help=f"Keep each worker's browser profile and disk cache in {PROFILE_ROOT.relative_to(DATA_DIR.parent)} "
+                             "between runs (default on when AGENT3_PERSISTENT_PROFILE=1)")
+    parser.add_argument("--reset-profile", action="store_true",
+                        help="Delete the persistent browser profiles before launching")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip searches today's interrupted run already finished (from data/checkpoints/)")
+    parser.add_argument("--no-schedule", action="store_true",
+                        help="Run every query at the default scroll depth, ignoring past yield")
+    parser.add_argument("--record", action="store_true",
+                        help=f"Save each search results page's HTML under {RECORDINGS_DIR.relative_to(DATA_DIR.parent)}/<date>/")
+    parser.add_argument("--replay", type=str, metavar="DIR",
+                        help="Re-run parsing and filters over a recorded directory, without a browser")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="With --backend http, fetch every page in full instead of revalidating cached copies")
     args = parser.parse_args()
 
-    result = run(dry_run=args.dry_run, input_file=args.input, headed=args.headed)
+    result = run(dry_run=args.dry_run, input_file=args.input, headed=args.headed,
+                 workers=args.workers, compare_extraction=args.compare_extraction,
+                 block_profile=args.block_profile, record=args.record, replay_dir=args.replay,
+                 schedule=not args.no_schedule, backend=args.backend, base_url=args.base_url,
+                 persistent_profile=args.persistent_profile, reset_profile=args.reset_profile,
+                 resume=args.resume, http_cache=not args.no_http_cache)
+    if args.backend == "http" and not args.no_http_cache:
+        default_cache().report("agent3")
 
     roles = result.get("roles", [])
     if roles:
@@ -0,0 +1,234 @@
+"""
+Admission control for Claude API calls, driven by the API's own rate-limit headers.
+
+Every response carries the organisation's remaining budget per limit
+(anthropic-ratelimit-{requests,input-tokens,output-tokens,tokens}-remaining)
+and when each refills (…-reset); a 429 or 529 also says how long to back
+off (retry-after). One scheduler per process reads those headers from every
+response and error, and admits a call only once its limits have room for
+it. Agents that run in parallel share it, so one agent's burst makes the
+other wait just long enough rather than both hitting 429s, and nothing
+sleeps a fixed time "to be safe".
+
+Budgets refill continuously, so a call short by N tokens waits for N
+tokens' worth of refill at the limit's per-minute rate, not for the full
+reset. Before the first response nothing is known and calls go straight
+through.
+
+The scheduler also owns retries (agents create their client with the SDK's
+own retries off, so no wait happens outside it): rate-limit and overload
+errors pause everyone, transient network and 5xx errors back off only the
+failing call.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+LIMIT_KINDS = ("requests", "input-tokens", "output-tokens", "tokens")
+HEADER_PREFIX = "anthropic-ratelimit-"
+
+# Rate limited / overloaded: the whole process backs off
+THROTTLE_STATUSES = (429, 529)
+RETRY_ERROR_TYPES = ("rate_limit_error", "overloaded_error")
+# Transient failures of a single call: only that call backs off
+TRANSIENT_STATUSES = (408, 409, 500, 502, 503, 504)
+TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError")
+
+# Backoff when an error doesn't say how long to wait; doubles per consecutive error
+FALLBACK_RETRY_AFTER = 5.0
+MAX_RETRY_AFTER = 120.0
+
+# Rough characters per token, for sizing a request before it's sent
+CHARS_PER_TOKEN = 4
+
+
+def _parse_reset(value: str, now_mono: float):
+    """RFC 3339 reset timestamp -> monotonic time (None if unparseable)."""
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if reset.tzinfo is None:
+        reset = reset.replace(tzinfo=timezone.utc)
+    delta = (reset - datetime.now(timezone.utc)).total_seconds()
+    return now_mono + max(0.0, delta)
+
+
+def retry_after_seconds(headers) -> float:
+    """Seconds from retry-after-ms / retry-after headers, or None."""
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+
+def error_status(error: Exception):
+    """HTTP status of an API error; 529 for an overloaded error reported mid-stream."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        body = getattr(error, "body", None)
+        if isinstance(body, dict):
+            error_type = (body.get("error") or {}).get("type") or body.get("type")
+            if error_type in RETRY_ERROR_TYPES:
+                return 429 if error_type == "rate_limit_error" else 529
+    return status
+
+
+class ApiScheduler:
+    """Tracks remaining API budget from response headers and admits calls against it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.limits = {}         # kind -> {"limit", "remaining", "reset"} (reset is monotonic)
+        self.paused_until = 0.0  # from retry-after
+        self.strikes = 0
+        self.admitted = 0
+        self.retries = 0
+        self.waited_s = 0.0
+
+    def _refill(self, state: dict, now: float):
+        """Credit a limit with what refilled since its headers arrived (limit per minute)."""
+        if state["limit"]:
+            refilled = (now - state["updated"]) * state["limit"] / 60.0
+            state["remaining"] = min(state["limit"], state["remaining"] + refilled)
+        state["updated"] = now
+
+    def _wait_for(self, kind: str, needed: float, now: float) -> float:
+        state = self.limits.get(kind)
+        if not state or state["reset"] is None or state["reset"] <= now:
+            return 0.0  # unknown, or fully refilled by now
+        self._refill(state, now)
+        deficit = needed - state["remaining"]
+        if deficit <= 0:
+            return 0.0
+        wait = state["reset"] - now
+        if state["limit"]:
+            wait = min(wait, deficit * 60.0 / state["limit"])
+        return wait
+
+    def admit(self, input_tokens: int = 0, label: str = "") -> float:
+        """Block until the known budget covers one request of ~input_tokens; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                waits = {
+                    "retry-after": self.paused_until - now,
+                    "requests": self._wait_for("requests", 1, now),
+                    "input-tokens": self._wait_for("input-tokens", input_tokens, now),
+                    "tokens": self._wait_for("tokens", input_tokens, now),
+                    "output-tokens": self._wait_for("output-tokens", 1, now),
+                }
+                reason, wait = max(waits.items(), key=lambda kv: kv[1])
+                if wait <= 0:
+                    # Reserve our share so concurrent callers don't all see the same budget
+                    for kind, cost in (("requests", 1), ("input-tokens", input_tokens), ("tokens", input_tokens)):
+                        if kind in self.limits:
+                            self.limits[kind]["remaining"] -= cost
+                    self.admitted += 1
+                    self.waited_s += waited
+                    return waited
+            wait += random.uniform(0, 0.5)
+            print(f"  API scheduler: {label + ' ' if label else ''}waiting {wait:.1f}s for {reason} budget")
+            time.sleep(wait)
+            waited += wait
+
+    def update(self, headers):
+        """Record the budget reported by a response's (or error's) headers."""
+        if not headers:
+            return
+        with self._lock:
+            now = time.monotonic()
+            for kind in LIMIT_KINDS:
+                remaining = headers.get(f"{HEADER_PREFIX}{kind}-remaining")
+                if remaining is None:
+                    continue
+                try:
+                    state = {"remaining": float(remaining), "limit": None, "updated": now,
+                             "reset": _parse_reset(headers.get(f"{HEADER_PREFIX}{kind}-reset"), now)}
+                    limit = headers.get(f"{HEADER_PREFIX}{kind}-limit")
+                    if limit is not None:
+                        state["limit"] = float(limit)
+                except ValueError:
+                    continue
+                self.limits[kind] = state
+
+    def succeeded(self, headers):
+        self.update(headers)
+        with self._lock:
+            self.strikes = 0
+
+    def failed(self, error: Exception, attempt: int = 0):
+        """Handle an API error; returns seconds to back off if it's worth retrying, else None.
+
+        Rate-limit and overload errors pause every caller (for retry-after
+        if given) and the next admit() waits it out; transient errors only
+        delay the failing call, by sleeping here.
+        """
+        status = error_status(error)
+        transient = status in TRANSIENT_STATUSES or type(error).__name__ in TRANSIENT_ERRORS
+        if status not in THROTTLE_STATUSES and not transient:
+            return None
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        self.update(headers)
+        delay = retry_after_seconds(headers)
+        if status not in THROTTLE_STATUSES:
+            if delay is None:
+                delay = min(MAX_RETRY_AFTER, FALLBACK_RETRY_AFTER * 2 ** attempt)
+            with self._lock:
+                self.retries += 1
+                self.waited_s += delay
+            time.sleep(delay)
+            return delay
+        with self._lock:
+            self.retries += 1
+            if delay is None:
+                delay = min(MAX_RETRY_AFTER, FALLBACK_RETRY_AFTER * 2 ** self.strikes)
+            self.strikes += 1
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        return delay
+
+    def summary(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "admitted": self.admitted,
+                "retries": self.retries,
+                "waited_s": round(self.waited_s, 1),
+                "remaining": {kind: state["remaining"] for kind, state in self.limits.items()
+                              if state["reset"] is None or state["reset"] > now},
+            }
+
+
+def estimate_input_tokens(create_kwargs: dict) -> int:
+    """Rough input size of a request from its prompt text (search results aren't known yet)."""
+    chars = 0
+    system = create_kwargs.get("system", "")
+    if isinstance(system, str):
+        chars += len(system)
+    else:
+        chars += sum(len(block.get("text", "")) for block in system)
+    for message in create_kwargs.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(block.get("text", "")) for block in content if isinstance(block, dict))
+    return chars // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=1)
+def default_scheduler() -> ApiScheduler:
+    """Process-wide scheduler, so every agent in a run shares one view of the budget."""
+    return ApiScheduler()
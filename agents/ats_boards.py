@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Direct fetchers for public ATS job boards (Greenhouse, Lever, Ashby).
+
+When a company's careers_url points at a hosted job board, its openings are
+available as public JSON: no LLM, no web search, one HTTP request per
+company. The board type and token are read from the URL, every board is
+fetched concurrently over one pooled HTTP client, titles are screened with
+the same strict filter agent 3 uses for company-targeted searches, and the
+matches come back as agent-2-shaped roles plus a coverage entry per company.
+Board responses go through the conditional-request cache
+(agents/http_cache.py), so an unchanged board costs a 304 and no parsing.
+
+Set --base-url (or ATS_BASE_URL) to send every board request to one host
+instead, e.g. `tests.stub_servers boards`; the API paths of the three boards
+don't overlap, so one stub serves them all.
+
+Usage:
+    python -m agents.ats_boards                          # boards in today's Agent 1 results
+    python -m agents.ats_boards --input data/results/agent1_2026-02-21.json
+    python -m agents.ats_boards --base-url http://127.0.0.1:8767
+    python -m agents.ats_boards --no-cache
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from agents.http_cache import HttpCache, default_cache
+from agents.http_client import HttpClient
+from agents.title_filters import is_relevant_title
+from agents.utils import load_results
+
+# Public listing endpoints, by board; {token} is the company's board name
+BOARD_APIS = {
+    "greenhouse": "https://boards-api.greenhouse.io/v1/boards/{token}/jobs",
+    "lever": "https://api.lever.co/v0/postings/{token}?mode=json",
+    "ashby": "https://api.ashbyhq.com/posting-api/job-board/{token}?includeCompensation=true",
+}
+BOARD_SOURCES = {"greenhouse": "Greenhouse", "lever": "Lever", "ashby": "Ashby"}
+
+# Careers-page hosts that identify each board
+BOARD_HOSTS = {
+    "boards.greenhouse.io": "greenhouse",
+    "job-boards.greenhouse.io": "greenhouse",
+    "boards.eu.greenhouse.io": "greenhouse",
+    "job-boards.eu.greenhouse.io": "greenhouse",
+    "jobs.lever.co": "lever",
+    "jobs.eu.lever.co": "lever",
+    "jobs.ashbyhq.com": "ashby",
+}
+
+ATS_WORKERS = 8
+ATS_BASE_URL = os.environ.get("ATS_BASE_URL")
+
+TOKEN_RE = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+class BoardFetchError(Exception):
+    pass
+
+
+def detect_board(careers_url: str):
+    """(board, token) for a hosted job-board URL, or None."""
+    if not careers_url:
+        return None
+    parts = urlsplit(careers_url if "//" in careers_url else "https://" + careers_url)
+    board = BOARD_HOSTS.get((parts.hostname or "").lower())
+    if not board:
+        return None
+    token = parse_qs(parts.query).get("for", [None])[0]  # greenhouse embed/job_board?for=token
+    if not token:
+        segments = [s for s in parts.path.split("/") if s]
+        token = segments[0] if segments and segments[0] != "embed" else None
+    if not token or not TOKEN_RE.match(token):
+        return None
+    return board, token
+
+
+def board_api_url(board: str, token: str, careers_url: str = "", base_url: str = None) -> str:
+    url = BOARD_APIS[board].format(token=token)
+    host = (urlsplit(careers_url).hostname or "") if careers_url else ""
+    if ".eu." in host:
+        url = url.replace("boards-api.greenhouse.io", "boards-api.eu.greenhouse.io").replace(
+            "api.lever.co", "api.eu.lever.co")
+    if base_url:
+        parts = urlsplit(url)
+        url = base_url.rstrip("/") + parts.path + (f"?{parts.query}" if parts.query else "")
+    return url
+
+
+def _date(value) -> str:
+    """YYYY-MM-DD from an ISO timestamp or epoch milliseconds; "Unknown" otherwise."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return "Unknown"
+
+
+def parse_greenhouse(data: dict) -> list:
+    return [{
+        "title": job.get("title", ""),
+        "url": job.get("absolute_url", ""),
+        "location": (job.get("location") or {}).get("name") or "Unknown",
+        "datePosted": _date(job.get("first_published") or job.get("updated_at")),
+        "compensation": "Not disclosed",
+    } for job in data.get("jobs", [])]
+
+
+def parse_lever(data: list) -> list:
+    return [{
+        "title": job.get("text", ""),
+        "url": job.get("hostedUrl", ""),
+        "location": (job.get("categories") or {}).get("location") or "Unknown",
+        "datePosted": _date(job.get("createdAt")),
+        "compensation": "Not disclosed",
+    } for job in data]
+
+
+def parse_ashby(data: dict) -> list:
+    jobs = []
+    for job in data.get("jobs", []):
+        if job.get("isListed") is False:
+            continue
+        compensation = (job.get("compensation") or {}).get("compensationTierSummary")
+        location = job.get("location") or "Unknown"
+        if job.get("isRemote") and "remote" not in location.lower():
+            location = f"{location} (Remote)"
+        jobs.append({
+            "title": job.get("title", ""),
+            "url": job.get("jobUrl", ""),
+            "location": location,
+            "datePosted": _date(job.get("publishedAt")),
+            "compensation": compensation or "Not disclosed",
+        })
+    return jobs
+
+
+PARSERS = {"greenhouse": parse_greenhouse, "lever": parse_lever, "ashby": parse_ashby}
+
+
+def fetch_board(client: HttpClient, board: str, token: str, careers_url: str = "", base_url: str = None,
+                cache: HttpCache = None) -> list:
+    """Every posting on one board, normalised to title/url/location/datePosted/compensation."""
+    url = board_api_url(board, token, careers_url, base_url)
+    headers = {"Accept": "application/json"}
+    try:
+        if cache:
+            resp, postings = cache.fetch(client, url, parse=lambda r: PARSERS[board](r.json()), headers=headers)
+        else:
+            resp = client.get(url, headers=headers)
+            postings = PARSERS[board](resp.json()) if resp.ok else None
+    except (ValueError, AttributeError, TypeError) as e:
+        raise BoardFetchError(f"unexpected response from {url}: {type(e).__name__}: {e}")
+    if resp.status == 404:
+        raise BoardFetchError(f"no {BOARD_SOURCES[board]} board named {token!r}")
+    if not resp.ok:
+        raise BoardFetchError(f"HTTP {resp.status} from {url}")
+    return postings
+
+
+def check_company(client: HttpClient, company: dict, base_url: str = None, cache: HttpCache = None) -> dict:
+    """Roles and a coverage entry for one company with a known board."""
+    careers_url = company.get("careers_url", "")
+    board, token = detect_board(careers_url)
+    coverage = {"company": company.get("company", ""), "careers_url": careers_url}
+    try:
+        postings = fetch_board(client, board, token, careers_url, base_url, cache)
+    except (BoardFetchError, OSError, http.client.HTTPException) as e:
+        coverage.update(status="error", roles_found=0, notes=f"{type(e).__name__}: {e}")
+        return {"roles": [], "coverage": [coverage], "postings": 0}
+
+    roles = [{
+        "company": company.get("company", ""),
+        "stage": company.get("stage", "Unknown"),
+        "title": job["title"],
+        "url": job["url"],
+        "location": job["location"],
+        "compensation": job["compensation"],
+        "datePosted": job["datePosted"],
+        "source": BOARD_SOURCES[board],
+        "segment": company.get("segment", "Unknown"),
+    } for job in postings if job["title"] and is_relevant_title(job["title"])]
+    coverage.update(status="checked", roles_found=len(roles), notes=f"{BOARD_SOURCES[board]} API, {len(postings)} postings")
+    return {"roles": roles, "coverage": [coverage], "postings": len(postings)}
+
+
+def split_by_board(companies: list) -> tuple:
+    """(companies with a hosted job board, companies without one)."""
+    with_board, without = [], []
+    for company in companies:
+        (with_board if detect_board(company.get("careers_url", "")) else without).append(company)
+    return with_board, without
+
+
+def fetch_boards(companies: list, base_url: str = ATS_BASE_URL, workers: int = ATS_WORKERS,
+                 cache: bool = True) -> dict:
+    """Check every company's board concurrently; returns {"roles", "coverage", "postings"} in input order."""
+    if not companies:
+        return {"roles": [], "coverage": [], "postings": 0}
+    client = HttpClient(max_idle_per_host=workers)
+    http_cache = default_cache() if cache else None
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(companies))) as executor:
+            results = list(executor.map(lambda c: check_company(client, c, base_url, http_cache), companies))
+    finally:
+        client.close()
+        if http_cache:
+            http_cache.save()
+    return {
+        "roles": [role for r in results for role in r["roles"]],
+        "coverage": [entry for r in results for entry in r["coverage"]],
+        "postings": sum(r["postings"] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch GTM leadership roles straight from public ATS job boards")
+    parser.add_argument("--input", type=str, help="Path to Agent 1 results JSON file (default: today's results)")
+    parser.add_argument("--base-url", type=str, default=ATS_BASE_URL,
+                        help="Send every board request to this host instead (e.g. tests.stub_servers boards)")
+    parser.add_argument("--no-cache", action="store_true", help="Fetch every board in full, bypassing the HTTP cache")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as f:
+            companies = json.load(f)
+    else:
+        companies = load_results("agent1") or []
+    with_board, _ = split_by_board(companies)
+    print(f"{len(with_board)} of {len(companies)} companies have a Greenhouse, Lever or Ashby board")
+
+    result = fetch_boards(with_board, base_url=args.base_url, cache=not args.no_cache)
+    for entry in result["coverage"]:
+        print(f"  {entry['company']}: {entry['status']}, {entry['roles_found']} roles — {entry.get('notes', '')}")
+    print(f"\n{len(result['roles'])} matching roles out of {result['postings']} postings")
+    for role in result["roles"]:
+        print(f"  {role['company']} — {role['title']} ({role['location']})")
+        print(f"     {role['url']}")
+    if not args.no_cache:
+        default_cache().report("ats_boards")
+
+
+if __name__ == "__main__":
+    main()
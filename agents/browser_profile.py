@@ -0,0 +1,117 @@
+"""
+Persistent Chromium profiles for agent 3's browser workers.
+
+Each worker gets its own user-data directory under .cache/, so cookies,
+consent state and Chromium's disk cache survive between daily runs. Before
+every launch the profile is pruned:
+
+  - a profile unused for PROFILE_EXPIRE_DAYS is dropped entirely
+  - cache files untouched for CACHE_STALE_DAYS are evicted
+  - if the profile is still over PROFILE_MAX_BYTES, cache files are evicted
+    oldest first; if that isn't enough the profile is dropped
+
+Cookies and local storage are only ever removed with the whole profile
+(expiry, size overflow, or --reset-profile).
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from agents.utils import REPO_ROOT
+
+PROFILE_ROOT = REPO_ROOT / ".cache" / "agent3-profile"
+
+PROFILE_MAX_BYTES = 200 * 1024 * 1024
+DISK_CACHE_BYTES = 100 * 1024 * 1024  # passed to Chromium as --disk-cache-size
+CACHE_STALE_DAYS = 14
+PROFILE_EXPIRE_DAYS = 30
+
+# Directories inside a Chromium profile that only hold re-downloadable data
+CACHE_DIRS = {"Cache", "Code Cache", "GPUCache", "GrShaderCache", "ShaderCache", "CacheStorage", "ScriptCache"}
+
+# Chromium's single-instance locks; stale copies (e.g. restored from a CI
+# cache) make the next launch refuse the profile
+LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket")
+
+LAST_USED_MARKER = ".last-used"
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _cache_files(profile_dir: Path) -> list:
+    """(mtime, size, path) for every file inside a cache directory, oldest first."""
+    files = []
+    for root, _, names in os.walk(profile_dir):
+        if not CACHE_DIRS.intersection(Path(root).relative_to(profile_dir).parts):
+            continue
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    return sorted(files)
+
+
+def reset_profiles(root: Path = PROFILE_ROOT):
+    """Delete every worker profile."""
+    if root.exists():
+        shutil.rmtree(root)
+        print(f"Reset browser profiles in {root}")
+
+
+def prepare_profile(profile_dir: Path, max_bytes: int = PROFILE_MAX_BYTES) -> dict:
+    """Prune a worker profile before launch; returns its state for the launch log.
+
+    state is "warm" if a usable profile was already there, "cold" otherwise.
+    """
+    now = time.time()
+    marker = profile_dir / LAST_USED_MARKER
+    info = {"state": "cold", "evicted_files": 0, "evicted_bytes": 0}
+
+    if marker.exists() and now - marker.stat().st_mtime > PROFILE_EXPIRE_DAYS * 86400:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        info["expired"] = True
+
+    if profile_dir.exists() and marker.exists():
+        for name in LOCK_FILES:
+            try:
+                os.unlink(profile_dir / name)
+            except FileNotFoundError:
+                pass
+
+        size = dir_size(profile_dir)
+        stale_before = now - CACHE_STALE_DAYS * 86400
+        for mtime, file_size, path in _cache_files(profile_dir):
+            if mtime >= stale_before and size <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            size -= file_size
+            info["evicted_files"] += 1
+            info["evicted_bytes"] += file_size
+
+        if size > max_bytes:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            info["overflow"] = True
+        else:
+            info["state"] = "warm"
+
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    info["bytes"] = dir_size(profile_dir)
+    return info
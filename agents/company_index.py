@@ -0,0 +1,276 @@
+"""
+Company entity resolution shared by the agents and the orchestrator.
+
+One precomputed index maps the many spellings of a company ("Nitrogen",
+"Nitrogen Wealth", "Riskalyze (Nitrogen)", "BNY Mellon Pershing") to a single
+canonical entry, built from the hardcoded wealthtech whitelist, curated
+aliases, and every historical Agent 1 result. Lookups are memoized.
+
+Matching rules, in order:
+  1. exact match on the normalized name or any alias
+  2. a whitelisted name appears as a whole-token phrase inside the scraped
+     name ("Fidelity" in "FIDELITY INVESTMENTS VARIABLE LIFE ACCOUNT I")
+  3. the scraped name is the leading tokens of a whitelisted name
+     ("Clearwater" for "Clearwater Analytics"), if that is unambiguous
+
+Rules 2 and 3 only apply to the curated whitelist; names that come from
+Agent 1 research match exactly, since many are generic words ("Range",
+"Circle", "Arch").
+"""
+
+import glob
+import json
+import re
+from functools import lru_cache
+
+from agents.utils import RESULTS_DIR
+
+# Comprehensive known wealthtech companies (strict whitelist)
+KNOWN_WEALTHTECH_COMPANIES = [
+    # Core wealthtech
+    "Addepar", "Orion", "Envestnet", "Pontera", "InvestCloud", "Nitrogen",
+    "Altruist", "Advyzon", "Betterment", "Wealthfront", "Farther",
+    "Savvy Wealth", "Vanilla", "LifeYield", "RightCapital", "FP Alpha",
+    "Conquest Planning", "Jump", "AdvicePay",
+    # Alt investments / private markets
+    "CAIS", "iCapital", "YieldStreet", "Canoe Intelligence",
+    # RIA aggregators / platforms
+    "Dynasty Financial", "Hightower", "Advisor360", "AssetMark",
+    # Enterprise wealthtech
+    "SEI", "Morningstar", "Pershing", "BNY", "Broadridge", "SS&C",
+    "Vestmark", "FIS", "Fidelity",
+    # BlackRock Aladdin
+    "BlackRock", "Aladdin",
+    # Retirement tech
+    "Vestwell", "GeoWealth", "Practifi",
+    # Investment data / analytics
+    "FactSet", "MSCI", "Clearwater Analytics", "Enfusion", "Arcesium",
+    "Tegus", "AlphaSense",
+    # Investment platforms
+    "Carta", "Forge Global", "Republic", "Moonfare", "AngelList", "Vise",
+    # PFM / Retirement
+    "Empower", "Guideline", "Human Interest", "Capitalize", "Magnifi",
+    # Regtech / compliance
+    "ComplySci", "RIA in a Box", "Aumni",
+    # Big tech FS verticals
+    "Salesforce Financial Services",
+    # Investment banks with WM tech
+    "Goldman Sachs", "Morgan Stanley", "JPMorgan",
+    # Additional wealthtech
+    "Clearwater", "Wealthspire", "LearnLux", "d1g1t", "MyVest",
+    "Wealth.com", "Zoe Financial", "Osaic", "LPL Financial",
+    "Raymond James", "Cetera", "Advisor Group", "Commonwealth",
+    "Carson Group", "Buckingham", "Mariner Wealth",
+    "eMoney Advisor", "MoneyGuidePro", "Riskalyze",
+    "Capitect", "Kwanti", "YCharts", "Oranj",
+    "Redtail", "Wealthbox", "Tamarac", "Black Diamond",
+    "Croesus", "Advicement", "Asset-Map",
+    "Snappy Kraken", "FMG Suite", "Nitrogen Wealth",
+    "CircleBlack", "Docupace", "Laser App", "PreciseFP",
+]
+
+# Canonical name -> other names the same company appears under
+# (rebrands, parent/subsidiary listings, common long forms).
+COMPANY_ALIASES = {
+    "Nitrogen": ["Nitrogen Wealth", "Riskalyze"],
+    "BNY": ["BNY Mellon", "Pershing", "BNY Mellon Pershing", "BNY Pershing", "Bank of New York Mellon"],
+    "BlackRock": ["Aladdin", "BlackRock Aladdin"],
+    "Empower": ["Empower Retirement", "Personal Capital"],
+    "YieldStreet": ["Willow Wealth"],
+    "Clearwater Analytics": ["Clearwater"],
+    "Fidelity": ["Fidelity Investments", "Fidelity Institutional"],
+    "Orion": ["Orion Advisor Solutions", "Orion Advisor Technology"],
+    "Dynasty Financial": ["Dynasty Financial Partners"],
+    "Mariner Wealth": ["Mariner Wealth Advisors", "Mariner"],
+    "MoneyGuidePro": ["MoneyGuide"],
+    "Redtail": ["Redtail Technology"],
+    "SS&C": ["SS&C Technologies", "SS&C Advent"],
+    "JPMorgan": ["JP Morgan", "J.P. Morgan", "JPMorgan Chase"],
+    "iCapital": ["iCapital Network"],
+    "eMoney Advisor": ["eMoney"],
+    "MyVest": ["MyVest (TIAA)"],
+}
+
+# Placeholder employer names that never identify a real company
+NON_COMPANY_NAMES = ("confidential", "undisclosed", "stealth startup", "a hiring company")
+
+# Trailing legal-entity tokens ignored when comparing names
+LEGAL_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "plc", "lp", "llp", "gmbh", "ag", "sa"}
+
+# "Nitrogen (formerly Riskalyze)", "YieldStreet (now Willow Wealth)"
+_RENAME_PREFIX = re.compile(r"^(?:formerly|now|fka|f/k/a|aka|a/k/a)\s+", re.IGNORECASE)
+_PARENTHETICAL = re.compile(r"\(([^)]*)\)")
+
+
+def normalize_company(name: str) -> str:
+    """Lowercase, spell out '&', drop punctuation and trailing legal suffixes."""
+    text = (name or "").lower().replace("&", " and ")
+    tokens = re.findall(r"[a-z0-9]+", text)
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def split_company_name(name: str) -> tuple:
+    """Split a researched name into (primary name, alias candidates, rename aliases).
+
+    "Riskalyze / Nitrogen" -> ("Riskalyze", ["Nitrogen"], [])
+    "Nitrogen (formerly Riskalyze)" -> ("Nitrogen", [], ["Riskalyze"])
+    "Wealthsimple (Canada)" -> ("Wealthsimple", ["Canada"], [])
+
+    Parenthetical text is often a descriptor rather than a name, so plain
+    candidates are only used as aliases when they already resolve.
+    """
+    candidates, renames = [], []
+    for inner in _PARENTHETICAL.findall(name):
+        inner = inner.strip()
+        if _RENAME_PREFIX.match(inner):
+            renames.append(_RENAME_PREFIX.sub("", inner))
+        elif inner:
+            candidates.append(inner)
+    base = _PARENTHETICAL.sub(" ", name)
+    parts = [p.strip() for p in base.split("/") if p.strip()]
+    primary = parts[0] if parts else name.strip()
+    candidates.extend(parts[1:])
+    return primary, candidates, renames
+
+
+class CompanyIndex:
+    """Normalized names, aliases and token phrases for every known company."""
+
+    def __init__(self):
+        self.entries = {}       # canonical key -> {"name", "record", "names"}
+        self._exact = {}        # normalized name or alias -> canonical key
+        self._phrases = {}      # first token -> [(token tuple, canonical key)], whitelist only
+        self._prefixes = {}     # leading token tuple -> canonical key (None if ambiguous)
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _link(self, name: str, key: str, fuzzy: bool):
+        norm = normalize_company(name)
+        if not norm:
+            return
+        self._exact.setdefault(norm, key)
+        self.entries[key]["names"].add(name)
+        if not fuzzy:
+            return
+        tokens = tuple(norm.split())
+        self._phrases.setdefault(tokens[0], []).append((tokens, key))
+        for n in range(1, len(tokens)):
+            prefix = tokens[:n]
+            if self._prefixes.get(prefix, key) != key:
+                self._prefixes[prefix] = None
+            else:
+                self._prefixes[prefix] = key
+
+    def add(self, name: str, record: dict = None, aliases=(), fuzzy: bool = False) -> str:
+        """Add a company, or attach it to the entry one of its names already matches exactly.
+
+        Returns the canonical key. fuzzy=True also registers the names for
+        token-phrase matching (reserved for the curated whitelist).
+        """
+        key = next((self._exact[n] for n in map(normalize_company, [name, *aliases]) if n in self._exact), None)
+        if key is None:
+            key = normalize_company(name)
+            if not key:
+                return None
+            self.entries[key] = {"name": name.strip(), "record": None, "names": set()}
+        self._link(name, key, fuzzy)
+        for alias in aliases:
+            self._link(alias, key, fuzzy)
+        if record is not None:
+            self.entries[key]["record"] = record
+        self._cache.clear()
+        return key
+
+    def add_researched(self, company: dict):
+        """Add an Agent 1 company record, unpacking "A (formerly B)" / "A / B" names."""
+        raw = (company.get("company") or "").strip()
+        if not raw:
+            return
+        primary, candidates, renames = split_company_name(raw)
+        aliases = [raw] + renames + [c for c in candidates if self.resolve(c)]
+        self.add(primary, record=company, aliases=aliases)
+
+    def resolve(self, name: str):
+        """Canonical key for a company name, or None if it isn't a known company."""
+        if name in self._cache:
+            return self._cache[name]
+        key = self._resolve(name)
+        self._cache[name] = key
+        return key
+
+    def _resolve(self, name: str):
+        norm = normalize_company(name)
+        if not norm or (name or "").strip().lower() in NON_COMPANY_NAMES:
+            return None
+        if norm in self._exact:
+            return self._exact[norm]
+
+        # A whitelisted name appearing as a whole-token phrase (longest wins)
+        tokens = norm.split()
+        best, best_len = None, 0
+        for i, token in enumerate(tokens):
+            for phrase, key in self._phrases.get(token, ()):
+                if len(phrase) > best_len and tuple(tokens[i:i + len(phrase)]) == phrase:
+                    best, best_len = key, len(phrase)
+        if best:
+            return best
+
+        # The scraped name is a truncated whitelisted name
+        return self._prefixes.get(tuple(tokens))
+
+    def is_known(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def canonical_name(self, name: str):
+        """Display name of the canonical company, or None."""
+        key = self.resolve(name)
+        return self.entries[key]["name"] if key else None
+
+    def record(self, name: str):
+        """Latest Agent 1 record (stage, segment, careers_url, ...) for a company, or None."""
+        key = self.resolve(name)
+        return self.entries[key]["record"] if key else None
+
+    def canonical_key(self, name: str) -> str:
+        """Stable lowercase company key for dedup; falls back to the raw lowercased name."""
+        canonical = self.canonical_name(name)
+        return (canonical or name or "").strip().lower()
+
+
+def historical_companies() -> list:
+    """Every company record from saved Agent 1 results, oldest file first."""
+    companies = []
+    for path in sorted(glob.glob(str(RESULTS_DIR / "agent1_*.json"))):
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            companies.extend(c for c in data if isinstance(c, dict))
+    return companies
+
+
+def build_company_index(companies: list = None, include_history: bool = True) -> CompanyIndex:
+    """Build the index from the whitelist, aliases, past Agent 1 results and `companies`.
+
+    Later records win, so today's Agent 1 results override historical ones.
+    """
+    index = CompanyIndex()
+    for canonical, aliases in COMPANY_ALIASES.items():
+        index.add(canonical, aliases=aliases, fuzzy=True)
+    for name in KNOWN_WEALTHTECH_COMPANIES:
+        index.add(name, fuzzy=True)
+    if include_history:
+        for company in historical_companies():
+            index.add_researched(company)
+    for company in companies or []:
+        index.add_researched(company)
+    return index
+
+
+@lru_cache(maxsize=1)
+def default_company_index() -> CompanyIndex:
+    """Index over the whitelist and all saved Agent 1 results, built once per process."""
+    return build_company_index()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate role detection.
+
+The same opening reaches the pipeline under more than one name: agents 2 and
+3 spell the title differently ("Midwest Regional Director - Vice President /
+Senior Vice President" one day, "... - Senior Vice President / Managing
+Director" the next) or link it through different URLs
+(boards.greenhouse.io/embed/job_app?token=N and
+job-boards.greenhouse.io/{board}/jobs/N). Exact company|title keys treat
+each spelling as a new role.
+
+Two roles of the same company are the same opening when:
+  1. their URLs resolve to the same job ID (greenhouse:N, lever:UUID,
+     ashby:UUID, linkedin:N), or
+  2. neither has a job ID that contradicts the other, their normalized title
+     tokens are at least TITLE_THRESHOLD alike (Jaccard), and the words that
+     differ are only seniority words ("vice president" vs "managing
+     director"), never the function or region.
+
+Candidates for rule 2 come from MinHash locality-sensitive hashing over the
+title tokens, banded per company, so a role is only compared with the few
+titles that share a band with it instead of every role the company has ever
+had. Every merge carries a reason saying which rule fired.
+
+Usage:
+    python -m agents.dedup                        # merge decisions for the latest agent 2 + 3 results
+    python -m agents.dedup --date 2026-03-21
+    python -m agents.dedup --url "https://boards.greenhouse.io/embed/job_app?token=8012960002"
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from agents.company_index import CompanyIndex, build_company_index, default_company_index
+from agents.utils import RESULTS_DIR, load_results
+
+# Bump when normalization, hashing or band scoping changes, so stored band keys are rebuilt
+INDEX_VERSION = "2"
+
+TITLE_THRESHOLD = 0.8
+
+# 32 MinHash values in 8 bands of 4: pairs at 0.8 similarity share a band
+# ~98.5% of the time, pairs at 0.5 ~40%, pairs at 0.3 ~6%
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+MINHASH_SEED = 20260321
+_PRIME = (1 << 61) - 1
+_rng = random.Random(MINHASH_SEED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+ABBREVIATIONS = {
+    "vp": "vice president", "svp": "senior vice president", "evp": "executive vice president",
+    "avp": "assistant vice president", "sr": "senior", "snr": "senior", "jr": "junior",
+    "md": "managing director", "dir": "director", "mgr": "manager", "mgmt": "management",
+    "bd": "business development", "biz": "business", "dev": "development", "gtm": "go to market",
+    "gm": "general manager", "intl": "international", "natl": "national",
+}
+STOPWORDS = {"a", "an", "the", "of", "and", "for", "to", "in", "at", "with", "on", "remote", "hybrid"}
+# Level words: titles differing only in these are the same opening advertised at a level band
+SENIORITY_WORDS = {
+    "vice", "president", "senior", "executive", "assistant", "associate", "managing", "director",
+    "head", "chief", "manager", "lead", "principal", "junior", "general", "i", "ii", "iii", "iv",
+}
+
+JOB_SOURCES = {"greenhouse": "Greenhouse", "lever": "Lever", "ashby": "Ashby", "linkedin": "LinkedIn"}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_DIGITS_RE = re.compile(r"^\d{4,}$")
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+_LINKEDIN_VIEW_RE = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d{6,})/?$")
+
+
+def canonical_job_id(url: str):
+    """Stable "board:id" for a job posting URL, or None for board pages, search pages and other sites.
+
+    Greenhouse job IDs are read from /{board}/jobs/N, embed/job_app?token=N and
+    ?gh_jid=N (careers pages embedding the board); Lever and Ashby from the
+    posting UUID; LinkedIn from /jobs/view/{slug-}N and ?currentJobId=N.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url if "//" in url else "https://" + url)
+    host = (parts.hostname or "").lower()
+    query = parse_qs(parts.query)
+    segments = [s for s in parts.path.split("/") if s]
+
+    if query.get("gh_jid") and _DIGITS_RE.match(query["gh_jid"][0]):
+        return f"greenhouse:{query['gh_jid'][0]}"
+    if query.get("ashby_jid") and _UUID_RE.match(query["ashby_jid"][0]):
+        return f"ashby:{query['ashby_jid'][0].lower()}"
+    if host.endswith("greenhouse.io"):
+        if "job_app" in segments and query.get("token") and _DIGITS_RE.match(query["token"][0]):
+            return f"greenhouse:{query['token'][0]}"
+        if "jobs" in segments:
+            job = segments[segments.index("jobs") + 1:][:1]
+            if job and _DIGITS_RE.match(job[0]):
+                return f"greenhouse:{job[0]}"
+    elif host.endswith("lever.co") or host.endswith("ashbyhq.com"):
+        board = "lever" if host.endswith("lever.co") else "ashby"
+        uuid = next((s for s in segments if _UUID_RE.match(s)), None)
+        if uuid:
+            return f"{board}:{uuid.lower()}"
+    elif host == "linkedin.com" or host.endswith(".linkedin.com"):
+        match = _LINKEDIN_VIEW_RE.search(parts.path)
+        if match:
+            return f"linkedin:{match.group(1)}"
+        job = query.get("currentJobId", [""])[0]
+        if _DIGITS_RE.match(job):
+            return f"linkedin:{job}"
+    return None
+
+
+def title_tokens(title: str) -> frozenset:
+    """Normalized title words: lowercased, abbreviations spelled out, stopwords dropped."""
+    words = []
+    for word in _WORD_RE.findall((title or "").lower().replace("&", " and ")):
+        words.extend(ABBREVIATIONS.get(word, word).split())
+    return frozenset(word for word in words if word not in STOPWORDS)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens) -> tuple:
+    """NUM_PERM-value MinHash signature of a token set (deterministic across processes)."""
+    hashes = [_token_hash(token) for token in tokens] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def band_keys(company: str, tokens) -> list:
+    """One LSH bucket key per band, scoped to the company."""
+    signature = minhash(tokens)
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).hexdigest()
+        keys.append(f"{company}:{band}:{digest}")
+    return keys
+
+
+def company_of(role_key: str) -> str:
+    """The company part of a company|title role key."""
+    return role_key.split("|", 1)[0]
+
+
+def title_match(a_tokens: frozenset, b_tokens: frozenset):
+    """A reason string if two title token sets name the same opening, else None."""
+    if not a_tokens or not b_tokens:
+        return None
+    similarity = len(a_tokens & b_tokens) / len(a_tokens | b_tokens)
+    if similarity < TITLE_THRESHOLD:
+        return None
+    differing = a_tokens ^ b_tokens
+    if differing - SENIORITY_WORDS:
+        return None
+    if not differing:
+        return "same title words"
+    return f"titles {similarity:.0%} alike, differing only in level ({', '.join(sorted(differing))})"
+
+
+def duplicate_reason(a: dict, b: dict):
+    """Why roles a and b (same company) are the same opening, or None if they aren't.
+
+    Takes anything with "title" and "url": roles, or rows from the role store.
+    """
+    a_job, b_job = canonical_job_id(a.get("url")), canonical_job_id(b.get("url"))
+    if a_job and a_job == b_job:
+        board, job = a_job.split(":", 1)
+        return f"same {JOB_SOURCES[board]} job {job}"
+    if a_job and b_job:
+        return None  # two different postings, however alike the titles
+    return title_match(title_tokens(a.get("title")), title_tokens(b.get("title")))
+
+
+class DedupIndex:
+    """In-memory index of roles by job ID and per-company title bands."""
+
+    def __init__(self):
+        self.by_job = {}
+        self.buckets = {}
+        self.items = []
+
+    def add(self, role_key: str, role: dict) -> int:
+        """Index role under its key; returns its position."""
+        position = len(self.items)
+        self.items.append(role)
+        job = canonical_job_id(role.get("url"))
+        if job:
+            self.by_job.setdefault(job, position)
+        for band in band_keys(company_of(role_key), title_tokens(role.get("title"))):
+            self.buckets.setdefault(band, []).append(position)
+        return position
+
+    def find(self, role_key: str, role: dict):
+        """(position, reason) of an indexed role that is the same opening, or None."""
+        job = canonical_job_id(role.get("url"))
+        if job in self.by_job:
+            position = self.by_job[job]
+            return position, duplicate_reason(self.items[position], role)
+        candidates = []
+        for band in band_keys(company_of(role_key), title_tokens(role.get("title"))):
+            candidates.extend(self.buckets.get(band, ()))
+        for position in sorted(set(candidates)):
+            reason = duplicate_reason(self.items[position], role)
+            if reason:
+                return position, reason
+        return None
+
+
+def make_role_key(role: dict, company_index: CompanyIndex = None) -> str:
+    """Create a dedup key from canonical company + title (normalized).
+
+    Company aliases ("Nitrogen Wealth", "Riskalyze") collapse to the same
+    canonical company via the shared company index.
+    """
+    if company_index is None:
+        company_index = default_company_index()
+    company = company_index.canonical_key(role.get("company", ""))
+    title = role.get("title", "").strip().lower()
+    return f"{company}|{title}"
+
+
+def legacy_role_key(role: dict) -> str:
+    """The pre-company-index key (raw lowercased company name), still used by old registry entries."""
+    company = role.get("company", "").strip().lower()
+    title = role.get("title", "").strip().lower()
+    return f"{company}|{title}"
+
+
+def merge_and_dedup(agent2_roles: list, agent3_roles: list, company_index: CompanyIndex = None) -> tuple[list, list]:
+    """Merge roles from Agent 2 and Agent 3, deduplicating by company+title and near-duplicates.
+
+    Returns (merged roles, near-duplicate merges), each merge a dict with the
+    company, the dropped title, the kept title and the reason (agents/dedup.py).
+    """
+    seen_keys = {}
+    index = DedupIndex()
+    merged = []
+    merges = []
+
+    for role in agent2_roles + agent3_roles:
+        key = make_role_key(role, company_index)
+        position = seen_keys.get(key)
+        if position is None:
+            match = index.find(key, role)
+            if match:
+                position, reason = match
+                merges.append({"company": role.get("company", ""), "title": role.get("title", ""),
+                               "kept": merged[position].get("title", ""), "reason": reason})
+                seen_keys[key] = position
+        if position is not None:
+            # Merge sources
+            existing = merged[position]
+            existing_source = existing.get("source", "")
+            new_source = role.get("source", "")
+            if new_source and new_source not in existing_source:
+                existing["source"] = f"{existing_source}, {new_source}"
+            # Prefer non-empty fields
+            for field in ["url", "compensation", "datePosted", "location"]:
+                if not existing.get(field) or existing[field] in ("Not disclosed", "Unknown", ""):
+                    if role.get(field) and role[field] not in ("Not disclosed", "Unknown", ""):
+                        existing[field] = role[field]
+            # Prefer a link to the posting over one to the whole board
+            if role.get("url") and not canonical_job_id(existing.get("url")) and canonical_job_id(role["url"]):
+                existing["url"] = role["url"]
+        else:
+            seen_keys[key] = index.add(key, role)
+            merged.append(role)
+
+    return merged, merges
+
+
+def _latest_results(agent_name: str):
+    files = sorted(RESULTS_DIR.glob(f"{agent_name}_*.json"), reverse=True)
+    if not files:
+        return None
+    with open(files[0]) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show near-duplicate merge decisions for saved results")
+    parser.add_argument("--date", type=str, help="Results date (YYYY-MM-DD); default: latest")
+    parser.add_argument("--url", type=str, help="Just print the canonical job ID of this URL")
+    args = parser.parse_args()
+
+    if args.url:
+        print(canonical_job_id(args.url))
+        return
+
+    if args.date:
+        agent2, agent3 = load_results("agent2", args.date) or {}, load_results("agent3", args.date) or {}
+        companies = load_results("agent1", args.date) or []
+    else:
+        agent2, agent3 = _latest_results("agent2") or {}, _latest_results("agent3") or {}
+        companies = _latest_results("agent1") or []
+    company_index = build_company_index(companies or [])
+    roles = agent2.get("roles", []) + agent3.get("roles", [])
+    exact = len({make_role_key(role, company_index) for role in roles})
+    merged, merges = merge_and_dedup(agent2.get("roles", []), agent3.get("roles", []), company_index)
+    print(f"{len(roles)} roles: {exact} by exact company|title, {len(merged)} after near-duplicate merging")
+    for merge in merges:
+        print(f"  {merge['company']}: {merge['title']!r} = {merge['kept']!r}")
+        print(f"      {merge['reason']}")
+
+
+if __name__ == "__main__":
+    main()
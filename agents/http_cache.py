@@ -0,0 +1,191 @@
+"""
+On-disk conditional-request cache for job-board and listing fetches.
+
+Most career boards and listing pages are unchanged from one daily run to
+the next. For every response that carries an ETag or Last-Modified the
+cache keeps the body, the validators and the caller's parsed result under
+.cache/http-cache/; the next fetch of that URL sends If-None-Match /
+If-Modified-Since, and on a 304 hands back the stored parse without
+downloading or parsing the page again. Responses without validators aren't
+stored, since there would be nothing to revalidate them with.
+
+The cache is size-capped: once the stored entries exceed CACHE_MAX_BYTES
+the least recently used are evicted. Hits, misses and the bytes a 304 saved
+are counted per process and reported to telemetry at the end of a run.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from functools import lru_cache
+
+from agents import telemetry
+from agents.http_client import HttpResponse
+from agents.utils import REPO_ROOT, write_json_atomic
+
+CACHE_DIR = REPO_ROOT / ".cache" / "http-cache"
+INDEX_FILE = "index.json"
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+
+class HttpCache:
+    """Conditional-request cache over HttpClient, with LRU eviction by size."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.index = self._load_index()  # key -> {"url", "size", "used"}
+        self.counts = {"requests": 0, "hits": 0, "misses": 0, "stored": 0, "evicted": 0,
+                       "bytes_saved": 0, "bytes_fetched": 0}
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.cache_dir / INDEX_FILE) as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {key: entry for key, entry in index.items() if (self.cache_dir / f"{key}.json").is_file()}
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def lookup(self, url: str) -> dict:
+        """The stored entry for url, or None."""
+        key = self.key(url)
+        with self._lock:
+            if key not in self.index:
+                return None
+        try:
+            with open(self.cache_dir / f"{key}.json") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.index.pop(key, None)
+            return None
+        return entry if entry.get("url") == url else None
+
+    def fetch(self, client, url: str, parse=None, headers: dict = None):
+        """GET url, revalidating a stored copy; returns (response, parsed).
+
+        parsed is parse(response) for a fresh 2xx, the stored parse when
+        the server answers 304, and None for any other status (the caller
+        inspects response.status as it would without the cache). On a hit
+        the response is rebuilt from the stored body with status 200 and
+        from_cache set. A URL is assumed to always be parsed the same way.
+        """
+        entry = self.lookup(url)
+        send_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                send_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                send_headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = client.get(url, headers=send_headers)
+        with self._lock:
+            self.counts["requests"] += 1
+            self.counts["bytes_fetched"] += len(resp.body)
+
+        if resp.status == 304 and entry:
+            cached = HttpResponse(url, 200, {**entry["headers"], **resp.headers},
+                                  entry["body"].encode("utf-8"), resp.elapsed_ms)
+            cached.from_cache = True
+            self._touch(url)
+            with self._lock:
+                self.counts["hits"] += 1
+                self.counts["bytes_saved"] += entry["size"]
+            return cached, entry.get("parsed")
+
+        resp.from_cache = False
+        with self._lock:
+            self.counts["misses"] += 1
+        if not resp.ok:
+            return resp, None
+        parsed = parse(resp) if parse else None
+        if resp.headers.get("etag") or resp.headers.get("last-modified"):
+            self._store(url, resp, parsed)
+        return resp, parsed
+
+    def _touch(self, url: str):
+        with self._lock:
+            entry = self.index.get(self.key(url))
+            if entry:
+                entry["used"] = time.time()
+
+    def _store(self, url: str, resp: HttpResponse, parsed):
+        entry = {
+            "url": url,
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "headers": {name: resp.headers[name] for name in ("content-type",) if name in resp.headers},
+            "size": len(resp.body),
+            "body": resp.text,
+            "parsed": parsed,
+        }
+        key = self.key(url)
+        try:
+            text = json.dumps(entry)
+        except (TypeError, ValueError):
+            return  # parse result isn't JSON-serialisable; don't cache it
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.json.tmp"
+            tmp.write_text(text)
+            tmp.replace(self.cache_dir / f"{key}.json")
+        except OSError as e:
+            print(f"  HTTP cache write failed: {type(e).__name__}: {e}")
+            return
+        with self._lock:
+            self.index[key] = {"url": url, "size": len(text), "used": time.time()}
+            self.counts["stored"] += 1
+            self._evict_locked()
+
+    def _evict_locked(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda kv: kv[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            (self.cache_dir / f"{key}.json").unlink(missing_ok=True)
+            del self.index[key]
+            total -= entry["size"]
+            self.counts["evicted"] += 1
+
+    def save(self):
+        """Persist the index (entries themselves are written as they're stored)."""
+        with self._lock:
+            if not self.index and not (self.cache_dir / INDEX_FILE).exists():
+                return
+            index = dict(self.index)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.cache_dir / INDEX_FILE, index)
+        except OSError as e:
+            print(f"  HTTP cache index write failed: {type(e).__name__}: {e}")
+
+    def summary(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+            counts["entries"] = len(self.index)
+            counts["size_bytes"] = sum(entry["size"] for entry in self.index.values())
+        counts["hit_pct"] = round(100 * counts["hits"] / counts["requests"], 1) if counts["requests"] else 0.0
+        return counts
+
+    def report(self, name: str = "http_cache") -> dict:
+        """Save the index, print this run's hit rate and record it to telemetry."""
+        self.save()
+        summary = self.summary()
+        if summary["requests"]:
+            print(f"HTTP cache: {summary['hits']}/{summary['requests']} revalidated ({summary['hit_pct']}%), "
+                  f"{summary['bytes_saved'] / 1000:.0f} KB not re-downloaded; {summary['entries']} entries, "
+                  f"{summary['size_bytes'] / 1e6:.1f} MB on disk")
+            telemetry.record("cache", name, **summary)
+        return summary
+
+
+@lru_cache(maxsize=1)
+def default_cache() -> HttpCache:
+    """Process-wide cache, so agents running side by side share one index."""
+    return HttpCache()
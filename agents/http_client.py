@@ -0,0 +1,182 @@
+"""
+Small pooled HTTP client on the standard library.
+
+Keeps keep-alive connections open per (scheme, host, port) and hands them
+out to whichever thread needs one, so paginated fetches and parallel
+workers reuse TCP/TLS sessions instead of reconnecting for every request.
+Responses are read fully and gzip/deflate bodies are decoded; a body that
+won't decode raises ContentDecodingError, an http.client.HTTPException like
+any other broken response. Redirects are not followed: for the sites we
+scrape a redirect usually means a login wall or throttling, which callers
+want to see.
+"""
+
+import gzip
+import http.client
+import json
+import threading
+import time
+import zlib
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 20.0
+MAX_IDLE_PER_HOST = 4
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HttpResponse:
+    """A fully read response."""
+
+    def __init__(self, url: str, status: int, headers: dict, body: bytes, elapsed_ms: float):
+        self.url = url
+        self.status = status
+        self.headers = headers  # lowercased names
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        charset = "utf-8"
+        for part in self.headers.get("content-type", "").split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                charset = part.split("=", 1)[1].strip('"') or charset
+        return self.body.decode(charset, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ContentDecodingError(http.client.HTTPException):
+    """A gzip/deflate response body that doesn't decompress (corrupt or truncated)."""
+
+
+def _decode_body(body: bytes, encoding: str) -> bytes:
+    encoding = encoding.lower()
+    try:
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)  # raw deflate
+    except (zlib.error, OSError, EOFError) as e:
+        raise ContentDecodingError(f"undecodable {encoding} body ({len(body)} bytes): {e}") from e
+    return body
+
+
+class HttpClient:
+    """Thread-safe keep-alive connection pool."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = MAX_IDLE_PER_HOST,
+                 headers: dict = None):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._lock = threading.Lock()
+        self._idle = {}  # (scheme, host, port) -> [connection]
+        self.requests = 0
+        self.connections_opened = 0
+        self.bytes_received = 0
+
+    def _connect(self, key):
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return conn_cls(host, port, timeout=self.timeout)
+
+    def _checkout(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, headers: dict = None, body: bytes = None) -> HttpResponse:
+        """Send one request and read the whole response.
+
+        A request on a reused connection that the server already closed is
+        retried once on a fresh connection.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        send_headers = {**self.headers, **(headers or {})}
+
+        for attempt in range(2):
+            conn, reused = self._checkout(key)
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, target, body=body, headers=send_headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            with self._lock:
+                self.requests += 1
+                self.bytes_received += len(raw)
+            body_bytes = _decode_body(raw, resp_headers.get("content-encoding", ""))
+            return HttpResponse(url, resp.status, resp_headers, body_bytes, elapsed_ms)
+
+    def get(self, url: str, headers: dict = None) -> HttpResponse:
+        return self.request("GET", url, headers=headers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "bytes_received": self.bytes_received,
+            }
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+@lru_cache(maxsize=1)
+def default_client() -> HttpClient:
+    """Process-wide client, so every caller shares one connection pool."""
+    return HttpClient()
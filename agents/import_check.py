@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Import-time check for the command-line entry points.
+
+The cron run, --merge-only and --dry-run should start in milliseconds, and
+nothing should pull in the Anthropic SDK, Playwright, python-dotenv or
+SendGrid at import: those load inside the code paths that call them. Each
+entry module is imported in a fresh interpreter under `python -X importtime`;
+the check reports its cumulative import time and slowest imports, and
+fails if a heavy dependency was loaded or a module went over budget.
+
+The heavy packages are blocked in that interpreter by a meta-path finder
+that logs and refuses any attempt to import them, so an eager import is
+caught whether or not the package is installed (CI runs the check after
+pip install -r requirements.txt).
+
+Usage:
+    python -m agents.import_check
+    python -m agents.import_check --budget-ms 150 --top 8
+    python -m agents.import_check --record     # also log the timings to telemetry
+"""
+
+import argparse
+import subprocess
+import sys
+
+from agents.utils import REPO_ROOT
+
+ENTRY_MODULES = [
+    "orchestrator",
+    "agents.agent1_company_research",
+    "agents.agent2_career_pages",
+    "agents.agent3_linkedin_search",
+    "agents.telemetry",
+]
+
+# Packages that must only be imported by the code paths that use them
+HEAVY_PACKAGES = ("anthropic", "playwright", "dotenv", "sendgrid", "httpx", "pydantic", "greenlet")
+
+# Cumulative import time allowed per entry module (best of --repeat runs)
+IMPORT_BUDGET_MS = 250.0
+
+BLOCKED_MARKER = "import_check: blocked "
+
+# Run in the child interpreter before the entry module is imported
+_BLOCKER = """
+import sys
+
+class _BlockHeavy:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in {heavy!r}:
+            sys.stderr.write({marker!r} + name + "\\n")
+            raise ImportError(name + " is blocked by agents.import_check")
+        return None
+
+sys.meta_path.insert(0, _BlockHeavy())
+"""
+
+
+def import_times(module: str) -> tuple:
+    """Import module with the heavy packages blocked.
+
+    Returns ([(module, self ms, cumulative ms, depth) for every import it
+    triggers], [heavy modules it tried to import]).
+    """
+    code = _BLOCKER.format(heavy=set(HEAVY_PACKAGES), marker=BLOCKED_MARKER) + f"import {module}\n"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    blocked = sorted({line[len(BLOCKED_MARKER):].strip() for line in proc.stderr.splitlines()
+                      if line.startswith(BLOCKED_MARKER)})
+    if proc.returncode != 0 and not blocked:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return rows, blocked
+
+
+def check_module(module: str, repeat: int = 3) -> dict:
+    """Best-of-repeat cumulative import time, slowest direct imports and any heavy packages loaded."""
+    best = None
+    for _ in range(repeat):
+        rows, blocked = import_times(module)
+        total = next((cum for name, _, cum, _ in rows if name == module), 0.0)
+        if best is None or total < best["ms"]:
+            best = {"module": module, "ms": total, "rows": rows, "blocked": blocked}
+    rows, blocked = best.pop("rows"), best.pop("blocked")
+    best["heavy"] = sorted(set(blocked) | {name for name, *_ in rows if name.split(".")[0] in HEAVY_PACKAGES})
+    best["slowest"] = sorted(((cum, name) for name, _, cum, depth in rows if depth == 1), reverse=True)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry-point import time and heavy imports")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Cumulative import time allowed per module (default: {IMPORT_BUDGET_MS:.0f}ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module, fastest kept (default: 3)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest direct imports to show per module (default: 5)")
+    parser.add_argument("--record", action="store_true", help="Record each module's import time to telemetry")
+    args = parser.parse_args()
+
+    failures = []
+    for module in ENTRY_MODULES:
+        result = check_module(module, args.repeat)
+        print(f"  {module:<36} {result['ms']:>7.1f}ms")
+        for cum, name in result["slowest"][:args.top]:
+            print(f"      {name:<32} {cum:>7.1f}ms")
+        if result["heavy"]:
+            failures.append(f"{module} imports {', '.join(result['heavy'])}")
+        if result["ms"] > args.budget_ms:
+            failures.append(f"{module} takes {result['ms']:.0f}ms to import (budget {args.budget_ms:.0f}ms)")
+        if args.record:
+            from agents import telemetry
+
+            telemetry.record("stage", f"import.{module}", result["ms"], heavy=result["heavy"])
+
+    if failures:
+        print("\nImport check FAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        raise SystemExit(1)
+    print(f"\nAll {len(ENTRY_MODULES)} entry points import in under {args.budget_ms:.0f}ms without heavy dependencies")
+
+
+if __name__ == "__main__":
+    main()
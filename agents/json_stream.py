@@ -0,0 +1,391 @@
+"""
+Incremental parser for the JSON our agents return, fed as text arrives.
+
+Agents answer with either a top-level array of objects (Agent 1's
+companies) or an object whose values are arrays of objects (Agent 2's
+{"roles": [...], "coverage": [...]}). JsonItemStream watches the streamed
+text for that structure and hands every array element to a callback the
+moment its closing brace arrives, so callers can act on items before the
+response finishes, and a response cut off mid-way still yields every
+element that was complete.
+
+Prose or citations before the JSON are skipped: a bracket only starts the
+document if what follows it can begin an array of objects or an object.
+
+scan_json does the same for a finished response in one pass: it finds the
+outermost JSON value among any surrounding prose or code fences and, if
+the response was cut off, closes it after the last complete element and
+reports what had to be dropped. agents.utils.extract_json is built on it.
+
+Usage:
+    python -m agents.json_stream          # benchmark scan_json against the old extract_json
+    python -m agents.json_stream --verbose --synthetic-mb 5
+"""
+
+import argparse
+import glob
+import json
+import re
+import time
+
+WHITESPACE = " \t\r\n"
+
+
+class JsonItemStream:
+    """Feed text chunks; collects (key, item) for each completed array element.
+
+    key is the top-level object key the array sits under ("roles",
+    "coverage"), or None for elements of a top-level array.
+    """
+
+    def __init__(self, on_item=None):
+        self.on_item = on_item
+        self.items = []
+        self.done = False
+        self._buf = []          # text of the document since it started
+        self._stack = []        # open containers: "{" or "["
+        self._probing = False   # just saw the opening bracket; next char decides
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._key = None        # current top-level key
+        self._item_start = None
+
+    def feed(self, text: str):
+        for ch in text:
+            if self.done:
+                return
+            self._step(ch)
+
+    def _reset(self):
+        self._buf = []
+        self._stack = []
+        self._probing = False
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._item_start = None
+
+    def _step(self, ch: str):
+        if not self._stack:
+            if ch in "[{":
+                self._buf = [ch]
+                self._stack = [ch]
+                self._probing = True
+            return
+
+        if self._probing:
+            if ch in WHITESPACE:
+                self._buf.append(ch)
+                return
+            self._probing = False
+            opener = self._stack[0]
+            if (opener == "[" and ch not in "{]") or (opener == "{" and ch not in '"}'):
+                self._reset()
+                self._step(ch)  # this char may itself start the document
+                return
+
+        pos = len(self._buf)
+        self._buf.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if len(self._stack) == 1 and self._stack[0] == "{":
+                    self._last_string = "".join(self._buf[self._string_start:pos + 1])
+            return
+
+        if ch == '"':
+            self._in_string = True
+            self._string_start = pos
+        elif ch == ":" and len(self._stack) == 1 and self._stack[0] == "{":
+            try:
+                self._key = json.loads(self._last_string)
+            except (TypeError, json.JSONDecodeError):
+                self._key = None
+        elif ch in "[{":
+            if ch == "{" and self._is_item_array():
+                self._item_start = pos
+            self._stack.append(ch)
+        elif ch in "]}":
+            self._stack.pop()
+            if ch == "}" and self._item_start is not None and self._is_item_array():
+                self._emit("".join(self._buf[self._item_start:pos + 1]))
+                self._item_start = None
+            if not self._stack:
+                self.done = True
+
+    def _is_item_array(self) -> bool:
+        """True if the innermost open container is an array whose elements we report."""
+        stack = self._stack
+        if stack == ["["]:
+            return True
+        return len(stack) == 2 and stack[0] == "{" and stack[1] == "["
+
+    def _emit(self, raw: str):
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        key = None if self._stack == ["["] else self._key
+        self.items.append((key, item))
+        if self.on_item:
+            self.on_item(key, item)
+
+
+# ── One-pass extraction from a finished response ──
+
+_OPENER = re.compile(r"[\[{]")
+_STRUCTURAL = re.compile(r'[\[\]{},"]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_NEXT_CHAR = re.compile(r"\s*(\S)")
+_CLOSERS = {"[": "]", "{": "}"}
+_DECODER = json.JSONDecoder()
+
+# What may follow an opening bracket for it to start a JSON document
+_ARRAY_FIRST = set('{["]-0123456789')
+_OBJECT_FIRST = set('"}')
+
+# Cut points tried, newest first, before giving up on a truncated value
+MAX_RECOVERY_ATTEMPTS = 20
+
+
+def _starts_document(text: str, pos: int) -> bool:
+    match = _NEXT_CHAR.match(text, pos + 1)
+    if not match:
+        return False
+    return match.group(1) in (_ARRAY_FIRST if text[pos] == "[" else _OBJECT_FIRST)
+
+
+def _runs_off_end(text: str, error: json.JSONDecodeError) -> bool:
+    """True if a decode error is the text ending mid-value rather than malformed JSON."""
+    if error.msg.startswith("Unterminated string"):
+        return _STRING.match(text, error.pos) is None
+    return not text[error.pos:].strip()
+
+
+def _element_level(stack: list) -> bool:
+    """True inside a container whose elements are kept whole: the top level, or an array directly under it."""
+    return len(stack) == 1 or (len(stack) == 2 and stack[1] == "[")
+
+
+def _recover_truncated(text: str, start: int):
+    """Close a value cut off at the end of text after its last complete element; (value, cut) or None."""
+    stack, cuts = [], []
+    pos = start
+    while True:
+        match = _STRUCTURAL.search(text, pos)
+        if not match:
+            break
+        i = match.start()
+        ch = text[i]
+        pos = i + 1
+        if ch == '"':
+            string = _STRING.match(text, i)
+            if not string:
+                break  # cut off inside a string
+            pos = string.end()
+        elif ch in "[{":
+            stack.append(ch)
+            if len(stack) == 1 or (len(stack) == 2 and ch == "["):
+                cuts.append((pos, "".join(stack)))  # empty container
+        elif ch in "]}":
+            stack.pop()
+            if stack and _element_level(stack):
+                cuts.append((pos, "".join(stack)))
+        elif ch == "," and _element_level(stack):
+            cuts.append((i, "".join(stack)))
+
+    for cut, open_stack in reversed(cuts[-MAX_RECOVERY_ATTEMPTS:]):
+        closing = "".join(_CLOSERS[c] for c in reversed(open_stack))
+        try:
+            return json.loads(text[start:cut] + closing), cut
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def scan_json(text: str):
+    """Find the outermost JSON value in model output in one pass; returns (value, report).
+
+    Each bracket that can start a document is decoded in place (prose,
+    citations and code fences around it are skipped, never re-parsed) and
+    the longest value wins. If the text ends inside a value (a response
+    cut off at max_tokens), the value is closed after its last complete
+    element: top-level array items, or items of the arrays under a
+    top-level object's keys; a partial element is dropped, never
+    half-kept. report has "truncated", "span" (start, end) of the JSON in
+    text, "ignored_chars" outside it, and for a truncated value
+    "dropped_chars" and a "dropped_preview" of what was cut.
+    """
+    report = {"truncated": False, "span": None, "ignored_chars": len(text or ""), "dropped_chars": 0,
+              "dropped_preview": ""}
+    if not isinstance(text, str):
+        return None, report
+
+    best = None  # (start, end, value)
+    pos = 0
+    while True:
+        match = _OPENER.search(text, pos)
+        if not match:
+            break
+        start = match.start()
+        pos = start + 1
+        if not _starts_document(text, start):
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            if not _runs_off_end(text, e):
+                continue
+            if best and best[1] - best[0] >= len(text) - start:
+                break
+            recovered = _recover_truncated(text, start)
+            if recovered is None:
+                break
+            value, cut = recovered
+            dropped = text[cut:]
+            report.update(truncated=True, span=(start, len(text)), ignored_chars=start,
+                          dropped_chars=len(dropped), dropped_preview=dropped.strip(" \t\r\n,")[:120])
+            return value, report
+        if best is None or end - start > best[1] - best[0]:
+            best = (start, end, value)
+        pos = end
+
+    if best is None:
+        return None, report
+    start, end, value = best
+    report.update(span=(start, end), ignored_chars=len(text) - (end - start))
+    return value, report
+
+
+# ── Benchmark against the previous extract_json ──
+
+def _legacy_extract_json(text: str):
+    """extract_json as it was before scan_json: whole-text parse, code fence, first/last bracket."""
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        pass
+    fence_match = re.search(r'```(?:json)?\s*\n?([\s\S]*?)\n?\s*```', text)
+    if fence_match:
+        try:
+            return json.loads(fence_match.group(1))
+        except (json.JSONDecodeError, TypeError):
+            pass
+    for open_char, close_char in [('{', '}'), ('[', ']')]:
+        start = text.find(open_char)
+        end = text.rfind(close_char)
+        if start != -1 and end > start:
+            try:
+                return json.loads(text[start:end + 1])
+            except (json.JSONDecodeError, TypeError):
+                pass
+    return None
+
+
+def _response_variants(value) -> dict:
+    """How the same JSON shows up in model output: bare, fenced with prose and citations, cut off."""
+    body = json.dumps(value, indent=2)
+    return {
+        "bare": body,
+        "prose": ("I searched the career pages [1] and found the following.\n\n```json\n" + body
+                  + "\n```\n\nLet me know if you want more detail on any of these."),
+        "truncated": "Here is what I found:\n\n```json\n" + body[:int(len(body) * 0.9)],
+    }
+
+
+def _synthetic_roles(target_bytes: int) -> dict:
+    roles, coverage, size = [], [], 0
+    while size < target_bytes:
+        n = len(roles)
+        role = {"company": f"Company {n % 400}", "title": f"VP of Sales, Region {n}", "url": f"https://example.com/jobs/{n}",
+                "location": "New York, NY", "compensation": "Not disclosed", "datePosted": "2026-10-01",
+                "source": "Greenhouse", "notes": "Leads a team of \"enterprise\" reps {across} [NA] and EMEA."}
+        roles.append(role)
+        coverage.append({"company": role["company"], "status": "checked", "roles_found": 1})
+        size += len(json.dumps(role)) + len(json.dumps(coverage[-1]))
+    return {"roles": roles, "coverage": coverage}
+
+
+def _best_time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _element_count(value) -> int:
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(v) for v in value.values() if isinstance(v, list))
+    return 0
+
+
+def benchmark(results_glob: str, synthetic_mb: float = 1.0, repeat: int = 5, verbose: bool = False) -> int:
+    """Compare both extractors on saved agent outputs and a synthetic response; returns mismatches.
+
+    Complete variants must parse to the original value; for truncated ones
+    the report shows how many elements each extractor recovered.
+    """
+    from agents.utils import RESULTS_DIR
+
+    corpus = []
+    for path in sorted(glob.glob(str(RESULTS_DIR / results_glob))):
+        with open(path) as f:
+            corpus.append((path.rsplit("/", 1)[-1], json.load(f)))
+    corpus.append((f"synthetic {synthetic_mb:g} MB", _synthetic_roles(int(synthetic_mb * 1_000_000))))
+
+    mismatches = 0
+    totals = {}  # variant -> [old ms, new ms, old items, new items, old failures]
+    print(f"  {'Input':<28} {'Variant':<10} {'Size':>8} {'Old':>9} {'New':>9} {'Old items':>10} {'New items':>10}")
+    for name, value in corpus:
+        for variant, text in _response_variants(value).items():
+            old, (new, report) = _legacy_extract_json(text), scan_json(text)
+            if variant != "truncated" and new != value:
+                mismatches += 1
+                print(f"  MISMATCH: {name} ({variant})")
+            old_ms, new_ms = _best_time(_legacy_extract_json, text, repeat), _best_time(scan_json, text, repeat)
+            total = totals.setdefault(variant, [0.0, 0.0, 0, 0, 0])
+            total[0] += old_ms
+            total[1] += new_ms
+            total[2] += _element_count(old)
+            total[3] += _element_count(new)
+            total[4] += old is None
+            if verbose or name.startswith("synthetic"):
+                old_items = _element_count(old) if old is not None else "failed"
+                print(f"  {name:<28} {variant:<10} {len(text) / 1000:>7.0f}K {old_ms:>7.1f}ms {new_ms:>7.1f}ms "
+                      f"{old_items:>10} {_element_count(new):>10}"
+                      + (f"  (dropped {report['dropped_chars']} chars)" if report["truncated"] else ""))
+
+    print(f"\n  Totals over {len(corpus)} inputs:")
+    for variant, (old_ms, new_ms, old_items, new_items, old_failed) in totals.items():
+        print(f"  {variant:<10} old {old_ms:>7.1f}ms, {old_items:>6} items ({old_failed} failed)   "
+              f"new {new_ms:>7.1f}ms, {new_items:>6} items")
+    if mismatches:
+        print(f"\n  {mismatches} complete responses parsed differently from the original")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scan_json against the previous extract_json")
+    parser.add_argument("--results", default="agent*.json", help="Glob of saved results to use (default: agent*.json)")
+    parser.add_argument("--synthetic-mb", type=float, default=1.0, help="Size of the synthetic response (default: 1 MB)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per input, best kept (default: 5)")
+    parser.add_argument("--verbose", action="store_true", help="Show every input, not just the synthetic one")
+    args = parser.parse_args()
+
+    if benchmark(args.results, args.synthetic_mb, args.repeat, args.verbose):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
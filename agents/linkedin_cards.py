@@ -0,0 +1,194 @@
+"""
+Browser-free parser for LinkedIn job search result cards.
+
+Mirrors the selectors agent 3 runs inside the page (see CARD_FIELD_SELECTORS
+in agent3_linkedin_search) over raw HTML, so recorded search pages and
+guest-API fragments produce the same job dicts as extract_jobs_from_page
+without Playwright. A regex tokenizer plus an element stack keeps this fast
+enough to replay a full agent-3 run in well under a second.
+"""
+
+import html
+import re
+
+# Elements matched by ".base-card, .job-search-card, .base-search-card"
+CARD_CLASSES = {"base-card", "job-search-card", "base-search-card"}
+
+# Tags that never have a closing tag, so they never enter the element stack
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_CARD_START = re.compile(
+    r"<[a-zA-Z][^>]*\bclass=[\"'][^\"']*(?<![\w-])(?:base-card|job-search-card|base-search-card)(?![\w-])"
+)
+
+
+def _field_for(tag: str, attrs: dict, classes: set, in_metadata: bool) -> list:
+    """Which card fields this element can supply (a selector list may match several)."""
+    fields = []
+    if classes & {"base-search-card__title", "base-card__full-link"} or tag == "h3":
+        fields.append("title")
+    if classes & {"base-search-card__subtitle", "base-card__subtitle"} or tag == "h4":
+        fields.append("company")
+    if "job-search-card__location" in classes or (tag == "span" and in_metadata):
+        fields.append("location")
+    if tag == "a" and ("/jobs/view/" in (attrs.get("href") or "") or "base-card__full-link" in classes):
+        fields.append("link")
+    if tag == "time" or classes & {"base-search-card__listdate", "job-search-card__listdate"}:
+        fields.append("date")
+    return fields
+
+
+# One pass over the markup: comments and raw-text elements are skipped whole,
+# everything else is a start tag, end tag or text run.
+_TOKEN = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style|template|noscript)\b[^>]*>.*?</\1\s*>"
+    r"|<(/?)([a-zA-Z][\w:-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>"
+    r"|([^<]+)"
+    r"|<",
+    re.DOTALL | re.IGNORECASE,
+)
+_ATTR = re.compile(r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+
+def _parse_attrs(raw: str) -> dict:
+    attrs = {}
+    for m in _ATTR.finditer(raw):
+        name = m.group(1).lower()
+        value = m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+        attrs.setdefault(name, html.unescape(value) if value else "")
+    return attrs
+
+
+class _CardParser:
+    """Stack-based walk over the token stream that collects card fields."""
+
+    def __init__(self):
+        self.cards = []
+        self._stack = []         # tag names of open elements
+        self._card_depth = None  # stack depth of the current card element
+        self._card = None
+        self._captures = {}      # field -> (stack depth, text parts)
+        self._metadata_depth = None
+
+    def feed(self, markup: str, stop_after: int = None):
+        """Walk the markup; stop once past stop_after with no card open."""
+        for m in _TOKEN.finditer(markup):
+            if stop_after is not None and self._card is None and m.start() > stop_after:
+                break
+            kind = m.lastindex  # 5: text, 4: tag, 1: skipped raw-text element, None: comment
+            if kind == 5:
+                if self._captures:
+                    for _, parts in self._captures.values():
+                        parts.append(m.group(5))
+            elif kind == 4:
+                tag = m.group(3).lower()
+                if m.group(2):
+                    self.handle_endtag(tag)
+                else:
+                    raw = m.group(4)
+                    self.handle_starttag(tag, raw)
+                    if raw.endswith("/") and tag not in VOID_TAGS:
+                        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag: str, raw_attrs: str):
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+        depth = len(self._stack)
+
+        if self._card is None and "card" not in raw_attrs:
+            return  # cheap reject for page chrome outside any card
+        attrs = _parse_attrs(raw_attrs) if raw_attrs.strip() else {}
+        classes = set(attrs.get("class", "").split())
+
+        if self._card is None:
+            if classes & CARD_CLASSES:
+                self._card = {}
+                self._card_depth = depth
+            return
+
+        if "base-search-card__metadata" in classes and self._metadata_depth is None:
+            self._metadata_depth = depth
+
+        for field in _field_for(tag, attrs, classes, self._metadata_depth is not None):
+            if field in self._card or field in self._captures:
+                continue  # querySelector returns the first match in document order
+            if field == "link":
+                self._card["link"] = attrs.get("href") or ""
+            elif field == "date" and attrs.get("datetime"):
+                self._card["date"] = attrs["datetime"]
+            else:
+                self._captures[field] = (depth, [])
+
+    def handle_endtag(self, tag: str):
+        # Tolerate unclosed children: pop back to the nearest matching open tag
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            self._close(len(self._stack))
+            self._stack.pop()
+
+    def _close(self, depth: int):
+        if self._metadata_depth == depth:
+            self._metadata_depth = None
+        if self._captures:
+            for field, (start, parts) in list(self._captures.items()):
+                if start == depth:
+                    text = html.unescape("".join(parts))
+                    self._card[field] = _WHITESPACE.sub(" ", text).strip()
+                    del self._captures[field]
+        if self._card_depth == depth:
+            self._finish_card()
+
+    def _finish_card(self):
+        card = self._card
+        self.cards.append({
+            "title": card.get("title", ""),
+            "company": card.get("company", ""),
+            "location": card.get("location", ""),
+            "url": card.get("link", ""),
+            "datePosted": card.get("date", ""),
+        })
+        self._card = None
+        self._card_depth = None
+        self._captures = {}
+        self._metadata_depth = None
+
+    def close(self):
+        while self._stack:
+            self._close(len(self._stack))
+            self._stack.pop()
+
+
+def parse_job_cards(markup: str) -> list:
+    """Parse every job card in a search results page (or guest-API fragment).
+
+    Returns job dicts shaped like extract_jobs_from_page's output, with
+    tracking parameters stripped from URLs and title-less cards skipped.
+    """
+    # Skip the page chrome after the last card (footer, trailing scripts)
+    last = None
+    for last in _CARD_START.finditer(markup):
+        pass
+    if last is None:
+        return []
+    parser = _CardParser()
+    parser.feed(markup, stop_after=last.start())
+    parser.close()
+
+    jobs = []
+    for card in parser.cards:
+        if not card["title"]:
+            continue
+        if card["url"]:
+            card["url"] = card["url"].split("?")[0]  # Clean tracking params
+        jobs.append(card)
+    return jobs
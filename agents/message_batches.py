@@ -0,0 +1,132 @@
+"""
+Message Batches execution: submit many Claude requests at once and collect the results.
+
+For nightly runs latency doesn't matter, and the batch API charges half
+price and doesn't count against the per-minute rate limits. A run builds
+(custom_id, params) pairs, submits them as one batch, polls until the batch
+has ended, and gets back each request's final message as a plain dict
+keyed by custom_id.
+
+The transport is pluggable: anything with submit(requests) -> batch,
+status(batch_id) -> batch and results(batch) -> iterable of result dicts
+works. HttpBatchTransport speaks the REST API over agents.http_client, so
+pointing it at `tests.stub_servers batches` (or ANTHROPIC_BATCH_URL) runs the
+whole batch path locally.
+"""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from agents import telemetry
+from agents.http_client import HttpClient
+from agents.utils import load_env, usage_counts
+
+ANTHROPIC_API_URL = "https://api.anthropic.com"
+ANTHROPIC_VERSION = "2023-06-01"
+BATCHES_PATH = "/v1/messages/batches"
+
+POLL_INTERVAL = 30.0
+POLL_INTERVAL_MAX = 300.0
+BATCH_TIMEOUT = 24 * 3600  # batches expire after 24h anyway
+
+
+class BatchError(Exception):
+    pass
+
+
+class HttpBatchTransport:
+    """Message Batches REST API over the pooled stdlib HTTP client."""
+
+    def __init__(self, base_url: str = None, api_key: str = None, client: HttpClient = None):
+        load_env()
+        self.base_url = (base_url or os.environ.get("ANTHROPIC_BATCH_URL") or ANTHROPIC_API_URL).rstrip("/")
+        self.api_key = api_key if api_key is not None else os.environ.get("ANTHROPIC_API_KEY", "")
+        self.client = client or HttpClient(timeout=120.0)
+
+    def _request(self, method: str, url: str, payload: dict = None):
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": ANTHROPIC_VERSION,
+            "content-type": "application/json",
+            "accept": "application/json",
+        }
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        resp = self.client.request(method, url, headers=headers, body=body)
+        if not resp.ok:
+            raise BatchError(f"{method} {url} -> HTTP {resp.status}: {resp.text[:300]}")
+        return resp
+
+    def submit(self, requests: list) -> dict:
+        return self._request("POST", self.base_url + BATCHES_PATH, {"requests": requests}).json()
+
+    def status(self, batch_id: str) -> dict:
+        return self._request("GET", f"{self.base_url}{BATCHES_PATH}/{batch_id}").json()
+
+    def results(self, batch: dict):
+        url = batch.get("results_url") or f"{self.base_url}{BATCHES_PATH}/{batch['id']}/results"
+        for line in self._request("GET", url).text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+
+def message_text(message: dict) -> str:
+    """Text blocks of a message dict, joined like utils.collect_text."""
+    return "\n".join(block.get("text", "") for block in message.get("content", []) if block.get("type") == "text")
+
+
+def message_usage(message: dict) -> dict:
+    """usage_counts() for a message dict."""
+    usage = {"input_tokens": 0, "output_tokens": 0, **(message.get("usage") or {})}
+    return usage_counts(SimpleNamespace(**usage))
+
+
+def run_message_batch(requests: list, transport=None, metric: str = "batch",
+                      poll_interval: float = POLL_INTERVAL, timeout: float = BATCH_TIMEOUT) -> dict:
+    """Submit [(custom_id, params)] as one batch and wait for it.
+
+    Returns {custom_id: {"type": "succeeded"|"errored"|"canceled"|"expired",
+    "message": dict or None, "error": str or None}}. Requests missing from
+    the results come back as "expired".
+    """
+    transport = transport or HttpBatchTransport()
+    t0 = time.perf_counter()
+    batch = transport.submit([{"custom_id": cid, "params": params} for cid, params in requests])
+    print(f"  Submitted message batch {batch['id']} with {len(requests)} requests")
+
+    interval = poll_interval
+    while batch.get("processing_status") != "ended":
+        if time.perf_counter() - t0 > timeout:
+            raise BatchError(f"batch {batch['id']} still {batch.get('processing_status')} after {timeout:.0f}s")
+        time.sleep(interval)
+        interval = min(POLL_INTERVAL_MAX, interval * 1.5)
+        batch = transport.status(batch["id"])
+        counts = batch.get("request_counts") or {}
+        print(f"  Batch {batch['id']}: {batch.get('processing_status')} — "
+              + ", ".join(f"{n} {state}" for state, n in counts.items() if n))
+
+    outcomes = {cid: {"type": "expired", "message": None, "error": None} for cid, _ in requests}
+    tokens = {"input": 0, "output": 0, "cache_read": 0, "cache_write": 0}
+    web_searches = 0
+    for item in transport.results(batch):
+        result = item.get("result") or {}
+        outcome = {"type": result.get("type", "errored"), "message": result.get("message"), "error": None}
+        if outcome["message"]:
+            for key, count in message_usage(outcome["message"]).items():
+                tokens[key] += count
+            server_tools = (outcome["message"].get("usage") or {}).get("server_tool_use") or {}
+            web_searches += server_tools.get("web_search_requests", 0) or 0
+        if result.get("error"):
+            outcome["error"] = json.dumps(result["error"])
+        outcomes[item.get("custom_id")] = outcome
+
+    by_type = {}
+    for outcome in outcomes.values():
+        by_type[outcome["type"]] = by_type.get(outcome["type"], 0) + 1
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    print(f"  Batch {batch['id']} ended after {elapsed_ms / 1000:.0f}s: "
+          + ", ".join(f"{n} {state}" for state, n in sorted(by_type.items())))
+    telemetry.record("api", metric, elapsed_ms, batch=True, requests=len(requests), tokens=tokens,
+                     web_searches=web_searches, results=by_type)
+    return outcomes
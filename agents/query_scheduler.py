@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Adaptive query budget for Agent 3, driven by past query yield.
+
+Every saved agent3 result logs per-query stats (raw_results,
+matching_results, industry_relevant / company_relevant). The scheduler
+turns that history into a plan for the next run:
+
+  - queries are ranked by average yield and run in that order within each
+    kind, so the best searches finish first. Yield is the roles a query
+    keeps after all its filters: industry-relevant title matches for broad
+    searches, title matches at the searched company for company ones (a
+    company search also turns up plenty of other employers' roles, which
+    say nothing about the query). Results saved before company_relevant
+    was logged get it counted from their saved roles.
+  - scroll caps scale from the fixed three-scroll limit agent 3 used to
+    have: productive queries get three times it, average and new ones twice
+    (agent 3's unscheduled SCROLL_CAP), low-yield ones half
+  - dead queries (no roles kept in their last few runs) only run every
+    DEAD_QUERY_EVERY runs
+  - the time skipped queries would have taken is estimated from their logged
+    durations, so each run reports what it saved versus the full run
+
+Queries with no history always run at the default depth.
+
+Usage:
+    python -m agents.query_scheduler           # rank queries from saved agent3 results
+"""
+
+import argparse
+import glob
+import json
+
+from agents.company_index import default_company_index
+from agents.utils import RESULTS_DIR
+
+# A query with this many logged runs and no roles kept in its last
+# DEAD_WINDOW runs is dead; dead queries run once every DEAD_QUERY_EVERY runs
+DEAD_MIN_RUNS = 3
+DEAD_WINDOW = 5
+DEAD_QUERY_EVERY = 4
+
+# Average roles kept per run at or above which a query is productive
+PRODUCTIVE_YIELD = 2.0
+
+# Scroll caps by tier, relative to agent 3's old fixed limit (BASELINE_SCROLLS);
+# scrolling still stops early once a list stops growing, so these are ceilings
+DEEP_SCROLL_FACTOR = 3
+DEFAULT_SCROLL_FACTOR = 2
+SHALLOW_SCROLL_FACTOR = 0.5
+
+# Rough cost of one search (load + scroll + extract + delays) when no
+# duration has been logged for it yet
+DEFAULT_QUERY_SECONDS = 25.0
+
+
+def query_key(task: dict) -> str:
+    """The name a task's entry has in queries_run logs."""
+    if task["kind"] == "company":
+        return f"Company: {task['company'].get('company', '')}"
+    return task["keywords"]
+
+
+def query_yield(entry: dict):
+    """Roles a logged query kept after every filter, or None if the entry doesn't say.
+
+    Industry-relevant title matches for broad searches, title matches at the
+    searched company for company ones.
+    """
+    if "industry_relevant" in entry:
+        return entry["industry_relevant"]
+    return entry.get("company_relevant")
+
+
+def backfill_company_yield(data: dict, company_index=None):
+    """Add company_relevant to a saved result's company queries that predate it, from its saved roles."""
+    company_index = company_index or default_company_index()
+    counts = {}
+    for role in data.get("roles", []):
+        key = company_index.canonical_key(role.get("company", ""))
+        counts[key] = counts.get(key, 0) + 1
+    for entry in data.get("queries_run", []):
+        query = entry.get("query", "")
+        if query.startswith("Company: ") and "company_relevant" not in entry:
+            entry["company_relevant"] = counts.get(company_index.canonical_key(query[len("Company: "):]), 0)
+
+
+def load_query_history(results_dir=RESULTS_DIR) -> list:
+    """queries_run from every saved agent3 result, oldest run first."""
+    history = []
+    for path in sorted(glob.glob(str(results_dir / "agent3_*.json"))):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(data, dict):
+            backfill_company_yield(data)
+            history.append(data.get("queries_run", []))
+    return history
+
+
+def query_stats(history: list) -> dict:
+    """Per-query yields, run count and recency from the run history."""
+    stats = {}
+    for run_index, queries in enumerate(history):
+        for entry in queries:
+            yield_ = query_yield(entry)
+            if entry.get("throttled") or yield_ is None:
+                continue  # never got a results page, or no comparable yield; says nothing about the query
+            s = stats.setdefault(entry.get("query", ""), {"yields": [], "durations_ms": [], "last_run": None})
+            s["yields"].append(yield_)
+            if "duration_ms" in entry:
+                s["durations_ms"].append(entry["duration_ms"])
+            s["last_run"] = run_index
+    for s in stats.values():
+        recent = s["yields"][-DEAD_WINDOW:]
+        s["runs"] = len(s["yields"])
+        s["avg_yield"] = sum(recent) / len(recent)
+        s["runs_since"] = len(history) - 1 - s["last_run"]
+        s["dead"] = s["runs"] >= DEAD_MIN_RUNS and sum(recent) == 0
+        s["est_seconds"] = (sum(s["durations_ms"]) / len(s["durations_ms"]) / 1000
+                            if s["durations_ms"] else None)
+    return stats
+
+
+def query_tier(s: dict) -> str:
+    """deep / default / shallow / dead for one query's stats (None means no history)."""
+    if s is None:
+        return "default"
+    if s["dead"]:
+        return "dead"
+    if s["avg_yield"] >= PRODUCTIVE_YIELD:
+        return "deep"
+    if s["avg_yield"] < 1:
+        return "shallow"
+    return "default"
+
+
+def schedule_tasks(tasks: list, history: list = None, base_scrolls: int = 3) -> tuple:
+    """Plan a run: returns (tasks to run, skipped tasks, report).
+
+    Tasks keep their kind grouping (broad searches first) but are ranked by
+    yield within it, and each gets a max_scrolls for its tier. Dead queries
+    are skipped unless they are due their every-N-runs check. Scroll caps
+    are multiples of base_scrolls, agent 3's old fixed scroll limit.
+    """
+    history = load_query_history() if history is None else history
+    stats = query_stats(history)
+    shallow = max(1, int(base_scrolls * SHALLOW_SCROLL_FACTOR))
+    scroll_caps = {"deep": base_scrolls * DEEP_SCROLL_FACTOR, "default": base_scrolls * DEFAULT_SCROLL_FACTOR,
+                   "shallow": shallow, "dead": shallow}
+
+    known_seconds = [s["est_seconds"] for s in stats.values() if s["est_seconds"]]
+    fallback_seconds = sum(known_seconds) / len(known_seconds) if known_seconds else DEFAULT_QUERY_SECONDS
+
+    scheduled, skipped = [], []
+    tiers = {}
+    for task in tasks:
+        s = stats.get(query_key(task))
+        tier = query_tier(s)
+        if tier == "dead" and s["runs_since"] < DEAD_QUERY_EVERY - 1:
+            skipped.append(task)
+            continue
+        tiers[tier] = tiers.get(tier, 0) + 1
+        task["max_scrolls"] = scroll_caps[tier]
+        task["avg_yield"] = round(s["avg_yield"], 2) if s else None
+        scheduled.append(task)
+
+    # Rank within each kind; queries with no history sort as productive
+    kind_order = {}
+    for task in tasks:
+        kind_order.setdefault(task["kind"], len(kind_order))
+    scheduled.sort(key=lambda t: (kind_order[t["kind"]],
+                                  -(t["avg_yield"] if t["avg_yield"] is not None else PRODUCTIVE_YIELD)))
+
+    est_saved = sum(stats[query_key(t)]["est_seconds"] or fallback_seconds for t in skipped)
+    report = {
+        "history_runs": len(history),
+        "scheduled": len(scheduled),
+        "skipped": [query_key(t) for t in skipped],
+        "tiers": tiers,
+        "est_seconds_saved": round(est_saved),
+    }
+    return scheduled, skipped, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank Agent 3 queries by historical yield")
+    parser.parse_args()
+
+    history = load_query_history()
+    stats = query_stats(history)
+    print(f"Query history: {len(history)} runs, {len(stats)} distinct queries\n")
+    ranked = sorted(stats.items(), key=lambda kv: -kv[1]["avg_yield"])
+    for query, s in ranked:
+        print(f"  {query_tier(s):<8} avg {s['avg_yield']:5.1f} over {s['runs']:>2} runs  {query[:70]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared rate limiter: per-host token buckets with jitter and throttle backoff.
+
+Every request to a host takes tokens from that host's bucket first. Buckets
+refill at a steady rate up to a small burst, so a run only waits when it is
+actually ahead of the allowed pace, instead of sleeping a fixed time after
+every action. Cheap follow-up requests (an infinite-scroll fetch, the next
+page of a paginated API) take a fraction of a token.
+
+When a host shows signs of throttling (HTTP 429, a redirect to a login
+wall, a results page that never renders cards), callers report it and the
+host is paused with exponential backoff. Consecutive signals double the
+pause; a normal response resets it.
+
+The limiter also accounts for where worker time goes: waiting for tokens or
+backoff versus doing work, so runs can report both.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Default pace per host: one full request every 4s on average, bursts of 1
+DEFAULT_RATE = 0.25
+DEFAULT_BURST = 1.0
+DEFAULT_JITTER = 1.0  # extra random wait (s) added to any wait, so workers don't move in lockstep
+
+# Fraction of a token for follow-up requests within a page (scrolls, next page)
+FOLLOW_UP_COST = 0.25
+
+# First pause (s) per throttle signal; doubles per consecutive signal up to BACKOFF_MAX
+THROTTLE_BACKOFF = {
+    "http-429": 30.0,
+    "authwall": 60.0,
+    "empty-after-timeout": 5.0,
+}
+DEFAULT_BACKOFF = 15.0
+BACKOFF_MAX = 300.0
+
+
+class TokenBucket:
+    """Refills at `rate` tokens/s up to `burst`; not thread-safe on its own."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.strikes = 0
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Take `cost` tokens (going negative if needed); returns seconds until they're covered."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= cost
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+
+class RateLimiter:
+    """Per-host token buckets shared by every worker thread."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 jitter: float = DEFAULT_JITTER, host_rates: dict = None):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.host_rates = host_rates or {}  # host -> (rate, burst)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._local = threading.local()
+        self.wait_s = 0.0
+        self.work_s = 0.0
+        self.acquired = {}
+        self.throttles = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_rates.get(host, (self.rate, self.burst))
+            bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    def acquire(self, host: str, cost: float = 1.0) -> float:
+        """Block until `cost` tokens are available for host; returns seconds waited."""
+        with self._lock:
+            wait = self._bucket(host).reserve(cost, time.monotonic())
+            self.acquired[host] = self.acquired.get(host, 0) + 1
+        if wait > 0:
+            wait += random.uniform(0, self.jitter)
+            time.sleep(wait)
+            with self._lock:
+                self.wait_s += wait
+            self._local.waited = getattr(self._local, "waited", 0.0) + wait
+        return wait
+
+    def throttled(self, host: str, reason: str) -> float:
+        """Report a throttling signal; pauses the host and returns the pause length."""
+        with self._lock:
+            bucket = self._bucket(host)
+            base = THROTTLE_BACKOFF.get(reason, DEFAULT_BACKOFF)
+            pause = min(BACKOFF_MAX, base * 2 ** bucket.strikes)
+            bucket.strikes += 1
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + pause)
+            self.throttles[reason] = self.throttles.get(reason, 0) + 1
+        print(f"    Throttle signal from {host} ({reason}) — pausing it for {pause:.0f}s")
+        return pause
+
+    def ok(self, host: str):
+        """Report a normal response; clears the host's backoff streak."""
+        with self._lock:
+            self._bucket(host).strikes = 0
+
+    @contextmanager
+    def working(self):
+        """Count the block's wall time as work, minus any waiting done inside it."""
+        waited_before = getattr(self._local, "waited", 0.0)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            waited = getattr(self._local, "waited", 0.0) - waited_before
+            with self._lock:
+                self.work_s += max(0.0, elapsed - waited)
+
+    def summary(self) -> dict:
+        with self._lock:
+            total = self.wait_s + self.work_s
+            return {
+                "wait_s": round(self.wait_s, 1),
+                "work_s": round(self.work_s, 1),
+                "wait_pct": round(100 * self.wait_s / total, 1) if total else 0.0,
+                "requests_by_host": dict(self.acquired),
+                "throttles": dict(self.throttles),
+            }
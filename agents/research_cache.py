@@ -0,0 +1,112 @@
+"""
+Reuse of Agent 1's company research across days.
+
+The company landscape barely moves from one day to the next, so a full
+web-search research run every morning mostly re-derives yesterday's list.
+After each successful Agent 1 run, data/research_cache.json records which
+results file it wrote and a hash of everything that shaped the research
+(agent prompt, skill file, tool definition, model). A later run reuses that
+file while it is younger than the TTL and the hash still matches; editing
+the prompt or skill invalidates it immediately.
+
+Usage:
+    python -m agents.research_cache            # show the cache entry and whether it's fresh
+    python -m agents.research_cache --ttl 3
+"""
+
+import argparse
+import hashlib
+import json
+from datetime import datetime
+
+from agents.utils import DATA_DIR, RESULTS_DIR, today, write_json_atomic
+
+RESEARCH_CACHE_PATH = DATA_DIR / "research_cache.json"
+DEFAULT_TTL_DAYS = 7
+
+
+def research_key() -> str:
+    """Content hash of the inputs that determine Agent 1's research."""
+    from agents.agent1_company_research import build_system_prompt
+    from agents.utils import MODEL_RESEARCH, WEB_SEARCH_TOOL
+
+    material = json.dumps({
+        "model": MODEL_RESEARCH,
+        "tools": [WEB_SEARCH_TOOL],
+        "system": build_system_prompt(),
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def load_entry() -> dict:
+    if not RESEARCH_CACHE_PATH.exists():
+        return None
+    try:
+        with open(RESEARCH_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def entry_age_days(entry: dict, date: str = None) -> int:
+    researched = datetime.strptime(entry["date"], "%Y-%m-%d")
+    return (datetime.strptime(date or today(), "%Y-%m-%d") - researched).days
+
+
+def cached_research(ttl_days: int = DEFAULT_TTL_DAYS):
+    """Return (companies, results path, research date) if a fresh matching entry exists, else None."""
+    if ttl_days <= 0:
+        return None
+    entry = load_entry()
+    if not entry:
+        return None
+    reason = None
+    path = RESULTS_DIR / entry.get("file", "")
+    if entry.get("key") != research_key():
+        reason = "prompt or skill changed since it was researched"
+    elif entry_age_days(entry) >= ttl_days:
+        reason = f"{entry_age_days(entry)} days old (TTL {ttl_days})"
+    elif not path.is_file():
+        reason = f"{path.name} is missing"
+    if reason:
+        print(f"  Research cache from {entry.get('date')} not used: {reason}")
+        return None
+
+    with open(path) as f:
+        companies = json.load(f)
+    if not companies:
+        return None
+    return companies, path, entry["date"]
+
+
+def record_research(results_path, companies: list, date: str = None):
+    """Point the cache at a fresh Agent 1 results file."""
+    if not companies:
+        return
+    entry = {
+        "key": research_key(),
+        "date": date or today(),
+        "file": results_path.name,
+        "companies": len(companies),
+    }
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(RESEARCH_CACHE_PATH, entry, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show Agent 1's research cache entry")
+    parser.add_argument("--ttl", type=int, default=DEFAULT_TTL_DAYS, help=f"TTL in days (default: {DEFAULT_TTL_DAYS})")
+    args = parser.parse_args()
+
+    entry = load_entry()
+    if not entry:
+        print(f"No research cache at {RESEARCH_CACHE_PATH}")
+        return
+    print(f"Researched {entry['date']} ({entry_age_days(entry)} days ago): "
+          f"{entry['companies']} companies in {entry['file']}")
+    cached = cached_research(args.ttl)
+    print("Fresh — the orchestrator will reuse it." if cached else "Stale — the next run will research again.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+SQLite registry of every role the pipeline has reported.
+
+Replaces data/seen_roles.json, which had to be parsed whole every run and
+rewritten whole (and could be left half-written by a crash) to add a
+handful of roles. data/roles.db holds one row per role key
+(canonical-company|title), indexed on key, URL and first_seen. Lookups ask
+for exactly the keys a run produced, new roles are insert-only, and every
+write is one transaction.
+
+roles.db is a local working index and isn't committed (CI keeps it in the
+Actions cache, keyed on the export's hash). The registry's tracked form is
+data/roles.jsonl: one role per line in the order roles were stored, so the
+daily commit is a reviewable diff of the roles it added. The orchestrator
+opens the store with RoleStore.open_for_write(), which loads roles.jsonl
+into the database only when the export has changed since the database last
+saw it (a fresh checkout without a cached database, or someone else's
+commit), and brings the export up to date with export() at the end of the
+run, which appends just the rows stored since. A checkout that still has
+only the old seen_roles.json registry has it imported once instead.
+
+For near-duplicate detection (agents/dedup.py) every role also carries the
+canonical job ID of its URL (indexed) and its per-company MinHash band keys
+in title_bands, scoped to the canonical company of its company column (not
+the key prefix, which for rows keyed before company canonicalization is the
+raw company name), so find_duplicate looks a role up by job ID and by the few
+stored titles sharing a band with it, never by scanning the registry. Rows
+stored before a dedup.INDEX_VERSION change are re-indexed by
+open_for_write().
+
+Opening RoleStore(path, readonly=True) never creates, migrates or changes
+anything; read-only callers that only need titles can use exported_roles().
+
+Usage:
+    python -m agents.role_store                # counts, and the roles first seen most recently
+    python -m agents.role_store --recent 20
+    python -m agents.role_store --migrate data/seen_roles.json
+    python -m agents.role_store --duplicates   # stored roles that are near-duplicates of older ones
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from agents import dedup
+from agents.company_index import CompanyIndex, default_company_index
+from agents.utils import DATA_DIR, today
+
+ROLE_STORE_PATH = DATA_DIR / "roles.db"
+ROLE_EXPORT_PATH = DATA_DIR / "roles.jsonl"
+LEGACY_REGISTRY_PATH = DATA_DIR / "seen_roles.json"
+
+# Keys per "IN (...)" lookup, under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roles (
+    key         TEXT PRIMARY KEY,
+    company     TEXT,
+    title       TEXT,
+    url         TEXT,
+    segment     TEXT,
+    first_seen  TEXT NOT NULL,
+    job_id      TEXT
+);
+CREATE INDEX IF NOT EXISTS roles_url ON roles (url);
+CREATE INDEX IF NOT EXISTS roles_first_seen ON roles (first_seen);
+CREATE TABLE IF NOT EXISTS meta (
+    name   TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+# Created once roles.job_id is known to exist (stores from before it get the column added first)
+DEDUP_SCHEMA = """
+CREATE INDEX IF NOT EXISTS roles_job_id ON roles (job_id);
+CREATE TABLE IF NOT EXISTS title_bands (
+    band  TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    PRIMARY KEY (band, key)
+);
+"""
+
+ROLE_FIELDS = ("company", "title", "url", "segment", "first_seen")
+
+
+class RoleStore:
+    """The seen-roles registry: indexed membership queries and insert-only updates."""
+
+    def __init__(self, path: Path = ROLE_STORE_PATH, readonly: bool = False,
+                 company_index: CompanyIndex = None):
+        self.path = Path(path)
+        self.company_index = company_index
+        self._lock = threading.Lock()
+        if readonly:
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                        check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(roles)")}
+            if "job_id" not in columns:
+                self.conn.execute("ALTER TABLE roles ADD COLUMN job_id TEXT")
+            self.conn.executescript(DEDUP_SCHEMA)
+
+    @classmethod
+    def open_for_write(cls, path: Path = ROLE_STORE_PATH, export_path: Path = ROLE_EXPORT_PATH,
+                       legacy_path: Path = LEGACY_REGISTRY_PATH,
+                       company_index: CompanyIndex = None) -> "RoleStore":
+        """Open the store for a run: load the tracked export (or a legacy JSON registry) and reindex if due."""
+        store = cls(path, company_index=company_index)
+        if store.meta("dedup_index") != dedup.INDEX_VERSION:
+            store.reindex()
+        export_path = Path(export_path) if export_path else None
+        if export_path and export_path.exists():
+            if store.meta("export_sha256") != _file_sha256(export_path):
+                added = store.import_export(export_path)
+                if added:
+                    print(f"Role store: loaded {added} roles from {export_path.name} into {store.path.name}")
+        elif legacy_path and Path(legacy_path).exists() and not store.meta("migrated_from"):
+            imported = store.migrate_json(legacy_path)
+            print(f"Role store: imported {imported} roles from {Path(legacy_path).name} into {store.path.name}")
+            if export_path:
+                store.export(export_path)
+                print(f"Role store: exported the registry to {export_path.name}; {Path(legacy_path).name} "
+                      f"is no longer read")
+        return store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM roles").fetchone()[0]
+
+    def meta(self, name: str):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def known_keys(self, keys) -> set:
+        """The subset of keys already in the store."""
+        keys = list(dict.fromkeys(keys))
+        found = set()
+        with self._lock:
+            for i in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[i:i + LOOKUP_CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT key FROM roles WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def add_roles(self, entries: dict) -> int:
+        """Insert {key: {company, title, url, segment, first_seen}} in one transaction; existing keys are kept.
+
+        Returns how many were new.
+        """
+        rows = [(key, *(entry.get(field) for field in ROLE_FIELDS)) for key, entry in entries.items()]
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO roles (key, company, title, url, segment, first_seen, job_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [row[:5] + (row[5] or today(), dedup.canonical_job_id(row[3])) for row in rows])
+            added = self.conn.total_changes - before
+            self.conn.executemany("INSERT OR IGNORE INTO title_bands (band, key) VALUES (?, ?)",
+                                  self._band_rows((key, entry.get("company"), entry.get("title"))
+                                                  for key, entry in entries.items()))
+            return added
+
+    def find_duplicate(self, key: str, role: dict):
+        """(stored role, reason) for a stored role that is the same opening as role, or None.
+
+        key is role's company|title key; candidates are the stored roles with
+        the same canonical job ID and those sharing a title band with it.
+        """
+        job_id = dedup.canonical_job_id(role.get("url"))
+        bands = dedup.band_keys(self._band_company(key, role.get("company")), dedup.title_tokens(role.get("title")))
+        with self._lock:
+            candidates = []
+            if job_id:
+                candidates += self.conn.execute("SELECT * FROM roles WHERE job_id = ?", (job_id,)).fetchall()
+            candidates += self.conn.execute(
+                "SELECT DISTINCT roles.* FROM title_bands JOIN roles ON roles.key = title_bands.key "
+                f"WHERE band IN ({','.join('?' * len(bands))}) ORDER BY first_seen, roles.key", bands).fetchall()
+        for row in candidates:
+            stored = dict(row)
+            if stored["key"] == key:
+                continue
+            reason = dedup.duplicate_reason(stored, role)
+            if reason:
+                return stored, reason
+        return None
+
+    def reindex(self) -> int:
+        """Recompute every role's job ID and title bands (after a dedup.INDEX_VERSION change); returns rows."""
+        with self._lock, self.conn:
+            rows = self.conn.execute("SELECT key, company, title, url FROM roles").fetchall()
+            self.conn.executemany("UPDATE roles SET job_id = ? WHERE key = ?",
+                                  [(dedup.canonical_job_id(url), key) for key, _, _, url in rows])
+            self.conn.execute("DELETE FROM title_bands")
+            self.conn.executemany("INSERT OR IGNORE INTO title_bands (band, key) VALUES (?, ?)",
+                                  self._band_rows((key, company, title) for key, company, title, _ in rows))
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                              ("dedup_index", dedup.INDEX_VERSION))
+        return len(rows)
+
+    def _band_company(self, key: str, company: str) -> str:
+        """The canonical company a role's title bands are scoped to; the key prefix if it has no company."""
+        if not company:
+            return dedup.company_of(key)
+        if self.company_index is None:
+            self.company_index = default_company_index()
+        return self.company_index.canonical_key(company)
+
+    def _band_rows(self, rows) -> list:
+        """(band, key) rows for (key, company, title) triples."""
+        return [(band, key) for key, company, title in rows
+                for band in dedup.band_keys(self._band_company(key, company), dedup.title_tokens(title))]
+
+    def roles(self, since: str = None, limit: int = None) -> list:
+        """Stored roles as dicts (with their key), newest first_seen first."""
+        query = "SELECT * FROM roles"
+        params = []
+        if since:
+            query += " WHERE first_seen >= ?"
+            params.append(since)
+        query += " ORDER BY first_seen DESC, key"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def titles(self) -> list:
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT title FROM roles WHERE title IS NOT NULL")]
+
+    def migrate_json(self, path: Path) -> int:
+        """Import a seen_roles.json registry in one transaction and record it; returns roles added."""
+        with open(path) as f:
+            registry = json.load(f)
+        added = self.add_roles(registry)
+        self._set_meta("migrated_from", json.dumps({"file": Path(path).name, "date": today(),
+                                                    "roles": len(registry), "added": added}))
+        return added
+
+    def import_export(self, path: Path = ROLE_EXPORT_PATH) -> int:
+        """Load a roles.jsonl export (keeping rows already stored); returns roles added.
+
+        If the store then holds exactly the export's roles, later exports
+        append to the file; otherwise the next export rewrites it.
+        """
+        roles = exported_roles(path)
+        added = self.add_roles(roles)
+        with self._lock:
+            count, last = self.conn.execute("SELECT COUNT(*), MAX(rowid) FROM roles").fetchone()
+        self._set_meta("export_rowid", str(last or 0) if count == len(roles) else "")
+        self._set_meta("export_sha256", _file_sha256(path))
+        return added
+
+    def export(self, path: Path = ROLE_EXPORT_PATH) -> int:
+        """Bring a roles.jsonl export up to date; returns the roles written.
+
+        If the file is the one this store last wrote or loaded, only the rows
+        stored since are appended. Otherwise (no file yet, or one the store
+        doesn't match) it is rewritten whole. Either way roles are written in
+        the order they were stored.
+        """
+        path = Path(path)
+        exported_rowid = self.meta("export_rowid")
+        append = bool(exported_rowid) and path.exists() and self.meta("export_sha256") == _file_sha256(path)
+        query = "SELECT rowid, * FROM roles" + (" WHERE rowid > ?" if append else "") + " ORDER BY rowid"
+        with self._lock:
+            rows = self.conn.execute(query, (int(exported_rowid),) if append else ()).fetchall()
+        lines = [json.dumps({field: row[field] for field in ("key", *ROLE_FIELDS)}, ensure_ascii=False) + "\n"
+                 for row in rows]
+        target = path if append else path.with_name(path.name + ".tmp")
+        with open(target, "a" if append else "w") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if not append:
+            os.replace(target, path)
+        last = rows[-1]["rowid"] if rows else (int(exported_rowid) if append else 0)
+        self._set_meta("export_rowid", str(last))
+        self._set_meta("export_sha256", _file_sha256(path))
+        return len(rows)
+
+
+def exported_roles(path: Path = ROLE_EXPORT_PATH) -> dict:
+    """{key: {company, title, url, segment, first_seen}} from a roles.jsonl export; {} if there is none."""
+    roles = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # blank, or torn by a crash mid-append (the next export rewrites it)
+                roles[entry.pop("key")] = entry
+    except FileNotFoundError:
+        pass
+    return roles
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the seen-roles store")
+    parser.add_argument("--recent", type=int, default=10, help="How many of the most recently seen roles to list (default: 10)")
+    parser.add_argument("--migrate", type=str, metavar="JSON", help="Import a seen_roles.json registry (again)")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="List stored roles that are near-duplicates of a role seen earlier")
+    args = parser.parse_args()
+
+    with RoleStore.open_for_write() as store:
+        if args.migrate:
+            added = store.migrate_json(Path(args.migrate))
+            print(f"Imported {added} new roles from {args.migrate}")
+            if added:
+                store.export()
+        migrated = store.meta("migrated_from")
+        print(f"{len(store)} roles in {store.path}")
+        if migrated:
+            info = json.loads(migrated)
+            print(f"  Migrated from {info['file']} on {info['date']} ({info['added']} of {info['roles']} roles added)")
+        recent = store.roles(limit=args.recent)
+        if recent:
+            print(f"\nMost recently first seen:")
+            for role in recent:
+                print(f"  {role['first_seen']}  {role['company']} — {role['title']}")
+        if args.duplicates:
+            print(f"\nNear-duplicates of earlier roles:")
+            for role in reversed(store.roles()):
+                match = store.find_duplicate(role["key"], role)
+                if match and (match[0]["first_seen"], match[0]["key"]) < (role["first_seen"], role["key"]):
+                    print(f"  {role['first_seen']}  {role['company']} — {role['title']}")
+                    print(f"      = {match[0]['first_seen']}  {match[0]['title']} ({match[1]})")
+
+
+if __name__ == "__main__":
+    main()
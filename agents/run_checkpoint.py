@@ -0,0 +1,104 @@
+"""
+Crash-safe progress for long agent runs.
+
+While a run is in progress, every finished unit of work (one search query
+for agent 3) is appended to a JSONL stream under data/checkpoints/: its log
+entry first, then each role it found, each line flushed and fsynced. A small
+checkpoint file lists the completed units and is replaced atomically after
+each one, so it never names a unit whose lines aren't fully in the stream.
+
+On resume, completed units are skipped and their roles and log entries are
+read back from the stream; anything written for a unit that never made it
+into the checkpoint (a crash mid-unit) is ignored and that unit reruns.
+Both files are removed once the run's results are saved.
+"""
+
+import json
+import os
+
+from agents.utils import DATA_DIR, today, write_json_atomic
+
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+
+
+class RunCheckpoint:
+    """JSONL stream plus completed-unit checkpoint for one agent's run on one date."""
+
+    def __init__(self, agent_name: str, date: str = None, checkpoint_dir=CHECKPOINT_DIR):
+        self.date = date or today()
+        self.stream_path = checkpoint_dir / f"{agent_name}_{self.date}.jsonl"
+        self.checkpoint_path = checkpoint_dir / f"{agent_name}_{self.date}.checkpoint.json"
+        self.completed = []
+        self._stream = None
+
+    def exists(self) -> bool:
+        return self.checkpoint_path.exists()
+
+    def start(self, resume: bool = False) -> tuple:
+        """Open the stream; returns (completed unit ids, roles, log entries) to resume from.
+
+        Without resume (or with nothing to resume), any previous stream for
+        this date is discarded and everything comes back empty.
+        """
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        records = []
+        if resume and self.exists():
+            with open(self.checkpoint_path) as f:
+                self.completed = json.load(f).get("completed", [])
+            records = self._read_stream(set(self.completed))
+        else:
+            self.completed = []
+            if self.exists():
+                self.checkpoint_path.unlink()
+        self._rewrite_stream(records)
+        roles = [r["role"] for r in records if r["type"] == "role"]
+        entries = [r["entry"] for r in records if r["type"] == "entry"]
+        return list(self.completed), roles, entries
+
+    def _read_stream(self, completed: set) -> list:
+        """Stream records that belong to completed units, in write order."""
+        records = []
+        if not self.stream_path.exists():
+            return records
+        with open(self.stream_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+                if record.get("unit") in completed and record.get("type") in ("entry", "role"):
+                    records.append(record)
+        return records
+
+    def _rewrite_stream(self, records: list):
+        """Start the stream over with only what belongs to completed units."""
+        tmp = self.stream_path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp, self.stream_path)
+        self._stream = open(self.stream_path, "a")
+
+    def record(self, unit: str, entry: dict, roles: list):
+        """Append one finished unit's log entry and roles, then mark it completed."""
+        lines = [json.dumps({"type": "entry", "unit": unit, "entry": entry})]
+        lines += [json.dumps({"type": "role", "unit": unit, "role": role}) for role in roles]
+        self._stream.write("\n".join(lines) + "\n")
+        self._stream.flush()
+        os.fsync(self._stream.fileno())
+        self.completed.append(unit)
+        write_json_atomic(self.checkpoint_path, {"date": self.date, "completed": self.completed})
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+    def discard(self):
+        """Remove the stream and checkpoint (the run's results are safely saved)."""
+        self.close()
+        for path in (self.stream_path, self.checkpoint_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Run telemetry: one JSON line per API call, browser query and orchestrator stage.
+
+Records are appended to data/metrics/{date}.jsonl as they happen, so a run
+that crashes still leaves its timings behind. Every record carries the run
+id of the process that wrote it, its kind ("api", "query", "stage", or
+"cache" for the HTTP cache's end-of-run counts), a
+name ("agent2.batch", "agent3.playwright", "orchestrator.merge"), its
+duration, and whatever the caller knows: token counts including prompt-cache
+reads and writes, retries, stop reason, error.
+
+The report reads the last N days of records and prints p50/p95 latency per
+(kind, name), tokens and estimated cost per run, and HTTP cache hit rates.
+
+Metrics are not committed (data/metrics/ is gitignored). The scheduled
+workflow keeps the history in the Actions cache, uploads each run's files
+as an artifact, and runs --prune, which deletes daily files older than
+METRICS_RETENTION_DAYS so the history stays bounded.
+
+Usage:
+    python -m agents.telemetry                 # last 14 days
+    python -m agents.telemetry --days 30
+    python -m agents.telemetry --kind api
+    python -m agents.telemetry --prune         # drop files past retention, then report
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from agents.utils import DATA_DIR, today
+
+METRICS_DIR = DATA_DIR / "metrics"
+METRICS_RETENTION_DAYS = 60
+
+# One id per process; the orchestrator and any agent it runs share it
+RUN_ID = datetime.now().strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+
+# USD per million tokens (Claude Sonnet 4.5 list prices)
+TOKEN_PRICES = {
+    "input": 3.00,
+    "output": 15.00,
+    "cache_write": 3.75,
+    "cache_read": 0.30,
+}
+WEB_SEARCH_PRICE = 10.00 / 1000  # USD per web search
+BATCH_DISCOUNT = 0.5  # Message Batches bill tokens at half price
+
+_lock = threading.Lock()
+
+
+def token_cost(tokens: dict) -> float:
+    """Estimated USD cost of a usage_counts() dict."""
+    return sum(tokens.get(kind, 0) * price for kind, price in TOKEN_PRICES.items()) / 1_000_000
+
+
+def record(kind: str, name: str, duration_ms: float = None, **fields) -> dict:
+    """Append one metrics record; never raises, so telemetry can't break a run."""
+    entry = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "run": RUN_ID,
+        "kind": kind,
+        "name": name,
+    }
+    if duration_ms is not None:
+        entry["duration_ms"] = round(duration_ms, 1)
+    entry.update(fields)
+    try:
+        line = json.dumps(entry, default=str)
+        with _lock:
+            METRICS_DIR.mkdir(parents=True, exist_ok=True)
+            with open(METRICS_DIR / f"{today()}.jsonl", "a") as f:
+                f.write(line + "\n")
+    except (OSError, TypeError, ValueError) as e:
+        print(f"  Telemetry write failed: {type(e).__name__}: {e}")
+    return entry
+
+
+@contextmanager
+def span(kind: str, name: str, **fields):
+    """Time the block and record it; yields a dict the block can add fields to.
+
+    An exception escaping the block is recorded as the error and re-raised.
+    """
+    extra = dict(fields)
+    t0 = time.perf_counter()
+    try:
+        yield extra
+    except BaseException as e:
+        extra["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record(kind, name, (time.perf_counter() - t0) * 1000, **extra)
+
+
+def load_records(days: int = 14) -> list:
+    """Records from the last `days` daily files, oldest first."""
+    records = []
+    start = datetime.now().date() - timedelta(days=days - 1)
+    for path in sorted(METRICS_DIR.glob("*.jsonl")):
+        try:
+            if datetime.strptime(path.stem, "%Y-%m-%d").date() < start:
+                continue
+        except ValueError:
+            continue
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+    return records
+
+
+def prune(retention_days: int = METRICS_RETENTION_DAYS) -> list:
+    """Delete daily metrics files older than retention_days; returns the names removed."""
+    cutoff = datetime.now().date() - timedelta(days=retention_days - 1)
+    removed = []
+    for path in sorted(METRICS_DIR.glob("*.jsonl")):
+        try:
+            if datetime.strptime(path.stem, "%Y-%m-%d").date() >= cutoff:
+                continue
+        except ValueError:
+            continue
+        path.unlink()
+        removed.append(path.name)
+    return removed
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def latency_table(records: list) -> list:
+    """Per (kind, name): count, p50/p95/max duration, errors, retries."""
+    groups = {}
+    for r in records:
+        groups.setdefault((r["kind"], r["name"]), []).append(r)
+    rows = []
+    for (kind, name), group in sorted(groups.items()):
+        durations = [r["duration_ms"] for r in group if r.get("duration_ms") is not None]
+        rows.append({
+            "kind": kind,
+            "name": name,
+            "count": len(group),
+            "p50_ms": percentile(durations, 50) if durations else None,
+            "p95_ms": percentile(durations, 95) if durations else None,
+            "max_ms": max(durations) if durations else None,
+            "errors": sum(1 for r in group if r.get("error")),
+            "retries": sum(r.get("retries", 0) for r in group),
+        })
+    return rows
+
+
+def run_table(records: list) -> list:
+    """Per run: date, API calls, token totals, cache hit share, estimated cost (tokens + web searches)."""
+    runs = {}
+    for r in records:
+        run = runs.setdefault(r["run"], {
+            "run": r["run"], "date": r["ts"][:10], "calls": 0, "web_searches": 0, "token_cost": 0.0,
+            "tokens": {kind: 0 for kind in TOKEN_PRICES},
+        })
+        if r["kind"] == "api":
+            tokens = r.get("tokens") or {}
+            run["calls"] += r.get("requests", 1)
+            run["web_searches"] += r.get("web_searches", 0)
+            run["token_cost"] += token_cost(tokens) * (BATCH_DISCOUNT if r.get("batch") else 1.0)
+            for kind in TOKEN_PRICES:
+                run["tokens"][kind] += tokens.get(kind, 0)
+    rows = []
+    for run in runs.values():
+        if not run["calls"]:
+            continue
+        tokens = run["tokens"]
+        prompt = tokens["input"] + tokens["cache_read"] + tokens["cache_write"]
+        run["cache_hit_pct"] = round(100 * tokens["cache_read"] / prompt, 1) if prompt else 0.0
+        run["cost_usd"] = round(run.pop("token_cost") + run["web_searches"] * WEB_SEARCH_PRICE, 3)
+        rows.append(run)
+    return sorted(rows, key=lambda r: r["run"])
+
+
+def cache_table(records: list) -> list:
+    """Per run: HTTP cache requests, revalidated hits, hit rate and bytes not re-downloaded."""
+    runs = {}
+    for r in records:
+        if r["kind"] != "cache":
+            continue
+        run = runs.setdefault(r["run"], {"run": r["run"], "date": r["ts"][:10], "requests": 0, "hits": 0,
+                                         "bytes_saved": 0, "entries": 0})
+        run["requests"] = max(run["requests"], r.get("requests", 0))  # counts are cumulative per process
+        run["hits"] = max(run["hits"], r.get("hits", 0))
+        run["bytes_saved"] = max(run["bytes_saved"], r.get("bytes_saved", 0))
+        run["entries"] = r.get("entries", run["entries"])
+    for run in runs.values():
+        run["hit_pct"] = round(100 * run["hits"] / run["requests"], 1) if run["requests"] else 0.0
+    return sorted(runs.values(), key=lambda r: r["run"])
+
+
+def _fmt_ms(ms) -> str:
+    if ms is None:
+        return "-"
+    return f"{ms / 1000:.1f}s" if ms >= 1000 else f"{ms:.0f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report latency and token cost from run telemetry")
+    parser.add_argument("--days", type=int, default=14, help="How many days of metrics to read (default: 14)")
+    parser.add_argument("--kind", choices=["api", "query", "stage", "cache"], help="Only report this kind of record")
+    parser.add_argument("--prune", action="store_true",
+                        help="First delete daily files older than --retention-days")
+    parser.add_argument("--retention-days", type=int, default=METRICS_RETENTION_DAYS,
+                        help=f"Days of metrics --prune keeps (default: {METRICS_RETENTION_DAYS})")
+    args = parser.parse_args()
+
+    if args.prune:
+        removed = prune(args.retention_days)
+        print(f"Pruned {len(removed)} metrics files older than {args.retention_days} days")
+
+    records = load_records(args.days)
+    if args.kind:
+        records = [r for r in records if r["kind"] == args.kind]
+    if not records:
+        print(f"No metrics in {METRICS_DIR} for the last {args.days} days")
+        return
+
+    print(f"{len(records)} records from the last {args.days} days\n")
+    print(f"  {'Kind':<6} {'Name':<28} {'Count':>6} {'p50':>8} {'p95':>8} {'Max':>8} {'Errors':>7} {'Retries':>8}")
+    for row in latency_table(records):
+        print(f"  {row['kind']:<6} {row['name']:<28} {row['count']:>6} {_fmt_ms(row['p50_ms']):>8} "
+              f"{_fmt_ms(row['p95_ms']):>8} {_fmt_ms(row['max_ms']):>8} {row['errors']:>7} {row['retries']:>8}")
+
+    runs = run_table(records)
+    if runs:
+        print(f"\n  {'Date':<11} {'Run':<24} {'Calls':>6} {'Input':>9} {'Output':>8} {'Cache rd':>9} "
+              f"{'Cache wr':>9} {'Hit %':>6} {'Searches':>9} {'Cost':>8}")
+        for run in runs:
+            t = run["tokens"]
+            print(f"  {run['date']:<11} {run['run']:<24} {run['calls']:>6} {t['input']:>9} {t['output']:>8} "
+                  f"{t['cache_read']:>9} {t['cache_write']:>9} {run['cache_hit_pct']:>6} {run['web_searches']:>9} {'$' + format(run['cost_usd'], '.3f'):>8}")
+        total = sum(run["cost_usd"] for run in runs)
+        print(f"\n  Estimated cost: ${total:.2f} over {len(runs)} runs (${total / len(runs):.2f} per run)")
+
+    caches = cache_table(records)
+    if caches:
+        print(f"\n  {'Date':<11} {'Run':<24} {'HTTP reqs':>10} {'304s':>6} {'Hit %':>6} {'Saved':>9} {'Entries':>8}")
+        for run in caches:
+            print(f"  {run['date']:<11} {run['run']:<24} {run['requests']:>10} {run['hits']:>6} {run['hit_pct']:>6} "
+                  f"{str(round(run['bytes_saved'] / 1000)) + ' KB':>9} {run['entries']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Title filters for GTM leadership roles.
+
+Each keyword list and each set of strict regex patterns is compiled once
+into a single alternation, so a filter is one precompiled search instead of
+a Python loop of substring tests or re.search calls with pattern strings.
+classify_title answers every filter (seniority / function / exclusion
+keywords, the strict patterns used for company-targeted searches, and
+wealth-management signals) for one title, and is memoized since the same
+titles recur across queries.
+
+The CLI checks the classifier against the original keyword loops on every
+saved title and times both: once per distinct title with a cold cache, and
+over a run-shaped workload in which each title comes back several times.
+
+Usage:
+    python -m agents.title_filters            # verify and benchmark against the keyword loops on saved results
+    python -m agents.title_filters --repeat 50
+"""
+
+import argparse
+import glob
+import json
+import re
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from agents.utils import RESULTS_DIR
+
+# Seniority keywords to filter relevant roles
+SENIORITY_KEYWORDS = [
+    "director", "senior director", "vp", "vice president", "svp",
+    "head of", "chief", "cro", "coo", "managing director", "general manager",
+]
+
+# Function keywords to filter relevant roles
+FUNCTION_KEYWORDS = [
+    "sales", "revenue", "partnerships", "business development", "gtm",
+    "go-to-market", "client", "relationship", "consulting", "advisory",
+    "commercial", "growth", "channel", "strategic alliances", "enterprise",
+]
+
+# Exclude these
+EXCLUDE_KEYWORDS = [
+    "engineer", "developer", "product manager", "designer", "data scientist",
+    "marketing manager", "content", "compliance", "legal", "hr ", "human resources",
+    "accounting", "finance manager", "operations manager",
+]
+
+# Title signals that a role needs wealth management domain expertise
+WEALTH_SIGNAL_KEYWORDS = [
+    "wealth", "financial advisor", "ria", "registered investment",
+    "asset management", "investment", "portfolio", "fiduciary",
+]
+
+# Strict regex patterns for title validation (used for company-targeted searches)
+VALID_TITLE_PATTERNS = [
+    r'\b(VP|Vice President|Director|Senior Director|Head of|Chief|SVP|EVP|Managing Director)\b',
+]
+
+VALID_FUNCTION_PATTERNS = [
+    r'\b(Sales|Revenue|GTM|Go.to.Market|Partnerships?|Strategic Alliances?|'
+    r'Business Development|Channel|Client Success|Client Relations|'
+    r'Relationship Management|Consulting|Advisory)\b',
+]
+
+EXCLUDE_TITLE_PATTERNS = [
+    r'\b(Engineer|Product Manager|Design|Data Scientist|Marketing Manager|'
+    r'Content|Compliance|Legal|Finance Director|HR|People|Talent|'
+    r'Operations Manager|IT Director|CTO|CPO|CMO)\b',
+]
+
+
+def _keyword_regex(keywords: list) -> re.Pattern:
+    """One alternation of literal keywords; a search hits iff any keyword is a substring."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def _pattern_regex(patterns: list) -> re.Pattern:
+    """The strict patterns joined into one alternation, lowercased for the casefolded title.
+
+    Matching a lowercase pattern against the casefolded title gives the same
+    answers as re.IGNORECASE on the original (casefold, unlike lower, also
+    folds "ſ" to "s", as IGNORECASE does) and is 1.5-2.5x faster; the
+    patterns must not use uppercase escapes (\\B, \\W, ...), which lowercasing
+    would change.
+    """
+    for p in patterns:
+        if re.search(r"\\[A-Z]", p):
+            raise ValueError(f"title pattern uses an uppercase escape: {p!r}")
+    return re.compile("|".join(f"(?:{p.lower()})" for p in patterns))
+
+
+# One precompiled search per filter: keywords on the lowercased title, the
+# strict patterns on the casefolded one.
+_SENIORITY = _keyword_regex(SENIORITY_KEYWORDS)
+_FUNCTION = _keyword_regex(FUNCTION_KEYWORDS)
+_EXCLUDED = _keyword_regex(EXCLUDE_KEYWORDS)
+_WEALTH = _keyword_regex(WEALTH_SIGNAL_KEYWORDS)
+_STRICT_SENIORITY = _pattern_regex(VALID_TITLE_PATTERNS)
+_STRICT_FUNCTION = _pattern_regex(VALID_FUNCTION_PATTERNS)
+_STRICT_EXCLUDED = _pattern_regex(EXCLUDE_TITLE_PATTERNS)
+
+
+class TitleClass(NamedTuple):
+    """Which title filters a job title hits."""
+    seniority: bool
+    function: bool
+    excluded: bool
+    wealth: bool
+    strict_seniority: bool
+    strict_function: bool
+    strict_excluded: bool
+
+    @property
+    def matches_criteria(self) -> bool:
+        return self.seniority and self.function and not self.excluded
+
+    @property
+    def is_relevant_title(self) -> bool:
+        return self.strict_seniority and self.strict_function and not self.strict_excluded
+
+
+@lru_cache(maxsize=8192)
+def classify_title(title: str) -> TitleClass:
+    """Run every title filter over one title, one precompiled search per filter."""
+    lower = title.lower()
+    folded = title.casefold()
+    return TitleClass(
+        seniority=_SENIORITY.search(lower) is not None,
+        function=_FUNCTION.search(lower) is not None,
+        excluded=_EXCLUDED.search(lower) is not None,
+        wealth=_WEALTH.search(lower) is not None,
+        strict_seniority=_STRICT_SENIORITY.search(folded) is not None,
+        strict_function=_STRICT_FUNCTION.search(folded) is not None,
+        strict_excluded=_STRICT_EXCLUDED.search(folded) is not None,
+    )
+
+
+def classify_titles(titles) -> list:
+    """Classify a batch of titles; returns one TitleClass per title, in order."""
+    return [classify_title(t) for t in titles]
+
+
+def matches_criteria(title: str) -> bool:
+    """Check if a job title matches GTM leadership criteria."""
+    return classify_title(title).matches_criteria
+
+
+def is_relevant_title(title: str) -> bool:
+    """Check if title matches GTM leadership criteria using strict regex patterns.
+
+    Used for company-targeted searches where we need tighter filtering
+    since all results are from a known company.
+    """
+    return classify_title(title).is_relevant_title
+
+
+def is_wealth_experience_relevant(title: str) -> bool:
+    """Check if a job title/context indicates wealth management experience is required.
+
+    Used for the broader tech-company queries where the company itself may not
+    be fintech but the role requires wealth management domain expertise.
+    """
+    return classify_title(title).wealth
+
+
+# ── Verification against the original keyword-loop filters ──
+
+def _loop_matches_criteria(title: str) -> bool:
+    title_lower = title.lower()
+    return (any(kw in title_lower for kw in SENIORITY_KEYWORDS)
+            and any(kw in title_lower for kw in FUNCTION_KEYWORDS)
+            and not any(kw in title_lower for kw in EXCLUDE_KEYWORDS))
+
+
+def _loop_is_relevant_title(title: str) -> bool:
+    has_seniority = any(re.search(p, title, re.IGNORECASE) for p in VALID_TITLE_PATTERNS)
+    has_function = any(re.search(p, title, re.IGNORECASE) for p in VALID_FUNCTION_PATTERNS)
+    is_excluded = any(re.search(p, title, re.IGNORECASE) for p in EXCLUDE_TITLE_PATTERNS)
+    return has_seniority and has_function and not is_excluded
+
+
+def _loop_is_wealth_experience_relevant(title: str) -> bool:
+    title_lower = title.lower()
+    return any(kw in title_lower for kw in WEALTH_SIGNAL_KEYWORDS)
+
+
+def historical_titles() -> list:
+    """Every distinct role title in saved agent results and the seen-roles registry (read-only)."""
+    titles = set()
+    for path in glob.glob(str(RESULTS_DIR / "*_*.json")):
+        with open(path) as f:
+            data = json.load(f)
+        roles = data.get("roles", []) if isinstance(data, dict) else []
+        titles.update(r["title"] for r in roles if isinstance(r, dict) and r.get("title"))
+    from agents.role_store import ROLE_STORE_PATH, RoleStore, exported_roles
+
+    titles.update(r["title"] for r in exported_roles().values() if r.get("title"))
+    if ROLE_STORE_PATH.exists():  # roles a local run stored but hasn't exported
+        with RoleStore(ROLE_STORE_PATH, readonly=True) as store:
+            titles.update(store.titles())
+    return sorted(titles)
+
+
+# Times a title is screened in a run: the same cards come back from several queries
+RUN_REPEATS = 5
+
+
+def _loop_classify(titles) -> list:
+    return [(_loop_matches_criteria(t), _loop_is_relevant_title(t), _loop_is_wealth_experience_relevant(t))
+            for t in titles]
+
+
+def _compiled_classify(titles) -> list:
+    return [(c.matches_criteria, c.is_relevant_title, c.wealth) for c in classify_titles(titles)]
+
+
+def _best_ms(fn, titles, repeat: int, cold: bool = True) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            classify_title.cache_clear()
+        t0 = time.perf_counter()
+        fn(titles)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def verify(titles: list, repeat: int = 20) -> int:
+    """Compare the compiled classifier with the keyword loops and time both; returns the mismatch count."""
+    expected = _loop_classify(titles)
+    classify_title.cache_clear()
+    actual = _compiled_classify(titles)
+    mismatches = [(t, e, a) for t, e, a in zip(titles, expected, actual) if e != a]
+
+    run = titles * RUN_REPEATS
+    loop_ms = _best_ms(_loop_classify, titles, repeat)
+    compiled_ms = _best_ms(_compiled_classify, titles, repeat)
+    loop_run_ms = _best_ms(_loop_classify, run, repeat)
+    compiled_run_ms = _best_ms(_compiled_classify, run, repeat)
+    print(f"Titles checked: {len(titles)}")
+    print(f"Distinct titles, cold cache:  keyword loops {loop_ms:.1f}ms, compiled {compiled_ms:.1f}ms "
+          f"({loop_ms / compiled_ms:.1f}x)")
+    print(f"Run-shaped ({RUN_REPEATS}x each):     keyword loops {loop_run_ms:.1f}ms, compiled {compiled_run_ms:.1f}ms "
+          f"({loop_run_ms / compiled_run_ms:.1f}x)  best of {repeat}")
+    print(f"Mismatches: {len(mismatches)}")
+    for title, e, a in mismatches[:20]:
+        print(f"  {title!r}: loops={e} compiled={a}")
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and benchmark the compiled title classifier against saved results")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing runs per measurement, fastest kept (default: 20)")
+    args = parser.parse_args()
+
+    if verify(historical_titles(), args.repeat):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,13 @@ import json
 import os
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-from dotenv import load_dotenv
+from agents.json_stream import scan_json
 
 # Resolve paths relative to the repo root (one level up from agents/)
 REPO_ROOT = Path(__file__).resolve().parent.parent
-
-# Load .env from repo root
-load_dotenv(REPO_ROOT / ".env")
 PROMPTS_DIR = REPO_ROOT / "prompts"
 DATA_DIR = REPO_ROOT / "data"
 RESULTS_DIR = DATA_DIR / "results"
@@ -20,7 +18,23 @@ RESULTS_DIR = DATA_DIR / "results"
 MODEL = "claude-sonnet-4-5-20250929"
 MODEL_RESEARCH = "claude-sonnet-4-5-20250929"
 MAX_TOKENS = 16_000
-BACKOFF_DELAYS = [2, 4, 8, 16]
+
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load .env from the repo root into os.environ, once; call before reading API keys.
+
+    Not done at import, so dry runs and merge-only runs never import
+    python-dotenv. Variables already set in the environment win. Settings
+    read when a module is imported (LINKEDIN_BASE_URL, ATS_BASE_URL,
+    AGENT3_PERSISTENT_PROFILE) must come from the real environment.
+    """
+    env_file = REPO_ROOT / ".env"
+    if not env_file.is_file():
+        return False
+    from dotenv import load_dotenv
+
+    return load_dotenv(env_file)
 
 
 def today() -> str:
@@ -38,34 +52,71 @@ def read_skill() -> str:
     return read_prompt("skill.md")
 
 
-def extract_json(text: str):
-    """Extract JSON from Claude's response text. Returns parsed JSON or None."""
-    # 1. Direct parse
-    try:
-        return json.loads(text)
-    except (json.JSONDecodeError, TypeError):
-        pass
+# Shared by every agent that searches, so the tools part of the prompt-cache
+# prefix is byte-identical across agents and runs
+WEB_SEARCH_TOOL = {
+    "type": "web_search_20250305",
+    "name": "web_search",
+    "max_uses": 20,
+}
+
+
+def build_system_blocks(agent_prompt: str) -> list:
+    """System prompt as content blocks: the shared skill first, marked for caching, then the agent prompt.
+
+    The skill block is the same text for every agent, so one cache entry
+    covers agents 1 and 2 and repeated calls within a run. Anything that
+    varies (agent prompt, dates, company lists) must come after it.
+    """
+    return [
+        {
+            "type": "text",
+            "text": f"## Skill Reference\n\n{read_skill()}",
+            "cache_control": {"type": "ephemeral"},
+        },
+        {
+            "type": "text",
+            "text": f"---\n\n{agent_prompt}",
+        },
+    ]
 
-    # 2. Strip markdown code fences
-    import re
-    fence_match = re.search(r'```(?:json)?\s*\n?([\s\S]*?)\n?\s*```', text)
-    if fence_match:
-        try:
-            return json.loads(fence_match.group(1))
-        except (json.JSONDecodeError, TypeError):
-            pass
 
-    # 3. Find first { or [ ... last } or ]
-    for open_char, close_char in [('{', '}'), ('[', ']')]:
-        start = text.find(open_char)
-        end = text.rfind(close_char)
-        if start != -1 and end > start:
-            try:
-                return json.loads(text[start:end + 1])
-            except (json.JSONDecodeError, TypeError):
-                pass
+def usage_counts(usage) -> dict:
+    """Token counts from a response's usage, including prompt-cache reads and writes."""
+    return {
+        "input": usage.input_tokens or 0,
+        "output": usage.output_tokens or 0,
+        "cache_read": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
 
-    return None
+
+def format_usage(counts: dict) -> str:
+    return (f"input: {counts['input']}, output: {counts['output']}, "
+            f"cache read: {counts['cache_read']}, cache write: {counts['cache_write']}")
+
+
+def extract_json(text: str, report: dict = None):
+    """Extract JSON from Claude's response text. Returns parsed JSON or None.
+
+    A response cut off mid-JSON yields every element that was complete (see
+    json_stream.scan_json); pass report to learn whether that happened and
+    what was dropped.
+    """
+    value, details = scan_json(text)
+    if report is not None:
+        report.update(details)
+    return value
+
+
+def write_json_atomic(path: Path, data, indent: int = None):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 
 def save_results(agent_name: str, data, date: str = None):
@@ -74,8 +125,7 @@ def save_results(agent_name: str, data, date: str = None):
     date = date or today()
     filename = f"{agent_name}_{date}.json"
     path = RESULTS_DIR / filename
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    write_json_atomic(path, data, indent=2)
     print(f"Results saved to {path}")
     return path
 
@@ -91,20 +141,113 @@ def load_results(agent_name: str, date: str = None):
         return json.load(f)
 
 
-def call_with_retry(client, create_kwargs: dict, max_retries: int = 4):
-    """Call client.messages.create with exponential backoff on rate limits."""
+def record_api_call(metric: str, create_kwargs: dict, t0: float, retries: int,
+                    response=None, error: Exception = None, **fields):
+    """Write one telemetry record for a Claude call (see agents.telemetry)."""
+    from agents.telemetry import record
+
+    if response is not None:
+        fields["tokens"] = usage_counts(response.usage)
+        fields["stop_reason"] = response.stop_reason
+        server_tools = getattr(response.usage, "server_tool_use", None)
+        if server_tools is not None:
+            fields["web_searches"] = getattr(server_tools, "web_search_requests", 0) or 0
+    if error is not None:
+        fields["error"] = f"{type(error).__name__}: {error}"
+    record("api", metric or "api", (time.perf_counter() - t0) * 1000,
+           model=create_kwargs.get("model"), retries=retries, **fields)
+
+
+def make_client():
+    """Anthropic client with the SDK's own retries off; agents.api_scheduler does them."""
+    import anthropic
+
+    load_env()
+    return anthropic.Anthropic(max_retries=0)
+
+
+def call_with_retry(client, create_kwargs: dict, max_retries: int = 4, metric: str = None):
+    """Call client.messages.create once the API scheduler admits it, retrying throttled calls.
+
+    Rate-limit headers from every response and error feed the shared
+    scheduler (agents.api_scheduler), which decides how long to wait. The
+    call (all attempts together) is recorded to telemetry under metric.
+    """
+    from agents.api_scheduler import default_scheduler, estimate_input_tokens
+
+    scheduler = default_scheduler()
+    input_tokens = estimate_input_tokens(create_kwargs)
+    last_error = None
+    t0 = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        scheduler.admit(input_tokens, label=metric or "")
+        try:
+            raw = client.messages.with_raw_response.create(**create_kwargs)
+            scheduler.succeeded(raw.headers)
+            response = raw.parse()
+            record_api_call(metric, create_kwargs, t0, attempt, response)
+            return response
+        except Exception as e:
+            last_error = e
+            delay = scheduler.failed(e, attempt)
+            if delay is not None and attempt < max_retries:
+                print(f"  {type(e).__name__}, retrying in {delay:.0f}s (attempt {attempt + 1}/{max_retries})...")
+                continue
+            record_api_call(metric, create_kwargs, t0, attempt, error=e)
+            raise
+    raise last_error
+
+
+def stream_with_retry(client, create_kwargs: dict, on_item=None, max_retries: int = 4,
+                      metric: str = None) -> tuple:
+    """Stream a Claude response, handing each completed JSON array element to on_item(key, item).
+
+    Returns (response, text, items). items are the (key, item) pairs parsed
+    while streaming (see agents.json_stream), so they survive a response
+    that is cut off; if the stream breaks after items arrived, response is
+    None and the partial text and items are returned instead of raising.
+    Calls go through the API scheduler like call_with_retry, but are only
+    retried before anything was streamed, so on_item never sees an element
+    twice.
+    """
+    from agents.api_scheduler import default_scheduler, estimate_input_tokens
+    from agents.json_stream import JsonItemStream
+
+    scheduler = default_scheduler()
+    input_tokens = estimate_input_tokens(create_kwargs)
     last_error = None
+    t0 = time.perf_counter()
     for attempt in range(max_retries + 1):
+        scheduler.admit(input_tokens, label=metric or "")
+        parser = JsonItemStream(on_item)
+        text_parts = []
         try:
-            return client.messages.create(**create_kwargs)
+            with client.messages.stream(**create_kwargs) as stream:
+                http_response = getattr(stream, "response", None)
+                scheduler.succeeded(getattr(http_response, "headers", None))
+                for event in stream:
+                    if event.type == "content_block_start" and event.content_block.type == "text":
+                        if text_parts:
+                            # Separate text blocks the way collect_text does
+                            text_parts.append("\n")
+                            parser.feed("\n")
+                    elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                        text_parts.append(event.delta.text)
+                        parser.feed(event.delta.text)
+                response = stream.get_final_message()
+            record_api_call(metric, create_kwargs, t0, attempt, response, streamed_items=len(parser.items))
+            return response, "".join(text_parts), parser.items
         except Exception as e:
             last_error = e
-            is_rate_limit = "rate_limit" in str(e).lower() or "429" in str(e)
-            if is_rate_limit and attempt < max_retries:
-                delay = BACKOFF_DELAYS[attempt]
-                print(f"  Rate limited, retrying in {delay}s (attempt {attempt + 1}/{max_retries})...")
-                time.sleep(delay)
+            if parser.items:
+                print(f"  Stream interrupted after {len(parser.items)} items ({type(e).__name__}: {e}) — keeping them")
+                record_api_call(metric, create_kwargs, t0, attempt, error=e, streamed_items=len(parser.items))
+                return None, "".join(text_parts), parser.items
+            delay = scheduler.failed(e, attempt)
+            if delay is not None and attempt < max_retries:
+                print(f"  {type(e).__name__}, retrying in {delay:.0f}s (attempt {attempt + 1}/{max_retries})...")
                 continue
+            record_api_call(metric, create_kwargs, t0, attempt, error=e)
             raise
     raise last_error
 
@@ -10,6 +10,10 @@ Usage:
     python orchestrator.py --dry-run        # No API calls or email
     python orchestrator.py --agent1-only    # Just company research
     python orchestrator.py --skip-agent1    # Use existing Agent 1 results, run 2+3
+    python orchestrator.py --refresh-research   # Rerun Agent 1 even if its cached research is fresh
+    python orchestrator.py --research-ttl 3     # Reuse Agent 1 research for up to 3 days (0 = never)
+    python orchestrator.py --stream         # Stream Agent 1 and 2 responses, parsing results as they arrive
+    python orchestrator.py --batch-api      # Agents 1 and 2 via the Message Batches API (nightly: half price)
     python orchestrator.py --no-email       # Run everything but skip email
 """
 
@@ -22,7 +26,13 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-from agents.utils import DATA_DIR, RESULTS_DIR, save_results, load_results, today
+from agents import telemetry
+from agents.api_scheduler import default_scheduler
+from agents.company_index import CompanyIndex, build_company_index
+from agents.dedup import legacy_role_key, make_role_key, merge_and_dedup
+from agents.research_cache import DEFAULT_TTL_DAYS, cached_research
+from agents.role_store import ROLE_EXPORT_PATH, RoleStore
+from agents.utils import DATA_DIR, RESULTS_DIR, load_env, save_results, load_results, today
 
 
 def find_latest_results(agent_name: str):
@@ -38,71 +48,36 @@ def find_latest_results(agent_name: str):
     return None, None
 
 
-def load_seen_roles() -> dict:
-    """Load the registry of previously seen roles."""
-    path = DATA_DIR / "seen_roles.json"
-    if not path.exists():
-        return {}
-    with open(path) as f:
-        return json.load(f)
-
-
-def save_seen_roles(seen: dict):
-    """Save the updated seen roles registry."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    path = DATA_DIR / "seen_roles.json"
-    with open(path, "w") as f:
-        json.dump(seen, f, indent=2)
-    print(f"Seen roles registry saved ({len(seen)} total roles)")
-
-
-def make_role_key(role: dict) -> str:
-    """Create a dedup key from company + title (normalized)."""
-    company = role.get("company", "").strip().lower()
-    title = role.get("title", "").strip().lower()
-    return f"{company}|{title}"
-
-
-def merge_and_dedup(agent2_roles: list, agent3_roles: list) -> list:
-    """Merge roles from Agent 2 and Agent 3, deduplicating by company+title."""
-    seen_keys = {}
-    merged = []
-
-    for role in agent2_roles + agent3_roles:
-        key = make_role_key(role)
-        if key in seen_keys:
-            # Merge sources
-            existing = merged[seen_keys[key]]
-            existing_source = existing.get("source", "")
-            new_source = role.get("source", "")
-            if new_source and new_source not in existing_source:
-                existing["source"] = f"{existing_source}, {new_source}"
-            # Prefer non-empty fields
-            for field in ["url", "compensation", "datePosted", "location"]:
-                if not existing.get(field) or existing[field] in ("Not disclosed", "Unknown", ""):
-                    if role.get(field) and role[field] not in ("Not disclosed", "Unknown", ""):
-                        existing[field] = role[field]
-        else:
-            seen_keys[key] = len(merged)
-            merged.append(role)
-
-    return merged
+def find_new_roles(merged: list, store: RoleStore, company_index: CompanyIndex = None) -> tuple[list, list, list]:
+    """Split merged roles into new and previously seen.
 
-
-def find_new_roles(merged: list, seen: dict) -> tuple[list, list]:
-    """Split merged roles into new and previously seen."""
+    Exact keys are checked in one indexed lookup for the whole run; roles
+    not known by key are then checked for a stored near-duplicate (same job
+    ID, or a title differing only in level). Returns (new, existing,
+    near-duplicate matches), each match naming the stored title it matched
+    and why.
+    """
     new_roles = []
     existing_roles = []
+    matches = []
 
-    for role in merged:
-        key = make_role_key(role)
-        if key in seen:
+    keys = [(make_role_key(role, company_index), legacy_role_key(role)) for role in merged]
+    known = store.known_keys(k for pair in keys for k in pair)
+    for role, (key, legacy_key) in zip(merged, keys):
+        if key in known or legacy_key in known:
+            existing_roles.append(role)
+            continue
+        duplicate = store.find_duplicate(key, role)
+        if duplicate:
+            stored, reason = duplicate
+            matches.append({"company": role.get("company", ""), "title": role.get("title", ""),
+                            "kept": stored["title"], "first_seen": stored["first_seen"], "reason": reason})
             existing_roles.append(role)
         else:
             role["isNew"] = True
             new_roles.append(role)
 
-    return new_roles, existing_roles
+    return new_roles, existing_roles, matches
 
 
 def _is_startup(stage: str) -> str:
@@ -149,6 +124,7 @@ def update_tracker(new_roles: list, date: str):
 
 def send_email(new_roles: list, date: str):
     """Send email alert via SendGrid with new role findings."""
+    load_env()
     api_key = os.environ.get("SENDGRID_API_KEY")
     from_email = os.environ.get("SENDGRID_FROM_EMAIL")
     to_email_raw = os.environ.get("SENDGRID_TO_EMAIL", "")
@@ -210,22 +186,36 @@ def send_email(new_roles: list, date: str):
         print(f"Email failed: {e}")
 
 
+def run_stage(name: str, fn, **kwargs):
+    """Run one agent as an orchestrator stage, recording its duration and role count."""
+    with telemetry.span("stage", name) as stage:
+        result = fn(**kwargs)
+        stage["roles"] = len(result.get("roles", [])) if isinstance(result, dict) else None
+        return result
+
+
 def run_orchestrator(
     dry_run: bool = False,
     agent1_only: bool = False,
     skip_agent1: bool = False,
     no_email: bool = False,
     merge_only: bool = False,
+    research_ttl: int = DEFAULT_TTL_DAYS,
+    refresh_research: bool = False,
+    stream: bool = False,
+    batch_api: bool = False,
 ):
     date = today()
     print("=" * 60)
     print("MULTI-AGENT JOB SEARCH ORCHESTRATOR")
     print(f"Date: {date}")
-    print(f"Options: dry_run={dry_run}, agent1_only={agent1_only}, skip_agent1={skip_agent1}, no_email={no_email}, merge_only={merge_only}")
+    print(f"Options: dry_run={dry_run}, agent1_only={agent1_only}, skip_agent1={skip_agent1}, no_email={no_email}, "
+          f"merge_only={merge_only}, research_ttl={research_ttl}, refresh_research={refresh_research}, stream={stream}, batch_api={batch_api}")
     print("=" * 60)
 
     # Validate API key early
     if not dry_run and not merge_only:
+        load_env()
         api_key = os.environ.get("ANTHROPIC_API_KEY", "")
         if not api_key:
             print("ERROR: ANTHROPIC_API_KEY is not set. Cannot call Claude API.")
@@ -260,55 +250,50 @@ def run_orchestrator(
         # ── Step 1: Agent 1 — Company Research ──
         from agents.agent1_company_research import run as run_agent1
 
+        # Agents 2 and 3 read today's Agent 1 results unless pointed at another file
+        agent1_file = None
+        cached = None
+        if not skip_agent1 and not refresh_research and not agent1_only:
+            cached = cached_research(research_ttl)
+
         if skip_agent1:
             companies = load_results("agent1") or []
             print(f"\nSkipping Agent 1. Loaded {len(companies)} companies from existing results.")
+        elif cached:
+            companies, agent1_file, research_date = cached
+            print(f"\nReusing Agent 1 research from {research_date}: {len(companies)} companies "
+                  f"from {agent1_file.name} (TTL {research_ttl} days, --refresh-research to rerun)")
         else:
             print("\n── Step 1: Agent 1 — Company Research ──")
-            companies = run_agent1(dry_run=dry_run)
+            with telemetry.span("stage", "orchestrator.agent1", dry_run=dry_run) as stage:
+                companies = run_agent1(dry_run=dry_run, stream=stream, batch_api=batch_api)
+                stage["companies"] = len(companies)
 
         if agent1_only:
             print("\n── Agent 1 only mode — stopping here ──")
             return
 
-        # Wait for rate limit to reset before launching parallel agents
-        if not skip_agent1:
-            print("\n[Orchestrator] Waiting 60s for rate limit reset before launching Agents 2 & 3...")
-            time.sleep(60)
-
         # ── Step 2: Agents 2 & 3 in parallel ──
+        # No cooldown after Agent 1: its calls and Agent 2's share the API
+        # scheduler, which holds Agent 2's requests only as long as the
+        # rate-limit headers from Agent 1's responses say is needed.
         from agents.agent2_career_pages import run as run_agent2
         from agents.agent3_linkedin_search import run as run_agent3
 
-        def run_agent2_with_retry(dry_run=False):
-            """Run Agent 2 with retry logic for rate limits."""
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    return run_agent2(dry_run=dry_run)
-                except Exception as e:
-                    is_rate_limit = "rate_limit" in str(e).lower() or "429" in str(e)
-                    if is_rate_limit and attempt < max_retries - 1:
-                        wait = 30 * (attempt + 1)  # 30s, 60s, 90s
-                        print(f"[Agent 2] Rate limited, waiting {wait}s (attempt {attempt+1}/{max_retries})...")
-                        time.sleep(wait)
-                    else:
-                        print(f"[Agent 2] Failed after {attempt+1} attempts: {e}")
-                        return {"roles": [], "coverage": []}
-            return {"roles": [], "coverage": []}
-
         print("\n── Step 2: Agents 2 & 3 (parallel) ──")
 
         agent2_result = {"roles": [], "coverage": []}
         agent3_result = {"roles": [], "queries_run": []}
 
         if dry_run:
-            run_agent2(dry_run=True)
-            run_agent3(dry_run=True)
+            run_agent2(dry_run=True, input_file=agent1_file, batch_api=batch_api)
+            run_agent3(dry_run=True, input_file=agent1_file)
         else:
             with ThreadPoolExecutor(max_workers=2) as executor:
-                future2 = executor.submit(run_agent2_with_retry, dry_run=False)
-                future3 = executor.submit(run_agent3, dry_run=False)
+                future2 = executor.submit(run_stage, "orchestrator.agent2", run_agent2,
+                                          dry_run=False, input_file=agent1_file, stream=stream, batch_api=batch_api)
+                future3 = executor.submit(run_stage, "orchestrator.agent3", run_agent3,
+                                          dry_run=False, input_file=agent1_file)
 
                 for future in as_completed([future2, future3]):
                     try:
@@ -326,32 +311,42 @@ def run_orchestrator(
 
     # ── Step 3: Merge & Deduplicate ──
     print("\n── Step 3: Merge & Deduplicate ──")
+    merge_t0 = time.perf_counter()
 
     agent2_roles = agent2_result.get("roles", [])
     agent3_roles = agent3_result.get("roles", [])
     print(f"Agent 2 found: {len(agent2_roles)} roles")
     print(f"Agent 3 found: {len(agent3_roles)} roles")
 
-    merged = merge_and_dedup(agent2_roles, agent3_roles)
+    company_index = build_company_index(companies)
+    merged, merges = merge_and_dedup(agent2_roles, agent3_roles, company_index)
     print(f"After dedup: {len(merged)} unique roles")
+    for merge in merges:
+        print(f"  Merged {merge['company']}: {merge['title']!r} into {merge['kept']!r} — {merge['reason']}")
 
     # Check against seen roles
-    seen = load_seen_roles()
-    new_roles, existing_roles = find_new_roles(merged, seen)
-    print(f"New roles: {len(new_roles)}")
-    print(f"Previously seen: {len(existing_roles)}")
-
-    # Update seen roles registry
-    for role in new_roles:
-        key = make_role_key(role)
-        seen[key] = {
-            "company": role.get("company"),
-            "title": role.get("title"),
-            "first_seen": date,
-            "url": role.get("url"),
-            "segment": role.get("segment"),
-        }
-    save_seen_roles(seen)
+    with RoleStore.open_for_write(company_index=company_index) as store:
+        new_roles, existing_roles, matches = find_new_roles(merged, store, company_index)
+        print(f"New roles: {len(new_roles)}")
+        print(f"Previously seen: {len(existing_roles)}")
+        for match in matches:
+            print(f"  Seen {match['first_seen']} as {match['kept']!r}: {match['company']} {match['title']!r} "
+                  f"— {match['reason']}")
+
+        # Update seen roles registry
+        added = store.add_roles({
+            make_role_key(role, company_index): {
+                "company": role.get("company"),
+                "title": role.get("title"),
+                "first_seen": date,
+                "url": role.get("url"),
+                "segment": role.get("segment"),
+            }
+            for role in new_roles
+        })
+        store.export()
+        total_seen = len(store)
+    print(f"Seen roles registry: {added} added ({total_seen} total roles, exported to {ROLE_EXPORT_PATH.name})")
 
     # Update tracker
     if new_roles:
@@ -366,15 +361,19 @@ def run_orchestrator(
         "merged_unique": len(merged),
         "new_roles": len(new_roles),
         "previously_seen": len(existing_roles),
-        "total_seen_all_time": len(seen),
+        "total_seen_all_time": total_seen,
+        "near_duplicates": merges + matches,
         "roles": new_roles,
     }
     save_results("summary", summary)
+    telemetry.record("stage", "orchestrator.merge", (time.perf_counter() - merge_t0) * 1000,
+                     merged=len(merged), new_roles=len(new_roles))
 
     # ── Step 4: Email ──
     if new_roles and not no_email and not dry_run:
         print("\n── Step 4: Email Alert ──")
-        send_email(new_roles, date)
+        with telemetry.span("stage", "orchestrator.email", roles=len(new_roles)):
+            send_email(new_roles, date)
     elif not new_roles:
         print("\nNo new roles found — skipping email.")
     elif no_email:
@@ -406,7 +405,13 @@ def run_orchestrator(
     print(f"  Roles from LinkedIn/boards (Agent 3): {len(agent3_roles)}")
     print(f"  Unique roles after dedup: {len(merged)}")
     print(f"  NEW roles this run: {len(new_roles)}")
-    print(f"  Total roles seen all time: {len(seen)}")
+    print(f"  Total roles seen all time: {total_seen}")
+    api = default_scheduler().summary()
+    if api["admitted"]:
+        print(f"  Claude API calls: {api['admitted']} ({api['retries']} retried, "
+              f"{api['waited_s']:.0f}s held for rate limits)")
+    from agents.http_cache import default_cache
+    default_cache().report("orchestrator")
     print("=" * 60)
 
 
@@ -417,16 +422,27 @@ def main():
     parser.add_argument("--skip-agent1", action="store_true", help="Skip Agent 1, use existing results")
     parser.add_argument("--no-email", action="store_true", help="Run everything but skip email")
     parser.add_argument("--merge-only", action="store_true", help="Skip all agents, merge existing results only")
+    parser.add_argument("--research-ttl", type=int, default=DEFAULT_TTL_DAYS,
+                        help=f"Reuse Agent 1 research for this many days (default: {DEFAULT_TTL_DAYS}, 0 = always rerun)")
+    parser.add_argument("--refresh-research", action="store_true", help="Rerun Agent 1 even if its cached research is fresh")
+    parser.add_argument("--stream", action="store_true", help="Stream Agent 1 and 2 responses and parse results as they arrive")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Run Agents 1 and 2 through the Message Batches API (half price, not interactive)")
     args = parser.parse_args()
 
     try:
-        run_orchestrator(
-            dry_run=args.dry_run,
-            agent1_only=args.agent1_only,
-            skip_agent1=args.skip_agent1,
-            no_email=args.no_email,
-            merge_only=args.merge_only,
-        )
+        with telemetry.span("stage", "orchestrator.run", dry_run=args.dry_run):
+            run_orchestrator(
+                dry_run=args.dry_run,
+                agent1_only=args.agent1_only,
+                skip_agent1=args.skip_agent1,
+                no_email=args.no_email,
+                merge_only=args.merge_only,
+                research_ttl=args.research_ttl,
+                refresh_research=args.refresh_research,
+                stream=args.stream,
+                batch_api=args.batch_api,
+            )
     except Exception as e:
         print("\n" + "=" * 60)
         print("ORCHESTRATOR FAILED")
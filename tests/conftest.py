@@ -0,0 +1,36 @@
+import sys
+import types
+
+import pytest
+
+from tests.stub_servers import base_url, serve
+
+
+class PlaywrightTimeout(Exception):
+    """Stands in for playwright.sync_api.TimeoutError."""
+
+
+@pytest.fixture
+def stub_server():
+    """Start stub handlers on free ports for one test; returns start(handler) -> base URL."""
+    servers = []
+
+    def start(handler) -> str:
+        server = serve(handler)
+        servers.append(server)
+        return base_url(server)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    """A playwright.sync_api with only TimeoutError, for driving agent 3's page code with fake pages."""
+    sync_api = types.ModuleType("playwright.sync_api")
+    sync_api.TimeoutError = PlaywrightTimeout
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", sync_api)
+    return sync_api
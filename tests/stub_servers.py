@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the services the agents call, for tests and offline runs.
+
+  linkedin  LinkedIn's job search pages, served from a recording written by
+            `agent3_linkedin_search --record`:
+              /jobs/search/?keywords=...&location=...          the recorded results page (playwright backend)
+              /jobs-guest/jobs/api/seeMoreJobPostings/search   the same cards as guest-API fragments,
+                  ?keywords=...&location=...&start=N           GUEST_PAGE_SIZE per start offset (http backend)
+            Searches that weren't recorded return an empty result;
+            --guest-status makes the guest endpoint answer with an error
+            code instead, to exercise the Playwright fallback.
+  batches   The Message Batches API: batches posted to /v1/messages/batches
+            stay in progress for --latency seconds, then serve one succeeded
+            result per request, its text from RESPONSES/{custom_id}.txt or
+            --default-text (RESPONSES/{custom_id}.error errors it instead).
+  boards    The Greenhouse, Lever and Ashby listing APIs: BOARDS/{board}/{token}.json
+            for the board's listing path, 404 for a board without a file. Bodies
+            carry an ETag of their content and a matching If-None-Match gets a
+            304, so the HTTP cache's revalidation can be exercised.
+
+All three share StubHandler (keep-alive, quiet logging, one send_body) and
+serve(), which runs a handler on a background thread; port 0 picks a free
+port, as the tests do.
+
+Usage:
+    python -m tests.stub_servers linkedin data/recordings/2026-02-19 --port 8765 --guest-status 429
+    python -m tests.stub_servers batches --port 8766 --responses tmp/batch-responses
+    python -m tests.stub_servers boards --port 8767 --boards tmp/ats-boards
+    python -m agents.agent3_linkedin_search --backend http --base-url http://127.0.0.1:8765
+    ANTHROPIC_BATCH_URL=http://127.0.0.1:8766 python -m agents.agent2_career_pages --batch-api
+    ATS_BASE_URL=http://127.0.0.1:8767 python -m agents.agent2_career_pages
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_PORTS = {"linkedin": 8765, "batches": 8766, "boards": 8767}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler with one way to answer; subclasses implement do_GET / do_POST."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+
+    def send_body(self, status: int, text: str, content_type: str = "text/html", headers: dict = None):
+        body = text.encode("utf-8")
+        headers = dict(headers or {})
+        if content_type == "text/html" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data, headers: dict = None):
+        self.send_body(status, json.dumps(data), "application/json", headers)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(handler, port: int = 0) -> ThreadingHTTPServer:
+    """Start a stub on a background thread; returns the server (call .shutdown() to stop)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, name=f"stub-{handler.__name__}", daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# ── LinkedIn ──
+
+def render_guest_cards(cards: list) -> str:
+    """Card markup shaped like the guest listing endpoint's response."""
+    items = []
+    for card in cards:
+        title = html.escape(card["title"])
+        items.append(
+            '<li>\n'
+            '  <div class="base-card relative w-full base-card--link base-search-card job-search-card">\n'
+            f'    <a class="base-card__full-link" href="{html.escape(card["url"])}?trk=public_jobs_jserp-result_search-card">\n'
+            f'      <span class="sr-only">{title}</span>\n'
+            '    </a>\n'
+            '    <div class="base-search-card__info">\n'
+            f'      <h3 class="base-search-card__title">{title}</h3>\n'
+            f'      <h4 class="base-search-card__subtitle"><a class="hidden-nested-link">{html.escape(card["company"])}</a></h4>\n'
+            '      <div class="base-search-card__metadata">\n'
+            f'        <span class="job-search-card__location">{html.escape(card["location"])}</span>\n'
+            f'        <time class="job-search-card__listdate" datetime="{html.escape(card["datePosted"])}"></time>\n'
+            '      </div>\n'
+            '    </div>\n'
+            '  </div>\n'
+            '</li>\n'
+        )
+    return "".join(items)
+
+
+class Recording:
+    """Recorded pages keyed by (keywords, location), with their parsed cards."""
+
+    def __init__(self, recording_dir):
+        self.dir = Path(recording_dir)
+        with open(self.dir / "manifest.json") as f:
+            manifest = json.load(f)
+        self.pages = {}
+        for task in manifest["tasks"]:
+            self.pages[(task["keywords"], task["location"])] = self.dir / task["record_file"]
+        self._cards = {}
+        self._lock = threading.Lock()
+
+    def page(self, keywords: str, location: str):
+        path = self.pages.get((keywords, location))
+        return path.read_text() if path else None
+
+    def cards(self, keywords: str, location: str) -> list:
+        from agents.linkedin_cards import parse_job_cards
+
+        key = (keywords, location)
+        with self._lock:
+            if key not in self._cards:
+                markup = self.page(keywords, location)
+                self._cards[key] = parse_job_cards(markup) if markup else []
+            return self._cards[key]
+
+
+def linkedin_handler(recording: Recording, guest_status: int = 200):
+    from agents.agent3_linkedin_search import GUEST_PAGE_SIZE, GUEST_SEARCH_PATH, LINKEDIN_JOBS_PATH
+
+    class LinkedInHandler(StubHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            keywords = query.get("keywords", "")
+            location = query.get("location", "")
+
+            if parts.path == GUEST_SEARCH_PATH:
+                if guest_status != 200:
+                    return self.send_body(guest_status, "")
+                start = int(query.get("start", 0) or 0)
+                cards = recording.cards(keywords, location)[start:start + GUEST_PAGE_SIZE]
+                return self.send_body(200, render_guest_cards(cards))
+            if parts.path.rstrip("/") == LINKEDIN_JOBS_PATH.rstrip("/"):
+                return self.send_body(200, recording.page(keywords, location) or "<html><body></body></html>")
+            self.send_body(404, "not found")
+
+    return LinkedInHandler
+
+
+# ── Message Batches ──
+
+DEFAULT_BATCH_TEXT = '{"roles": [], "coverage": []}'
+
+
+class BatchStore:
+    """Submitted batches and the canned results they will return."""
+
+    def __init__(self, responses_dir=None, default_text: str = DEFAULT_BATCH_TEXT, latency: float = 0.0):
+        self.responses_dir = Path(responses_dir) if responses_dir else None
+        self.default_text = default_text
+        self.latency = latency
+        self.batches = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, requests: list) -> str:
+        with self._lock:
+            batch_id = f"msgbatch_stub_{next(self._ids):04d}"
+            self.batches[batch_id] = {"requests": requests, "created": time.monotonic()}
+        return batch_id
+
+    def ended(self, batch_id: str) -> bool:
+        return time.monotonic() - self.batches[batch_id]["created"] >= self.latency
+
+    def result(self, request: dict) -> dict:
+        custom_id = request["custom_id"]
+        if self.responses_dir and (self.responses_dir / f"{custom_id}.error").exists():
+            error = (self.responses_dir / f"{custom_id}.error").read_text().strip() or "stub error"
+            return {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": error}}}
+        text = self.default_text
+        if self.responses_dir and (self.responses_dir / f"{custom_id}.txt").exists():
+            text = (self.responses_dir / f"{custom_id}.txt").read_text()
+        params = request.get("params", {})
+        return {"type": "succeeded", "message": {
+            "id": f"msg_stub_{custom_id}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "stub"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": len(json.dumps(params)) // 4, "output_tokens": len(text) // 4},
+        }}
+
+
+def batches_handler(store: BatchStore):
+    from agents.message_batches import BATCHES_PATH
+
+    class BatchHandler(StubHandler):
+        def batch_object(self, batch_id: str) -> dict:
+            batch = store.batches[batch_id]
+            n = len(batch["requests"])
+            ended = store.ended(batch_id)
+            host = self.headers.get("Host", f"127.0.0.1:{self.server.server_port}")
+            return {
+                "id": batch_id,
+                "type": "message_batch",
+                "processing_status": "ended" if ended else "in_progress",
+                "request_counts": {"processing": 0 if ended else n, "succeeded": n if ended else 0,
+                                   "errored": 0, "canceled": 0, "expired": 0},
+                "results_url": f"http://{host}{BATCHES_PATH}/{batch_id}/results" if ended else None,
+            }
+
+        def do_POST(self):
+            if self.path.rstrip("/") != BATCHES_PATH:
+                return self.send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            batch_id = store.create(payload.get("requests", []))
+            self.send_json(200, self.batch_object(batch_id))
+
+        def do_GET(self):
+            parts = self.path.split("?")[0].rstrip("/").split("/")
+            # /v1/messages/batches/{id}[/results]
+            batch_id = parts[4] if len(parts) > 4 else None
+            if batch_id not in store.batches:
+                return self.send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+            if len(parts) == 6 and parts[5] == "results":
+                lines = [json.dumps({"custom_id": r["custom_id"], "result": store.result(r)})
+                         for r in store.batches[batch_id]["requests"]]
+                return self.send_body(200, "\n".join(lines) + "\n", "application/x-jsonl")
+            self.send_json(200, self.batch_object(batch_id))
+
+    return BatchHandler
+
+
+# ── Job boards ──
+
+BOARD_PATHS = [
+    ("greenhouse", re.compile(r"^/v1/boards/([^/]+)/jobs/?$")),
+    ("lever", re.compile(r"^/v0/postings/([^/]+)/?$")),
+    ("ashby", re.compile(r"^/posting-api/job-board/([^/]+)/?$")),
+]
+
+
+def boards_handler(boards_dir):
+    boards_dir = Path(boards_dir)
+
+    class BoardHandler(StubHandler):
+        requests = []  # (path, status) per request, for tests
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            for board, pattern in BOARD_PATHS:
+                match = pattern.match(path)
+                if match:
+                    board_file = boards_dir / board / f"{match.group(1)}.json"
+                    if board_file.is_file():
+                        text = board_file.read_text()
+                        etag = '"' + hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] + '"'
+                        if self.headers.get("If-None-Match") == etag:
+                            return self.answer(304, "", etag)
+                        return self.answer(200, text, etag)
+                    break
+            self.answer(404, json.dumps({"error": "Not found"}))
+
+        def answer(self, status: int, text: str, etag: str = None):
+            self.requests.append((self.path, status))
+            self.send_body(status, text, "application/json", {"ETag": etag} if etag else None)
+
+    return BoardHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for LinkedIn, the Message Batches API "
+                                                 "or the job-board APIs")
+    commands = parser.add_subparsers(dest="service", required=True)
+    linkedin = commands.add_parser("linkedin", help="A recorded agent 3 run, as LinkedIn")
+    linkedin.add_argument("recording", help="Directory written by agent3 --record (contains manifest.json)")
+    linkedin.add_argument("--guest-status", type=int, default=200,
+                          help="HTTP status for every guest-API request (e.g. 429 to test the browser fallback)")
+    batches = commands.add_parser("batches", help="The Message Batches API")
+    batches.add_argument("--responses", help="Directory of {custom_id}.txt response texts ({custom_id}.error to fail one)")
+    batches.add_argument("--default-text", default=DEFAULT_BATCH_TEXT, help="Response text for requests without a file")
+    batches.add_argument("--latency", type=float, default=0.0, help="Seconds each batch stays in progress")
+    boards = commands.add_parser("boards", help="The Greenhouse, Lever and Ashby board APIs")
+    boards.add_argument("--boards", required=True, help="Directory of {greenhouse,lever,ashby}/{token}.json board responses")
+    for command in (linkedin, batches, boards):
+        command.add_argument("--port", type=int)
+    args = parser.parse_args()
+
+    if args.service == "linkedin":
+        recording = Recording(args.recording)
+        handler = linkedin_handler(recording, args.guest_status)
+        what = f"{len(recording.pages)} recorded searches from {args.recording}"
+    elif args.service == "batches":
+        handler = batches_handler(BatchStore(args.responses, args.default_text, args.latency))
+        what = "a Message Batches stand-in"
+    else:
+        handler = boards_handler(args.boards)
+        what = f"job-board API stand-ins from {args.boards}"
+    port = args.port or DEFAULT_PORTS[args.service]
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    print(f"Serving {what} on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
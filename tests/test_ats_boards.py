@@ -0,0 +1,35 @@
+import pytest
+
+from agents.ats_boards import board_api_url, detect_board
+
+
+@pytest.mark.parametrize("url, board", [
+    ("https://boards.greenhouse.io/acme", ("greenhouse", "acme")),
+    ("https://job-boards.eu.greenhouse.io/acme/jobs/4012345", ("greenhouse", "acme")),
+    ("https://boards.greenhouse.io/embed/job_board?for=acme", ("greenhouse", "acme")),
+    ("jobs.lever.co/acme-inc", ("lever", "acme-inc")),
+    ("https://jobs.eu.lever.co/acme", ("lever", "acme")),
+    ("https://jobs.ashbyhq.com/Acme.AI?utm_source=x", ("ashby", "Acme.AI")),
+])
+def test_detect_board(url, board):
+    assert detect_board(url) == board
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    None,
+    "https://acme.com/careers",
+    "https://boards.greenhouse.io/",
+    "https://boards.greenhouse.io/embed/job_board",
+    "https://jobs.lever.co/acme%20inc",
+    "https://acme.wd1.myworkdayjobs.com/External",
+])
+def test_detect_board_none(url):
+    assert detect_board(url) is None
+
+
+def test_board_api_url():
+    assert board_api_url("lever", "acme", "https://jobs.eu.lever.co/acme") == \
+        "https://api.eu.lever.co/v0/postings/acme?mode=json"
+    assert board_api_url("greenhouse", "acme", base_url="http://127.0.0.1:8767/") == \
+        "http://127.0.0.1:8767/v1/boards/acme/jobs"
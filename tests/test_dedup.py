@@ -0,0 +1,77 @@
+import pytest
+
+from agents.dedup import canonical_job_id, duplicate_reason, merge_and_dedup, title_match, title_tokens
+
+
+@pytest.mark.parametrize("url, job_id", [
+    ("https://boards.greenhouse.io/acme/jobs/4012345", "greenhouse:4012345"),
+    ("https://job-boards.greenhouse.io/acme/jobs/4012345?gh_src=abc", "greenhouse:4012345"),
+    ("https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345", "greenhouse:4012345"),
+    ("https://www.acme.com/careers/?gh_jid=4012345", "greenhouse:4012345"),
+    ("https://jobs.lever.co/acme/8C1D2E3F-0000-4A4B-9C9D-0123456789AB/apply",
+     "lever:8c1d2e3f-0000-4a4b-9c9d-0123456789ab"),
+    ("jobs.ashbyhq.com/acme/8c1d2e3f-0000-4a4b-9c9d-0123456789ab", "ashby:8c1d2e3f-0000-4a4b-9c9d-0123456789ab"),
+    ("https://www.linkedin.com/jobs/view/director-of-sales-at-acme-4280243520/", "linkedin:4280243520"),
+    ("https://www.linkedin.com/jobs/view/4280243520?trk=public_jobs", "linkedin:4280243520"),
+    ("https://www.linkedin.com/jobs/search/?currentJobId=4280243520&keywords=sales", "linkedin:4280243520"),
+])
+def test_canonical_job_id(url, job_id):
+    assert canonical_job_id(url) == job_id
+
+
+@pytest.mark.parametrize("url", [
+    None,
+    "",
+    "https://boards.greenhouse.io/acme",
+    "https://jobs.lever.co/acme",
+    "https://www.linkedin.com/jobs/search/?keywords=sales",
+    "https://www.acme.com/careers/jobs/4012345",
+])
+def test_canonical_job_id_none_for_non_postings(url):
+    assert canonical_job_id(url) is None
+
+
+def test_title_tokens_expand_abbreviations_and_drop_stopwords():
+    assert title_tokens("Sr. Dir of BD & Partnerships") == {"senior", "director", "business", "development",
+                                                             "partnerships"}
+    assert title_tokens("VP, Sales") == title_tokens("Vice President of Sales")
+
+
+def test_title_match_same_words():
+    assert title_match(title_tokens("Director, Strategic Partnerships"),
+                       title_tokens("Director of Strategic Partnerships")) == "same title words"
+
+
+def test_title_match_level_only_difference():
+    reason = title_match(title_tokens("Midwest Regional Director - Vice President / Senior Vice President"),
+                         title_tokens("Midwest Regional Director - Senior Vice President / Managing Director"))
+    assert reason.startswith("titles 86% alike, differing only in level (managing)")
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Director of Sales", "Director of Marketing"),        # a non-level word differs
+    ("VP Sales", "Regional VP Sales, West"),                # too few words in common
+    ("", "Director of Sales"),
+])
+def test_title_match_rejects(a, b):
+    assert title_match(title_tokens(a), title_tokens(b)) is None
+
+
+def test_duplicate_reason_prefers_job_ids():
+    a = {"title": "Director of Sales", "url": "https://boards.greenhouse.io/acme/jobs/1111111"}
+    assert duplicate_reason(a, {"title": "Head of Sales", "url": a["url"] + "?gh_src=x"}) == \
+        "same Greenhouse job 1111111"
+    # Two distinct postings stay distinct however alike their titles
+    assert duplicate_reason(a, {"title": "Director of Sales",
+                                "url": "https://boards.greenhouse.io/acme/jobs/2222222"}) is None
+
+
+def test_merge_and_dedup_collapses_near_duplicates():
+    agent2 = [{"company": "Acme", "title": "VP, Sales", "url": "https://acme.com/careers/1", "source": "Greenhouse"}]
+    agent3 = [
+        {"company": "Acme", "title": "Vice President of Sales", "url": "https://www.linkedin.com/jobs/view/4000001"},
+        {"company": "Acme", "title": "Director of Partnerships", "url": "https://www.linkedin.com/jobs/view/4000002"},
+    ]
+    merged, merges = merge_and_dedup(agent2, agent3)
+    assert [r["title"] for r in merged] == ["VP, Sales", "Director of Partnerships"]
+    assert len(merges) == 1
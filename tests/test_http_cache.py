@@ -0,0 +1,75 @@
+import json
+
+from agents.ats_boards import BoardFetchError, fetch_board
+from agents.http_cache import HttpCache
+from agents.http_client import HttpClient
+from tests.stub_servers import boards_handler
+
+GREENHOUSE_BOARD = {"jobs": [{
+    "title": "VP, Sales",
+    "absolute_url": "https://boards.greenhouse.io/acme/jobs/4012345",
+    "location": {"name": "New York, NY"},
+    "updated_at": "2026-03-20T12:00:00-04:00",
+}]}
+
+
+def _boards(tmp_path):
+    (tmp_path / "boards" / "greenhouse").mkdir(parents=True)
+    (tmp_path / "boards" / "greenhouse" / "acme.json").write_text(json.dumps(GREENHOUSE_BOARD))
+    return tmp_path / "boards"
+
+
+def test_304_serves_stored_parse(tmp_path, stub_server):
+    handler = boards_handler(_boards(tmp_path))
+    base_url = stub_server(handler)
+    url = f"{base_url}/v1/boards/acme/jobs"
+    client = HttpClient()
+    cache = HttpCache(tmp_path / "cache")
+    parses = []
+
+    def parse(resp):
+        parses.append(resp.url)
+        return resp.json()["jobs"]
+
+    first, jobs = cache.fetch(client, url, parse=parse)
+    assert first.status == 200 and not first.from_cache
+    second, cached_jobs = cache.fetch(client, url, parse=parse)
+    client.close()
+
+    assert [status for _, status in handler.requests] == [200, 304]
+    assert second.status == 200 and second.from_cache
+    assert second.json() == GREENHOUSE_BOARD
+    assert cached_jobs == jobs == GREENHOUSE_BOARD["jobs"]
+    assert len(parses) == 1
+    summary = cache.summary()
+    assert (summary["requests"], summary["hits"], summary["misses"], summary["entries"]) == (2, 1, 1, 1)
+    assert summary["bytes_saved"] == len(json.dumps(GREENHOUSE_BOARD))
+
+
+def test_cache_index_survives_restart(tmp_path, stub_server):
+    handler = boards_handler(_boards(tmp_path))
+    base_url = stub_server(handler)
+    client = HttpClient()
+    cache = HttpCache(tmp_path / "cache")
+    fetch_board(client, "greenhouse", "acme", base_url=base_url, cache=cache)
+    cache.save()
+
+    postings = fetch_board(client, "greenhouse", "acme", base_url=base_url, cache=HttpCache(tmp_path / "cache"))
+    client.close()
+    assert [status for _, status in handler.requests] == [200, 304]
+    assert [p["title"] for p in postings] == ["VP, Sales"]
+
+
+def test_unknown_board_is_not_cached(tmp_path, stub_server):
+    base_url = stub_server(boards_handler(_boards(tmp_path)))
+    client = HttpClient()
+    cache = HttpCache(tmp_path / "cache")
+    try:
+        fetch_board(client, "lever", "nobody", base_url=base_url, cache=cache)
+    except BoardFetchError as e:
+        assert "no Lever board named 'nobody'" in str(e)
+    else:
+        raise AssertionError("expected BoardFetchError")
+    finally:
+        client.close()
+    assert cache.summary()["entries"] == 0
@@ -0,0 +1,44 @@
+from agents.json_stream import scan_json
+
+
+def test_plain_json():
+    value, report = scan_json('{"roles": [{"title": "VP Sales"}], "coverage": []}')
+    assert value == {"roles": [{"title": "VP Sales"}], "coverage": []}
+    assert not report["truncated"]
+    assert report["ignored_chars"] == 0
+
+
+def test_skips_prose_citations_and_fences():
+    text = ('I searched the careers page [1] and found:\n```json\n'
+            '[{"company": "Acme", "careers_url": "https://acme.com/jobs"}]\n```\nLet me know [2].')
+    value, report = scan_json(text)
+    assert value == [{"company": "Acme", "careers_url": "https://acme.com/jobs"}]
+    start, end = report["span"]
+    assert text[start:end].startswith("[{") and text[start:end].endswith("}]")
+    assert report["ignored_chars"] == len(text) - (end - start)
+
+
+def test_longest_value_wins():
+    value, _ = scan_json('Example: {"a": 1}. Result: {"roles": [{"title": "x"}, {"title": "y"}]}')
+    assert value == {"roles": [{"title": "x"}, {"title": "y"}]}
+
+
+def test_truncated_array_keeps_complete_items():
+    text = '[{"company": "Acme"}, {"company": "Beta"}, {"company": "Gam'
+    value, report = scan_json(text)
+    assert value == [{"company": "Acme"}, {"company": "Beta"}]
+    assert report["truncated"]
+    assert report["dropped_preview"] == '{"company": "Gam'
+    assert report["dropped_chars"] == len(text) - text.index(', {"company": "Gam')
+
+
+def test_truncated_object_closes_every_array():
+    value, report = scan_json('{"roles": [{"title": "VP Sales"}, {"title": "Dir'
+                              '')
+    assert value == {"roles": [{"title": "VP Sales"}]}
+    assert report["truncated"]
+
+
+def test_no_json():
+    assert scan_json("No roles found [citation needed].")[0] is None
+    assert scan_json(None)[0] is None
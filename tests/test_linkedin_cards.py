@@ -0,0 +1,77 @@
+"""
+parse_job_cards (used by --replay and the http backend) against the in-page
+extractor production runs.
+
+tests/fixtures/linkedin_search_page.html is a results page and
+linkedin_search_page.expected.json is what extract_jobs_from_page returns
+for it. The browser test checks that file against the real extractor
+wherever Playwright and Chromium are installed, and the parser test checks
+parse_job_cards against the same file everywhere, so a selector change on
+either side fails one of them. After a deliberate selector change,
+regenerate the expected output in the browser:
+
+    python -m tests.test_linkedin_cards --update
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+
+from agents.linkedin_cards import parse_job_cards
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGE = FIXTURES / "linkedin_search_page.html"
+EXPECTED = FIXTURES / "linkedin_search_page.expected.json"
+
+
+def extract_in_browser(markup: str) -> list:
+    """extract_jobs_from_page's output for markup, loaded into headless Chromium."""
+    from playwright.sync_api import sync_playwright
+
+    from agents.agent3_linkedin_search import extract_jobs_from_page
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        try:
+            page = browser.new_page()
+            page.set_content(markup)
+            stats = {}
+            jobs = extract_jobs_from_page(page, stats=stats)
+            assert stats["extract_mode"] == "batch"
+            return jobs
+        finally:
+            browser.close()
+
+
+def test_parse_job_cards_matches_extractor_output():
+    assert parse_job_cards(PAGE.read_text()) == json.loads(EXPECTED.read_text())
+
+
+def test_extractor_output_is_current():
+    pytest.importorskip("playwright.sync_api")
+    try:
+        jobs = extract_in_browser(PAGE.read_text())
+    except Exception as e:  # Playwright without its browser
+        if "Executable doesn't exist" in str(e):
+            pytest.skip("Chromium is not installed for Playwright")
+        raise
+    assert jobs == json.loads(EXPECTED.read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the expected card output with the in-page extractor")
+    parser.add_argument("--update", action="store_true", help=f"Rewrite {EXPECTED.name}")
+    args = parser.parse_args()
+
+    jobs = extract_in_browser(PAGE.read_text())
+    if args.update:
+        EXPECTED.write_text(json.dumps(jobs, indent=2, ensure_ascii=False) + "\n")
+        print(f"Wrote {len(jobs)} cards to {EXPECTED}")
+    else:
+        print(json.dumps(jobs, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
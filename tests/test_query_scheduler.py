@@ -0,0 +1,98 @@
+import pytest
+
+from agents.company_index import build_company_index
+from agents.query_scheduler import (
+    DEAD_QUERY_EVERY, DEAD_WINDOW, backfill_company_yield, query_stats, query_tier, schedule_tasks,
+)
+
+
+def broad(keywords: str) -> dict:
+    return {"kind": "broad", "keywords": keywords, "label": keywords}
+
+
+def company(name: str) -> dict:
+    return {"kind": "company", "keywords": f'"{name}" sales', "label": name, "company": {"company": name}}
+
+
+def runs(**yields) -> list:
+    """History with one run per position: runs(q=[3, 0, None]) logs q's yield in each run (None: not run)."""
+    length = max(len(v) for v in yields.values())
+    history = []
+    for i in range(length):
+        history.append([{"query": q, "industry_relevant": v[i], "duration_ms": 20000}
+                        for q, v in yields.items() if i < len(v) and v[i] is not None])
+    return history
+
+
+@pytest.fixture
+def tasks():
+    return [broad("productive"), broad("average"), broad("weak"), broad("dead"), broad("new"), company("Acme")]
+
+
+def test_tiers_and_scroll_caps(tasks):
+    history = runs(productive=[4, 2, 3], average=[1, 1, 2], weak=[0, 1, 0], dead=[0, 0, 0])
+    scheduled, skipped, report = schedule_tasks(tasks, history, base_scrolls=3)
+
+    assert [t["keywords"] for t in skipped] == ["dead"]
+    caps = {t["label"]: t["max_scrolls"] for t in scheduled}
+    assert caps == {"productive": 9, "average": 6, "weak": 1, "new": 6, "Acme": 6}
+    assert report["tiers"] == {"deep": 1, "default": 3, "shallow": 1}
+    assert report["skipped"] == ["dead"]
+    assert report["est_seconds_saved"] == 20
+
+
+def test_ranked_by_yield_within_kind(tasks):
+    history = runs(weak=[0, 1, 0], average=[1, 1, 2], productive=[4, 2, 3])
+    history[-1].append({"query": "Company: Acme", "company_relevant": 5})
+    scheduled, _, _ = schedule_tasks([t for t in tasks if t["label"] != "dead"], history)
+    # Broad searches stay first; new queries rank as productive
+    assert [t["label"] for t in scheduled] == ["productive", "new", "average", "weak", "Acme"]
+
+
+def test_dead_needs_enough_runs_and_only_recent_zeros():
+    assert query_tier(query_stats(runs(q=[0, 0]))["q"]) == "shallow"  # too few runs to call
+    assert query_tier(query_stats(runs(q=[0, 0, 0]))["q"]) == "dead"
+    revived = [5] + [0] * DEAD_WINDOW
+    assert query_tier(query_stats(runs(q=revived))["q"]) == "dead"  # an old hit falls out of the window
+    assert query_tier(query_stats(runs(q=revived[:-1] + [1]))["q"]) == "shallow"
+
+
+def test_dead_query_reprobed_every_n_runs():
+    history = runs(dead=[0, 0, 0], other=[2, 2, 2])
+    ran = []
+    for run in range(3 * DEAD_QUERY_EVERY):
+        scheduled, _, _ = schedule_tasks([broad("dead"), broad("other")], history)
+        probed = any(t["keywords"] == "dead" for t in scheduled)
+        ran.append(probed)
+        history.append([{"query": t["keywords"], "industry_relevant": 0 if t["keywords"] == "dead" else 2}
+                        for t in scheduled])
+    assert ran == ([False] * (DEAD_QUERY_EVERY - 1) + [True]) * 3
+
+
+def test_throttled_attempts_are_not_zero_yield():
+    history = runs(q=[3, 3])
+    for _ in range(DEAD_WINDOW):
+        history.append([{"query": "q", "throttled": "http-429", "industry_relevant": 0}])
+        history.append([{"query": "q", "raw_results": 0}])  # no comparable yield logged
+    s = query_stats(history)["q"]
+    assert (s["runs"], s["avg_yield"], s["dead"]) == (2, 3.0, False)
+    assert s["runs_since"] == 2 * DEAD_WINDOW
+    assert query_tier(s) == "deep"
+
+
+def test_backfill_company_yield_counts_roles_at_the_canonical_company():
+    data = {
+        "queries_run": [
+            {"query": "Company: Riskalyze", "matching_results": 40},
+            {"query": "Company: Orion", "matching_results": 15},
+            {"query": "Company: Acme", "matching_results": 9, "company_relevant": 7},
+            {"query": "wealth tech VP sales", "matching_results": 30, "industry_relevant": 4},
+        ],
+        "roles": [
+            {"company": "Nitrogen Wealth", "title": "VP Sales"},
+            {"company": "Nitrogen", "title": "Director of Partnerships"},
+            {"company": "Addepar", "title": "Head of Sales"},
+        ],
+    }
+    backfill_company_yield(data, build_company_index(include_history=False))
+    assert [e.get("company_relevant") for e in data["queries_run"]] == [2, 0, 7, None]
@@ -0,0 +1,62 @@
+import pytest
+
+from agents import rate_limit
+from agents.rate_limit import BACKOFF_MAX, THROTTLE_BACKOFF, RateLimiter, TokenBucket
+
+
+def test_bucket_waits_only_when_ahead_of_pace():
+    bucket = TokenBucket(rate=0.5, burst=2.0)
+    now = bucket.updated
+    assert bucket.reserve(1.0, now) == 0.0
+    assert bucket.reserve(1.0, now) == 0.0           # burst of 2
+    assert bucket.reserve(1.0, now) == pytest.approx(2.0)   # one token at 0.5/s
+    assert bucket.reserve(0.25, now + 10) == 0.0     # refilled (capped at burst) after 10s
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record time.sleep calls instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(rate_limit.time, "sleep", calls.append)
+    return calls
+
+
+def test_acquire_is_per_host(sleeps):
+    limiter = RateLimiter(rate=1.0, burst=1.0, jitter=0.0, host_rates={"fast": (100.0, 5.0)})
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("b") == 0.0
+    assert limiter.acquire("a") > 0.9
+    for _ in range(5):
+        assert limiter.acquire("fast") == 0.0
+    assert len(sleeps) == 1
+    summary = limiter.summary()
+    assert summary["requests_by_host"] == {"a": 2, "b": 1, "fast": 5}
+    assert summary["wait_s"] == pytest.approx(sleeps[0], abs=0.05)
+
+
+def test_follow_ups_cost_a_fraction(sleeps):
+    limiter = RateLimiter(rate=1.0, burst=1.0, jitter=0.0)
+    assert limiter.acquire("a", cost=rate_limit.FOLLOW_UP_COST) == 0.0
+    assert limiter.acquire("a", cost=rate_limit.FOLLOW_UP_COST) == 0.0
+    assert not sleeps
+
+
+def test_throttle_backoff_doubles_and_resets(capsys):
+    limiter = RateLimiter(jitter=0.0)
+    first = THROTTLE_BACKOFF["http-429"]
+    assert limiter.throttled("a", "http-429") == first
+    assert limiter.throttled("a", "http-429") == 2 * first
+    for _ in range(10):
+        pause = limiter.throttled("a", "http-429")
+    assert pause == BACKOFF_MAX
+    limiter.ok("a")
+    assert limiter.throttled("a", "http-429") == first
+    assert limiter.summary()["throttles"] == {"http-429": 13}
+    assert "pausing it" in capsys.readouterr().out
+
+
+def test_throttled_host_waits_out_the_pause(sleeps):
+    limiter = RateLimiter(rate=100.0, burst=10.0, jitter=0.0)
+    limiter.throttled("a", "authwall")
+    assert limiter.acquire("a") == pytest.approx(THROTTLE_BACKOFF["authwall"], abs=0.5)
+    assert limiter.acquire("b") == 0.0
@@ -0,0 +1,116 @@
+import json
+import sqlite3
+
+import pytest
+
+from agents.company_index import build_company_index
+from agents.role_store import RoleStore, exported_roles
+
+
+def _role(company: str, title: str, first_seen: str = "2026-03-01", url: str = "") -> dict:
+    return {"company": company, "title": title, "url": url, "segment": "RIA Tech", "first_seen": first_seen}
+
+
+@pytest.fixture
+def company_index():
+    return build_company_index(include_history=False)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "roles.db", tmp_path / "roles.jsonl"
+
+
+def _open(paths, company_index):
+    db, export = paths
+    return RoleStore.open_for_write(db, export, legacy_path=None, company_index=company_index)
+
+
+def test_add_roles_is_insert_only(paths, company_index):
+    with _open(paths, company_index) as store:
+        assert store.add_roles({"acme|vp sales": _role("Acme", "VP Sales")}) == 1
+        assert store.add_roles({"acme|vp sales": _role("Acme", "VP Sales, East", "2026-03-09"),
+                                "acme|director of partnerships": _role("Acme", "Director of Partnerships")}) == 1
+        assert len(store) == 2
+        assert store.known_keys(["acme|vp sales", "beta|vp sales"]) == {"acme|vp sales"}
+        kept = {role["key"]: role for role in store.roles()}["acme|vp sales"]
+        assert (kept["title"], kept["first_seen"]) == ("VP Sales", "2026-03-01")
+
+
+def test_export_round_trip_appends_new_rows(paths, company_index):
+    db, export = paths
+    with _open(paths, company_index) as store:
+        store.add_roles({"beta|head of sales": _role("Beta", "Head of Sales"),
+                         "acme|vp sales": _role("Acme", "VP Sales")})
+        assert store.export(export) == 2
+        first = export.read_text()
+        store.add_roles({"gamma|cro": _role("Gamma", "CRO", "2026-03-02")})
+        assert store.export(export) == 1
+        assert store.export(export) == 0
+        stored = {role.pop("key"): role for role in store.roles()}
+
+    text = export.read_text()
+    assert text.startswith(first)  # appended, not rewritten
+    assert [json.loads(line)["key"] for line in text.splitlines()] == ["beta|head of sales", "acme|vp sales",
+                                                                      "gamma|cro"]
+    assert exported_roles(export) == {key: {field: role[field] for field in
+                                            ("company", "title", "url", "segment", "first_seen")}
+                                      for key, role in stored.items()}
+
+
+def test_fresh_store_loads_export_once(paths, company_index, capsys):
+    db, export = paths
+    with _open(paths, company_index) as store:
+        store.add_roles({"acme|vp sales": _role("Acme", "VP Sales")})
+        store.export(export)
+    db.unlink()  # a fresh checkout: the export is all there is
+
+    with _open(paths, company_index) as store:
+        assert store.known_keys(["acme|vp sales"]) == {"acme|vp sales"}
+    assert "loaded 1 roles from roles.jsonl" in capsys.readouterr().out
+    with _open(paths, company_index) as store:
+        assert store.export(export) == 0
+    assert capsys.readouterr().out == ""  # unchanged export: nothing re-read
+
+
+def test_reimports_when_export_changes(paths, company_index):
+    db, export = paths
+    with _open(paths, company_index) as store:
+        store.add_roles({"acme|vp sales": _role("Acme", "VP Sales")})
+        store.export(export)
+    # Another run's commit appended a role this database hasn't seen
+    with open(export, "a") as f:
+        f.write(json.dumps({"key": "beta|cro", **_role("Beta", "CRO", "2026-03-05")}) + "\n")
+
+    with _open(paths, company_index) as store:
+        assert len(store) == 2
+        store.add_roles({"gamma|cro": _role("Gamma", "CRO", "2026-03-06")})
+        assert store.export(export) == 1
+    assert list(exported_roles(export)) == ["acme|vp sales", "beta|cro", "gamma|cro"]
+
+
+def test_torn_export_is_rewritten(paths, company_index):
+    db, export = paths
+    with _open(paths, company_index) as store:
+        store.add_roles({"acme|vp sales": _role("Acme", "VP Sales"), "beta|cro": _role("Beta", "CRO")})
+        store.export(export)
+    lines = export.read_text().splitlines(keepends=True)
+    export.write_text(lines[0] + lines[1][:20])  # a crash mid-append
+
+    with _open(paths, company_index) as store:
+        assert store.export(export) == 2
+    assert list(exported_roles(export)) == ["acme|vp sales", "beta|cro"]
+
+
+def test_readonly_never_creates(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        RoleStore(tmp_path / "roles.db", readonly=True)
+    assert not (tmp_path / "roles.db").exists()
+
+
+def test_duplicates_found_across_raw_and_canonical_keys(paths, company_index):
+    with _open(paths, company_index) as store:
+        # Keyed before canonicalization: raw company name in the key
+        store.add_roles({"riskalyze|director of enterprise sales": _role("Riskalyze", "Director of Enterprise Sales")})
+        match = store.find_duplicate("nitrogen|director, enterprise sales", _role("Nitrogen", "Director, Enterprise Sales"))
+    assert match and match[1] == "same title words"
@@ -0,0 +1,51 @@
+import json
+
+from agents.run_checkpoint import RunCheckpoint
+
+
+def test_resume_returns_completed_units(tmp_path):
+    checkpoint = RunCheckpoint("agent3", "2026-03-21", tmp_path)
+    assert checkpoint.start() == ([], [], [])
+    checkpoint.record("q1", {"query": "q1", "results": 2}, [{"title": "A"}, {"title": "B"}])
+    checkpoint.record("q2", {"query": "q2", "results": 0}, [])
+    checkpoint.close()
+
+    resumed = RunCheckpoint("agent3", "2026-03-21", tmp_path)
+    assert resumed.exists()
+    completed, roles, entries = resumed.start(resume=True)
+    assert completed == ["q1", "q2"]
+    assert roles == [{"title": "A"}, {"title": "B"}]
+    assert [e["query"] for e in entries] == ["q1", "q2"]
+
+    resumed.record("q3", {"query": "q3", "results": 1}, [{"title": "C"}])
+    resumed.close()
+    assert json.loads(resumed.checkpoint_path.read_text())["completed"] == ["q1", "q2", "q3"]
+
+
+def test_resume_drops_unit_interrupted_mid_write(tmp_path):
+    checkpoint = RunCheckpoint("agent3", "2026-03-21", tmp_path)
+    checkpoint.start()
+    checkpoint.record("q1", {"query": "q1"}, [{"title": "A"}])
+    checkpoint.close()
+    # A crash while writing q2: its lines reached the stream, the checkpoint never named it
+    with open(checkpoint.stream_path, "a") as f:
+        f.write(json.dumps({"type": "entry", "unit": "q2", "entry": {"query": "q2"}}) + "\n")
+        f.write('{"type": "role", "unit": "q2", "ro')
+
+    completed, roles, entries = RunCheckpoint("agent3", "2026-03-21", tmp_path).start(resume=True)
+    assert completed == ["q1"]
+    assert roles == [{"title": "A"}]
+    assert entries == [{"query": "q1"}]
+    assert "q2" not in checkpoint.stream_path.read_text()
+
+
+def test_start_without_resume_discards(tmp_path):
+    checkpoint = RunCheckpoint("agent3", "2026-03-21", tmp_path)
+    checkpoint.start()
+    checkpoint.record("q1", {"query": "q1"}, [{"title": "A"}])
+    checkpoint.close()
+
+    fresh = RunCheckpoint("agent3", "2026-03-21", tmp_path)
+    assert fresh.start() == ([], [], [])
+    fresh.discard()
+    assert not fresh.stream_path.exists() and not fresh.checkpoint_path.exists()
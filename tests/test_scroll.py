@@ -0,0 +1,51 @@
+import pytest
+
+from agents.agent3_linkedin_search import BASELINE_SCROLLS, SCROLL_CAP, scroll_to_load_all
+from tests.conftest import PlaywrightTimeout
+
+pytestmark = pytest.mark.usefixtures("fake_playwright")
+
+
+class GrowingList:
+    """A results page whose card list grows by 10 per scroll, `loads` times."""
+
+    def __init__(self, loads: int):
+        self.cards = 25
+        self.loads = loads
+        self.scrolls = 0
+
+    def evaluate(self, script, arg=None):
+        if script.startswith("window.scrollTo"):
+            self.scrolls += 1
+            if self.scrolls <= self.loads:
+                self.cards += 10
+            return None
+        return self.cards
+
+    def query_selector(self, selector):
+        return None
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        if self.cards <= arg[1]:
+            raise PlaywrightTimeout()
+
+
+def test_cap_is_above_the_old_fixed_limit():
+    assert SCROLL_CAP > BASELINE_SCROLLS
+
+
+def test_keeps_scrolling_past_the_old_limit_while_cards_appear():
+    page = GrowingList(loads=BASELINE_SCROLLS + 2)
+    stats = scroll_to_load_all(page, settle_ms=1)
+    assert stats == {"scrolls": BASELINE_SCROLLS + 3, "cards_gained": 10 * (BASELINE_SCROLLS + 2),
+                     "scroll_stop": "converged"}
+
+
+def test_stops_at_the_first_scroll_without_new_cards():
+    stats = scroll_to_load_all(GrowingList(loads=1), settle_ms=1)
+    assert (stats["scrolls"], stats["scroll_stop"]) == (2, "converged")
+
+
+def test_stops_at_the_cap_on_a_list_that_keeps_growing():
+    stats = scroll_to_load_all(GrowingList(loads=100), settle_ms=1)
+    assert (stats["scrolls"], stats["cards_gained"], stats["scroll_stop"]) == (SCROLL_CAP, 10 * SCROLL_CAP, "cap")
@@ -0,0 +1,63 @@
+import pytest
+
+from agents.agent3_linkedin_search import search_linkedin
+from agents.rate_limit import RateLimiter
+from tests.conftest import PlaywrightTimeout
+
+pytestmark = pytest.mark.usefixtures("fake_playwright")
+
+
+class Response:
+    def __init__(self, status: int):
+        self.status = status
+
+
+class ResultsPage:
+    """A results page that loads with `status` and renders `cards` (None: cards never render)."""
+
+    def __init__(self, status: int = 200, cards: list = None, url: str = "https://www.linkedin.com/jobs/search/"):
+        self.status = status
+        self.cards = cards
+        self.url = url
+
+    def goto(self, url, wait_until=None, timeout=None):
+        return Response(self.status)
+
+    def evaluate(self, script, arg=None):
+        if isinstance(arg, dict):  # the batch extraction script
+            return self.cards
+        return len(self.cards or [])
+
+    def query_selector(self, selector):
+        return None
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        raise PlaywrightTimeout()
+
+    def wait_for_selector(self, selector, timeout=None):
+        if self.cards is None:
+            raise PlaywrightTimeout()
+
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(rate=100.0, burst=10.0, jitter=0.0)
+
+
+@pytest.mark.parametrize("page, reason", [
+    (ResultsPage(status=429), "http-429"),
+    (ResultsPage(url="https://www.linkedin.com/authwall?trk=jobs"), "authwall"),
+    (ResultsPage(cards=None), "empty-after-timeout"),
+])
+def test_throttled_search_returns_none(page, reason, limiter, capsys):
+    stats = {}
+    assert search_linkedin(page, "vp sales", stats=stats, limiter=limiter) is None
+    assert stats["throttled"] == reason
+    assert limiter.summary()["throttles"] == {reason: 1}
+
+
+def test_search_with_no_results_returns_empty(limiter):
+    stats = {}
+    assert search_linkedin(ResultsPage(cards=[]), "vp sales", stats=stats, limiter=limiter) == []
+    assert "throttled" not in stats
+    assert stats["extract_mode"] == "batch"
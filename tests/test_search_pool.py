@@ -0,0 +1,52 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from agents.agent3_linkedin_search import run_http_search, run_search_pool
+from agents.http_client import HttpClient
+from agents.rate_limit import RateLimiter
+from tests.stub_servers import Recording, linkedin_handler
+
+TASKS = [{"keywords": "vp sales wealth", "location": "United States", "position": f"[{i}/2]",
+          "label": f"task {i}...", "record_file": f"task-{i}.html"} for i in (1, 2)]
+
+
+@pytest.fixture
+def no_playwright(monkeypatch):
+    """Make `import playwright...` fail, as on a runner without it installed."""
+    monkeypatch.setitem(sys.modules, "playwright", None)
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", None)
+
+
+def _finishes(fn, timeout: float = 20.0):
+    """fn()'s result, failing the test instead of hanging if it doesn't return."""
+    out = {}
+    thread = threading.Thread(target=lambda: out.update(result=fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "search pool never returned"
+    return out["result"]
+
+
+def test_browser_pool_ends_without_playwright(no_playwright, capsys):
+    limiter = RateLimiter(rate=100.0, burst=10.0, jitter=0.0)
+    assert _finishes(lambda: list(run_search_pool(TASKS, 2, limiter=limiter))) == []
+    assert "Playwright is not installed" in capsys.readouterr().out
+
+
+def test_http_fallback_ends_without_playwright(no_playwright, tmp_path, stub_server, capsys):
+    (tmp_path / "manifest.json").write_text(json.dumps({"tasks": []}))
+    base_url = stub_server(linkedin_handler(Recording(tmp_path), guest_status=503))
+    client = HttpClient()
+    limiter = RateLimiter(rate=100.0, burst=10.0, jitter=0.0)
+    try:
+        results = _finishes(lambda: list(run_http_search(TASKS, 2, client, {"base_url": base_url},
+                                                         limiter=limiter)))
+    finally:
+        client.close()
+    assert results == []
+    out = capsys.readouterr().out
+    assert "Falling back to Playwright for 2 searches" in out
+    assert "Playwright is not installed" in out